@@ -0,0 +1,105 @@
+"""Runs the pipeline over a manifest of dataset/rules pairs on a pool of warm worker processes."""
+import argparse
+import csv
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+import yaml
+from profiling.parallel import process_context, resolve_workers
+
+STAGES = ["ingest", "validate", "profile", "decision_plan", "materialize", "clean", "eda", "model", "risk", "report"]
+
+def load_manifest(manifest_path: str):
+    """Read the jobs of a CSV (columns dataset, rules and optional name) or YAML (list of mappings) manifest"""
+    if manifest_path.endswith((".yaml", ".yml")):
+        with open(manifest_path, "r") as f:
+            jobs = yaml.safe_load(f) or []
+    else:
+        with open(manifest_path, "r", newline="") as f:
+            jobs = list(csv.DictReader(f))
+
+    # Relative paths are relative to the manifest, and every run gets a unique directory name
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    names = set()
+    resolved = []
+    for i, job in enumerate(jobs):
+        dataset_path = os.path.join(base_dir, job["dataset"])
+        rules_path = os.path.join(base_dir, job["rules"]) if job.get("rules") else "core/rules.yaml"
+        name = job.get("name") or os.path.splitext(os.path.basename(dataset_path))[0]
+        name = re.sub(r"[^\w.-]", "_", name)
+        if name in names:
+            name = f"{name}_{i}"
+        names.add(name)
+        resolved.append({"name": name, "dataset": dataset_path, "rules": rules_path})
+    return resolved
+
+def warm_worker():
+    """
+    Pool initializer: import the pipeline once per worker process. `import run` defers the stage modules,
+    so the ones pulling in scikit-learn, matplotlib and reportlab are imported here explicitly.
+    """
+    import run # noqa: F401
+    import pipeline.model # noqa: F401
+    import pipeline.eda # noqa: F401
+    import outputs.report_generator # noqa: F401
+
+def run_job(job: dict, output_root: str):
+    """Run one manifest entry in its own output directory and return its summary row"""
+    from run import execute_pipeline
+
+    output_dir = os.path.join(output_root, job["name"])
+    row = {"name": job["name"], "dataset": job["dataset"], "status": None, "error": "", "report_path": "", "output_dir": output_dir}
+    started = time.perf_counter()
+    try:
+        result = execute_pipeline(job["dataset"], job["rules"], output_dir=output_dir)
+        row["status"] = result["validation_result"]["status"]
+        row["report_path"] = result["report_path"]
+        row.update({f"{stage}_s": round(seconds, 3) for stage, seconds in result["stage_timings"].items()})
+    except Exception as exc:
+        # One bad dataset must not take the batch down; the traceback goes next to its outputs
+        row["status"] = "ERROR"
+        row["error"] = f"{type(exc).__name__}: {exc}"
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "error.txt"), "w") as f:
+            f.write(traceback.format_exc())
+    row["total_s"] = round(time.perf_counter() - started, 3)
+    return row
+
+def run_batch(manifest_path: str, output_root: str = "outputs/batch", workers: int = 0):
+    """Run every manifest job on a pool of reused worker processes; writes and returns the summary table"""
+    jobs = load_manifest(manifest_path)
+    workers = min(resolve_workers(workers), max(len(jobs), 1))
+    os.makedirs(output_root, exist_ok=True)
+
+    rows = []
+    if workers <= 1:
+        rows = [run_job(job, output_root) for job in jobs]
+    else:
+        # Workers live for the whole batch, so imports and pool start-up are paid once per worker, not per dataset
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(), initializer=warm_worker) as pool:
+            futures = [pool.submit(run_job, job, output_root) for job in jobs]
+            rows = [future.result() for future in as_completed(futures)]
+
+    # Summary in manifest order, one timing column per stage
+    order = {job["name"]: i for i, job in enumerate(jobs)}
+    rows.sort(key=lambda row: order[row["name"]])
+    columns = ["name", "status", "total_s"] + [f"{stage}_s" for stage in STAGES] + ["report_path", "error", "dataset", "output_dir"]
+    summary = pd.DataFrame(rows).reindex(columns=columns)
+
+    summary_path = os.path.join(output_root, "summary.csv")
+    summary.to_csv(summary_path, index=False)
+    return summary, summary_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("manifest", help="CSV (dataset,rules[,name]) or YAML list of jobs")
+    parser.add_argument("--output-root", default="outputs/batch", help="each job writes to <output-root>/<name>/")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU core)")
+    args = parser.parse_args()
+
+    summary, summary_path = run_batch(args.manifest, args.output_root, args.workers)
+    print(summary[["name", "status", "total_s"] + [f"{stage}_s" for stage in STAGES]].to_string(index=False))
+    print(f"Summary written to: {summary_path}")
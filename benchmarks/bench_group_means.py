@@ -0,0 +1,55 @@
+"""Benchmark of EDA group means: one groupby per (categorical, numeric) pair against one aggregation per categorical column.
+
+Run with: python -m benchmarks.bench_group_means --rows 200000 --categoricals 5
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+def group_means_per_pair(df: pd.DataFrame, categorical_columns: list, numeric_columns: list):
+    """Reference implementation: the categorical keys are re-hashed for every numeric column"""
+    return {
+        f"{cat_col}_vs_{num_col}_mean": df.groupby(cat_col)[num_col].mean().round(2).to_dict()
+        for cat_col in categorical_columns for num_col in numeric_columns
+    }
+
+def group_means_per_column(df: pd.DataFrame, categorical_columns: list, numeric_columns: list):
+    """Same metrics as execute_eda: one aggregation per categorical column covers every numeric column"""
+    metrics = {}
+    for cat_col in categorical_columns:
+        all_group_means = df.groupby(cat_col)[numeric_columns].mean()
+        for num_col in numeric_columns:
+            metrics[f"{cat_col}_vs_{num_col}_mean"] = all_group_means[num_col].round(2).to_dict()
+    return metrics
+
+def make_frame(rows: int, categoricals: int, numerics: int, cardinality: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(rows, numerics)), columns=[f"num_{i}" for i in range(numerics)])
+    for i in range(categoricals):
+        df[f"cat_{i}"] = rng.integers(0, cardinality, rows).astype(str)
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--categoricals", type=int, default=5)
+    parser.add_argument("--cardinality", type=int, default=50)
+    parser.add_argument("--numerics", type=int, nargs="+", default=[5, 20, 80])
+    args = parser.parse_args()
+
+    print(f"{'numeric cols':>12} {'per pair (s)':>13} {'per column (s)':>15} {'speed-up':>9} {'identical':>10}")
+    for numerics in args.numerics:
+        df = make_frame(args.rows, args.categoricals, numerics, args.cardinality)
+        categorical_columns = [c for c in df.columns if c.startswith("cat_")]
+        numeric_columns = [c for c in df.columns if c.startswith("num_")]
+
+        start = time.perf_counter()
+        per_pair = group_means_per_pair(df, categorical_columns, numeric_columns)
+        pair_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        per_column = group_means_per_column(df, categorical_columns, numeric_columns)
+        column_time = time.perf_counter() - start
+
+        print(f"{numerics:>12} {pair_time:>13.3f} {column_time:>15.3f} {pair_time / column_time:>8.1f}x {str(per_pair == per_column):>10}")
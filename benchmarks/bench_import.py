@@ -0,0 +1,67 @@
+"""Startup-time guard: how long `import run` takes and which heavy libraries it pulls in.
+
+Also checks that a warmed batch/service worker (batch.warm_worker) has the deferred stage libraries loaded.
+
+Run with: python -m benchmarks.bench_import --repeat 5 --budget-ms 1000
+Exits with status 1 when the median import time exceeds the budget, a deferred library is loaded at import,
+or a warmed worker is missing one.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Loaded only by the stages that need them (model, eda, report)
+DEFERRED_MODULES = ["sklearn", "scipy", "joblib", "matplotlib", "reportlab"]
+# What a warmed worker must have imported before its first job
+WARM_MODULES = ["sklearn", "matplotlib", "reportlab"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import run
+seconds = time.perf_counter() - started
+print(json.dumps({"seconds": seconds, "loaded": [m for m in %r if m in sys.modules]}))
+""" % DEFERRED_MODULES
+
+WARM_PROBE = """
+import json, sys
+import batch
+batch.warm_worker()
+print(json.dumps({"missing": [m for m in %r if m not in sys.modules]}))
+""" % WARM_MODULES
+
+def warm_worker_missing():
+    """Heavy libraries a freshly warmed worker still lacks"""
+    output = subprocess.run([sys.executable, "-c", WARM_PROBE], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])["missing"]
+
+def measure_import():
+    """Import time of `run` in a fresh interpreter, and the deferred modules it loaded"""
+    output = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000, help="maximum median import time")
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(args.repeat)]
+    median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+
+    print(f"import run: median {median_ms:.0f} ms over {args.repeat} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"deferred modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    missing = warm_worker_missing()
+    print(f"modules missing from a warmed worker: {', '.join(missing) or 'none'}")
+
+    if median_ms > args.budget_ms or loaded:
+        print("FAIL: startup budget exceeded")
+        sys.exit(1)
+    if missing:
+        print("FAIL: warmed workers would import stage libraries on their first job")
+        sys.exit(1)
+    print("OK")
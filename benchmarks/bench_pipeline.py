@@ -0,0 +1,223 @@
+"""Per-stage timing and peak-memory benchmark of the pipeline across a scale matrix of synthetic datasets.
+
+Run with: python -m benchmarks.bench_pipeline --rows 1000,10000,100000 --columns 10,50 --output results.json
+Compare with: python -m benchmarks.bench_pipeline ... --baseline baseline.json --tolerance 0.25
+Exits with status 1 when a stage is slower (or uses more peak memory) than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pipeline.ingest import load_inputs
+from pipeline.validate import validate_dataset
+from profiling.column_profiler import profile_columns
+from profiling.dataset_stats import DatasetStats
+from core.decision_engine import generate_decision_plan
+from pipeline.clean import execute_cleaning
+from pipeline.eda import execute_eda
+from pipeline.model import execute_model
+from risk.risk_aggregator import aggregate_risk
+from outputs.report_generator import generate_report
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+
+STAGES = ["load_inputs", "validate_dataset", "profile_columns", "generate_decision_plan",
+          "execute_cleaning", "execute_eda", "execute_model", "aggregate_risk", "generate_report"]
+
+# Decision log prefixes of each decision_engine branch, to show which ones a run exercised
+BRANCHES = {
+    "validation_failed": "Dataset failed validation",
+    "drop_missing": "dropped due to high missing",
+    "drop_constant": "dropped due to being constant",
+    "drop_id_like": "dropped due to ID-like",
+    "impute": "will be imputed using",
+    "imputation_skipped": "imputation skipped",
+    "eda_disabled": "EDA Disabled",
+    "modeling_disabled": "Modeling Disabled",
+    "no_numeric_columns": "No numeric columns available",
+    "target_selected": "as target column"
+}
+
+# Differences below these are timer and allocator noise, whatever the ratio
+NOISE_FLOOR = {"seconds": 0.05, "peak_mb": 1.0}
+
+def run_stages(dataset_path: str, rules_path: str, output_dir: str, measure):
+    """Run every stage in order as run.py does, wrapping each call with `measure(stage, func, *args)`"""
+    ingest_result = measure("load_inputs", load_inputs, dataset_path, rules_path)
+    df, rules = ingest_result["data"], ingest_result["rules"]
+    stats = DatasetStats(df, rules)
+
+    validation_result = measure("validate_dataset", validate_dataset, df, rules, stats)
+    if validation_result["status"] == "FAIL":
+        # Mirrors run.py's early exit: only a short report is written
+        decision_plan = {"columns_to_drop": [], "imputation_plan": {}, "eda_allowed": False,
+                         "modeling": {"modeling_allowed": False, "modeling_reason": "Dataset failed validation.", "target_column": None, "target_type": None},
+                         "decision_log": ["Dataset failed validation. All downstream actions disabled."] + validation_result["reasons"]}
+        risk_summary = {"data_quality_risks": validation_result["reasons"], "analysis_risks": [], "modeling_risks": [], "buisness_risks": []}
+        measure("generate_report", generate_report, validation_result, decision_plan, {"cleaning_log": []},
+                {"eda_metrics": {}, "plots": [], "eda_log": []}, {"model_used": None, "metrics": {}, "model_log": []},
+                risk_summary, os.path.join(output_dir, "report.pdf"))
+        return decision_plan
+
+    column_profiles = measure("profile_columns", profile_columns, df, rules, stats)
+    decision_plan = measure("generate_decision_plan", generate_decision_plan, validation_result, column_profiles, rules)
+    cleaning_result = measure("execute_cleaning", execute_cleaning, df, decision_plan, stats)
+    eda_result = measure("execute_eda", execute_eda, cleaning_result["cleaned_data"], decision_plan, os.path.join(output_dir, "eda"), stats, rules)
+    model_result = measure("execute_model", execute_model, cleaning_result["cleaned_data"], decision_plan, rules,
+                           os.path.join(output_dir, "model"), stats, cleaning_result["imputation_values"])
+    risk_summary = measure("aggregate_risk", aggregate_risk, validation_result, column_profiles, decision_plan,
+                           cleaning_result["cleaning_events"], eda_result, model_result, rules)
+    measure("generate_report", generate_report, validation_result, decision_plan, cleaning_result, eda_result,
+            model_result, risk_summary, os.path.join(output_dir, "report.pdf"))
+    return decision_plan
+
+def time_stages(dataset_path: str, rules_path: str, output_dir: str):
+    timings = {}
+    def measure(stage, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        timings[stage] = time.perf_counter() - started
+        return result
+    decision_plan = run_stages(dataset_path, rules_path, output_dir, measure)
+    return timings, decision_plan
+
+def peak_memory_stages(dataset_path: str, rules_path: str, output_dir: str):
+    """Peak traced allocation of each stage, in MB (a separate pass, since tracing slows the stages down)"""
+    peaks = {}
+    def measure(stage, func, *args):
+        tracemalloc.start()
+        try:
+            result = func(*args)
+            peaks[stage] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+        return result
+    run_stages(dataset_path, rules_path, output_dir, measure)
+    return peaks
+
+def branches_hit(decision_plan: dict):
+    log = decision_plan.get("decision_log", [])
+    return sorted(name for name, marker in BRANCHES.items() if any(marker in line for line in log))
+
+def benchmark_case(name: str, dataset_args: dict, rules_path: str, repeat: int, track_memory: bool, work_dir: str):
+    """Median stage timings (and peak memory) of one dataset configuration"""
+    case_dir = os.path.join(work_dir, name)
+    os.makedirs(case_dir, exist_ok=True)
+    dataset_path = os.path.join(case_dir, "data.csv")
+    make_dataset(**dataset_args).to_csv(dataset_path, index=False)
+
+    runs = []
+    decision_plan = None
+    for _ in range(repeat):
+        timings, decision_plan = time_stages(dataset_path, rules_path, case_dir)
+        runs.append(timings)
+
+    stages = {
+        stage: {"seconds": round(statistics.median(run[stage] for run in runs), 4)}
+        for stage in STAGES if stage in runs[0]
+    }
+    if track_memory:
+        for stage, peak in peak_memory_stages(dataset_path, rules_path, case_dir).items():
+            stages[stage]["peak_mb"] = round(peak, 2)
+
+    return {
+        "case": name,
+        "dataset": dataset_args,
+        "stages": stages,
+        "total_seconds": round(sum(stage["seconds"] for stage in stages.values()), 4),
+        "branches": branches_hit(decision_plan)
+    }
+
+def scale_matrix(rows: list, columns: list, categorical_share: float, missing_rate: float, cardinality: int, outlier_rate: float):
+    """One dataset configuration per (rows, columns) pair"""
+    for n_rows in rows:
+        for n_columns in columns:
+            categorical = int(round(n_columns * categorical_share))
+            yield f"rows{n_rows}_cols{n_columns}", {
+                "rows": n_rows,
+                "numeric": n_columns - categorical,
+                "categorical": categorical,
+                "missing_rate": missing_rate,
+                "cardinality": cardinality,
+                "outlier_rate": outlier_rate
+            }
+
+def compare(results: list, baseline: list, tolerance: float):
+    """Stages slower (or heavier) than the same case of the baseline by more than `tolerance`"""
+    baseline_cases = {case["case"]: case for case in baseline}
+    regressions = []
+    for case in results:
+        base = baseline_cases.get(case["case"])
+        if base is None:
+            continue
+        for stage, current in case["stages"].items():
+            previous = base["stages"].get(stage, {})
+            for metric in ("seconds", "peak_mb"):
+                if metric in current and previous.get(metric) and current[metric] - previous[metric] > NOISE_FLOOR[metric]:
+                    ratio = current[metric] / previous[metric]
+                    if ratio > 1 + tolerance:
+                        regressions.append(f"{case['case']} {stage} {metric}: {previous[metric]} -> {current[metric]} ({ratio:.2f}x)")
+    return regressions
+
+def run_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(), "commit": commit, "timestamp": time.time()}
+
+def int_list(value: str):
+    return [int(float(item)) for item in value.split(",") if item]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int_list, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--columns", type=int_list, default=[10, 50], help="regular columns per dataset (edge columns come on top)")
+    parser.add_argument("--categorical-share", type=float, default=0.3)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--cardinality", type=int, default=20)
+    parser.add_argument("--outlier-rate", type=float, default=0.01)
+    parser.add_argument("--edge-cases", action="store_true", help="also run the datasets driving the dataset-level decision branches")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the median is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak-memory pass")
+    parser.add_argument("--rules", default="core/rules.yaml")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio over the baseline")
+    args = parser.parse_args()
+
+    cases = list(scale_matrix(args.rows, args.columns, args.categorical_share, args.missing_rate, args.cardinality, args.outlier_rate))
+    if args.edge_cases:
+        cases += list(EDGE_CASES.items())
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as work_dir:
+        for name, dataset_args in cases:
+            case = benchmark_case(name, dataset_args, args.rules, args.repeat, not args.no_memory, work_dir)
+            results.append(case)
+            print(f"{name}: {case['total_seconds']:.2f}s  branches: {', '.join(case['branches'])}")
+            for stage, metrics in case["stages"].items():
+                peak = f"  peak {metrics['peak_mb']:.1f} MB" if "peak_mb" in metrics else ""
+                print(f"  {stage:<24}{metrics['seconds']:>10.3f}s{peak}")
+
+    with open(args.output, "w") as f:
+        json.dump({"meta": run_metadata(), "results": results}, f, indent=2)
+    print(f"Results written to: {args.output}")
+
+    covered = set().union(*(case["branches"] for case in results))
+    missing = sorted(set(BRANCHES) - covered)
+    if missing:
+        print(f"Decision branches not exercised: {', '.join(missing)}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions against the baseline.")
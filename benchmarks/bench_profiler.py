@@ -0,0 +1,86 @@
+"""Benchmark of the frame-level column profiler against the original per-column loop.
+
+Run with: python -m benchmarks.bench_profiler --rows 20000 --columns 2000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from profiling.column_profiler import profile_columns, is_id_like, outlier_percentage
+
+def profile_columns_loop(df: pd.DataFrame):
+    """Reference implementation: one Python iteration and several full passes per column"""
+    profiles={}
+    total_rows = len(df)
+
+    for column in df.columns:
+        series = df[column]
+        missing_pct = round(series.isnull().mean()*100,2)
+        unique_values = series.nunique(dropna=True)
+
+        if pd.api.types.is_numeric_dtype(series):
+            column_type = "numeric"
+            variance = float(series.var()) if series.var() is not None else None
+            outlier_pct = outlier_percentage(series)
+        else:
+            column_type = "categorical"
+            variance = None
+            outlier_pct = None
+
+        profiles[column] = {
+            "type":column_type,
+            "missing_pct":missing_pct,
+            "unique_values":unique_values,
+            "variance":variance,
+            "outlier_pct":outlier_pct,
+            "is_id_like":is_id_like(column,series,total_rows)
+        }
+
+    return profiles
+
+def make_frame(rows: int, columns: int, seed: int = 0):
+    """Wide frame of mostly numeric columns with missing values, plus a few categoricals"""
+    rng = np.random.default_rng(seed)
+    numeric = rng.normal(size=(rows, columns)).round(2)
+    numeric[rng.random(numeric.shape) < 0.05] = np.nan
+    df = pd.DataFrame(numeric, columns=[f"num_{i}" for i in range(columns)])
+    for i in range(max(columns // 20, 1)):
+        df[f"cat_{i}"] = rng.choice(["a", "b", "c", "d"], rows)
+    return df
+
+def time_call(func, df, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def same_profiles(left: dict, right: dict):
+    """Profiles match exactly, except variance which may differ in the last floating point bits"""
+    for column, profile in left.items():
+        other = right[column]
+        for key, value in profile.items():
+            if key == "variance" and value is not None:
+                if not np.isclose(value, other[key], rtol=1e-12, equal_nan=True):
+                    return False
+            elif value != other[key]:
+                return False
+    return left.keys() == right.keys()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.columns)
+    loop_time, loop_profiles = time_call(profile_columns_loop, df, args.repeat)
+    frame_time, frame_profiles = time_call(profile_columns, df, args.repeat)
+
+    print(f"Frame shape: {df.shape}")
+    print(f"Per-column loop:  {loop_time:.3f}s")
+    print(f"Frame-level:      {frame_time:.3f}s")
+    print(f"Speed-up:         {loop_time / frame_time:.1f}x")
+    print(f"Identical output: {same_profiles(loop_profiles, frame_profiles)}")
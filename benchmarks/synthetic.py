@@ -0,0 +1,79 @@
+"""Synthetic dataset generator for benchmarks, with controllable shape, missingness, cardinality and outliers.
+
+Run with: python -m benchmarks.synthetic --rows 100000 --numeric 20 --categorical 5 --output data/synthetic.csv
+
+Besides the regular columns, every dataset carries edge columns that drive each column-level branch of
+core.decision_engine with the default rules: an ID column, a constant column, a mostly missing numeric
+column (dropped), and numeric/categorical columns missing often enough that imputation is skipped.
+The dataset-level branches (validation failure, EDA and modeling disabled, no numeric column left)
+come from EDGE_CASES, which vary the row count and the columns instead.
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+SPARSE_MISSING_RATE = 0.4 # above column_cleaning.drop_column_if_missing_pct_gt
+PATCHY_MISSING_RATE = 0.2 # between the imputation limit and the drop limit
+
+# Dataset-level decision branches, as generator arguments
+EDGE_CASES = {
+    "validation_fail": {"rows": 30, "numeric": 3, "categorical": 1},
+    "eda_and_modeling_disabled": {"rows": 80, "numeric": 3, "categorical": 1},
+    "modeling_disabled": {"rows": 300, "numeric": 3, "categorical": 1},
+    "no_numeric_left": {"rows": 1000, "numeric": 0, "categorical": 2}
+}
+
+def make_dataset(rows: int, numeric: int = 10, categorical: int = 3, missing_rate: float = 0.05,
+                 cardinality: int = 20, outlier_rate: float = 0.01, seed: int = 0, edge_columns: bool = True):
+    """
+    Frame with `numeric` float columns (the last one is the modeling target), `categorical` string columns of
+    `cardinality` levels, `missing_rate` of each regular column missing and `outlier_rate` of numeric values
+    pushed far outside the IQR fences.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+
+    if edge_columns:
+        columns["record_id"] = np.arange(rows)
+        columns["constant"] = np.ones(rows)
+        columns["sparse_metric"] = np.where(rng.random(rows) < SPARSE_MISSING_RATE, np.nan, rng.random(rows))
+
+    levels = np.array([f"level_{i}" for i in range(max(cardinality, 1))], dtype=object)
+    for i in range(categorical):
+        values = levels[rng.integers(0, len(levels), rows)]
+        values[rng.random(rows) < missing_rate] = None
+        columns[f"cat_{i}"] = values
+
+    if edge_columns and categorical:
+        values = levels[rng.integers(0, len(levels), rows)]
+        values[rng.random(rows) < PATCHY_MISSING_RATE] = None
+        columns["patchy_category"] = values
+
+    if edge_columns and numeric:
+        columns["patchy_metric"] = np.where(rng.random(rows) < PATCHY_MISSING_RATE, np.nan, rng.normal(0, 1, rows))
+
+    for i in range(numeric):
+        values = rng.normal(100 * (i + 1), 10 * (i + 1), rows)
+        outliers = rng.random(rows) < outlier_rate
+        values[outliers] += rng.choice([-1, 1], outliers.sum()) * 20 * 10 * (i + 1)
+        if i < numeric - 1: # the target stays complete
+            values[rng.random(rows) < missing_rate] = np.nan
+        columns[f"num_{i}"] = values
+
+    return pd.DataFrame(columns)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--numeric", type=int, default=10)
+    parser.add_argument("--categorical", type=int, default=3)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--cardinality", type=int, default=20)
+    parser.add_argument("--outlier-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="synthetic.csv")
+    args = parser.parse_args()
+
+    df = make_dataset(args.rows, args.numeric, args.categorical, args.missing_rate, args.cardinality, args.outlier_rate, args.seed)
+    df.to_csv(args.output, index=False)
+    print(f"Wrote {len(df)} rows x {df.shape[1]} columns to {args.output}")
@@ -1,4 +1,7 @@
 """This is the core engine for decision making based on predefined rules."""
+import numpy as np
+from core.rule_compiler import CompiledRules, profile_table, column_messages, DROP_ACTIONS, DROP_MISSING, DROP_CONSTANT, DROP_ID_LIKE, IMPUTE, IMPUTATION_SKIPPED
+from profiling.sampling import describe_sample
 
 def generate_decision_plan(validation_result: dict, column_profiles: dict, rules: dict):
     """Generates a decision plan based on validation results, column profiles, and rules."""
@@ -19,50 +22,57 @@ def generate_decision_plan(validation_result: dict, column_profiles: dict, rules
         }
     
     # Dataset passed validation, proceed with profiling and rule application
-    columns_to_drop = []
-    imputation_plan = {}
-
-    col_rules = rules.get("column_cleaning", {})
-    missing_rules = rules.get("missing_values", {})
     eda_rules = rules.get("eda", {})
     modeling_rules = rules.get("modeling", {})
 
-    # Column-level decisions
-    for column, profile in column_profiles.items():
-
-        # Drop Rules
-        if profile["missing_pct"] >= col_rules.get("drop_column_if_missing_pct_gt",100):
-            columns_to_drop.append(column)
-            decision_log.append(f"Column '{column}' dropped due to high missing percentage = ({profile['missing_pct']}%).")
-            continue
-    
-        if col_rules.get("drop_constant_columns", False) and profile["unique_values"] <= 1:
-            columns_to_drop.append(column)
-            decision_log.append(f"Column '{column}' dropped due to being constant.")
-            continue
+    # Approximate profiles carry error bounds; record how far the estimates may be off
+    bounded = [profile["error_bounds"] for profile in column_profiles.values() if "error_bounds" in profile]
+    if bounded:
+        distinct_error = max(bounds.get("unique_values", 0) for bounds in bounded)
+        outlier_error = max(bounds.get("outlier_pct", 0) for bounds in bounded)
+        decision_log.append(f"Column profiles are approximate: unique counts within ±{distinct_error*100:.2f}%, outlier percentages within ±{outlier_error} percentage points.")
 
-        if col_rules.get("drop_id_like_columns", False) and profile["is_id_like"]:
-            columns_to_drop.append(column)
-            decision_log.append(f"Column '{column}' dropped due to ID-like characterstics.")
-            continue
+    # Column-level decisions: every rule is evaluated at once over the profile table
+    compiled = CompiledRules(rules)
+    table = profile_table(column_profiles)
+    actions = compiled.column_actions(table)
+    action = actions["action"].to_numpy()
 
-        # Imputation Decisions
-        if profile["missing_pct"] > 0:
-            if profile["type"]=="numeric":
-                if profile["missing_pct"] <= missing_rules["numeric"]["if_missing_pct_lt"]:
-                    imputation_plan[column] = missing_rules["numeric"]["strategy"]
-                    decision_log.append(f"Column '{column}' will be imputed using {missing_rules['numeric']['strategy']}.")
-                
-                else:
-                    decision_log.append(f"Column '{column}' missing percentage too high ({profile['missing_pct']}%), imputation skipped.")
+    # Sampled profiles carry their sample; record it with the confidence interval of every estimated outlier percentage
+    sampled = np.array(["sample" in profile for profile in column_profiles.values()], dtype=bool)
+    sampling = None
+    if sampled.any():
+        sample = column_profiles[table.index[sampled][0]]["sample"]
+        sampling = {key: value for key, value in sample.items() if key != "outlier_pct_ci"}
+        decision_log.append(f"Outlier percentages estimated from a {describe_sample(sampling)}; {sampling['confidence_level']*100:g}% confidence intervals follow.")
+        decision_log.extend(column_messages(table, column_profiles, [
+            (sampled,
+             lambda column, profile: f"Column '{column}' outlier percentage {profile['outlier_pct']}% (CI {profile['sample']['outlier_pct_ci'][0]}% to {profile['sample']['outlier_pct_ci'][1]}%).",
+             "{count} more columns have sampled outlier percentages.")
+        ], compiled.log_limit))
 
-            elif profile["type"]=="categorical":
-                if profile["missing_pct"] <= missing_rules["categorical"]["if_missing_pct_lt"]:
-                    imputation_plan[column] = missing_rules["categorical"]["strategy"]
-                    decision_log.append(f"Column '{column}' will be imputed using {missing_rules['categorical']['strategy']}.")
-                
-                else:
-                    decision_log.append(f"Column '{column}' missing percentage too high ({profile['missing_pct']}%), imputation skipped.")
+    dropped = np.isin(action, DROP_ACTIONS)
+    columns_to_drop = list(table.index[dropped])
+    imputed = actions[action == IMPUTE]
+    imputation_plan = dict(zip(imputed.index, imputed["strategy"]))
+    
+    decision_log.extend(column_messages(table, column_profiles, [
+        (action == DROP_MISSING,
+         lambda column, profile: f"Column '{column}' dropped due to high missing percentage = ({profile['missing_pct']}%).",
+         "{count} more columns dropped due to high missing percentage."),
+        (action == DROP_CONSTANT,
+         lambda column, profile: f"Column '{column}' dropped due to being constant.",
+         "{count} more columns dropped due to being constant."),
+        (action == DROP_ID_LIKE,
+         lambda column, profile: f"Column '{column}' dropped due to ID-like characterstics.",
+         "{count} more columns dropped due to ID-like characterstics."),
+        (action == IMPUTE,
+         lambda column, profile: f"Column '{column}' will be imputed using {imputation_plan[column]}.",
+         "{count} more columns will be imputed."),
+        (action == IMPUTATION_SKIPPED,
+         lambda column, profile: f"Column '{column}' missing percentage too high ({profile['missing_pct']}%), imputation skipped.",
+         "{count} more columns have too high a missing percentage for imputation; imputation skipped.")
+    ], compiled.log_limit))
         
     # EDA Decisions
     eda_allowed=True
@@ -86,7 +96,7 @@ def generate_decision_plan(validation_result: dict, column_profiles: dict, rules
         decision_log.append(modeling_reason)
         
     # Target selection rule (v1)
-    numeric_columns = [col for col,prof in column_profiles.items() if prof["type"]=="numeric" and col not in columns_to_drop]
+    numeric_columns = list(table.index[(table["type"].to_numpy()=="numeric") & ~dropped])
     
     if modeling_allowed:
         if not numeric_columns:
@@ -110,5 +120,6 @@ def generate_decision_plan(validation_result: dict, column_profiles: dict, rules
             "target_type": target_type
             },
         "risk_checks": list(rules.get("risk_flags",{}).keys()),
+        "sampling": sampling,
         "decision_log": decision_log
     }
@@ -0,0 +1,100 @@
+"""This module is responsible for compiling rules into vectorized predicates over a columnar table of column profiles."""
+import numpy as np
+import pandas as pd
+
+# Column-level actions, in the precedence order of the decision engine
+DROP_MISSING = "drop_missing"
+DROP_CONSTANT = "drop_constant"
+DROP_ID_LIKE = "drop_id_like"
+IMPUTE = "impute"
+IMPUTATION_SKIPPED = "imputation_skipped"
+KEEP = "keep"
+DROP_ACTIONS = (DROP_MISSING, DROP_CONSTANT, DROP_ID_LIKE)
+
+def profile_table(column_profiles: dict):
+    """One row per column of the profile dict; missing outlier percentages become NaN, so no comparison flags them"""
+    profiles = column_profiles.values()
+    return pd.DataFrame({
+        "type": np.array([profile["type"] for profile in profiles], dtype=object),
+        "missing_pct": np.array([profile["missing_pct"] for profile in profiles], dtype=np.float64),
+        "unique_values": np.array([profile["unique_values"] for profile in profiles], dtype=np.float64),
+        "outlier_pct": np.array([np.nan if profile["outlier_pct"] is None else profile["outlier_pct"] for profile in profiles], dtype=np.float64),
+        "is_id_like": np.array([bool(profile["is_id_like"]) for profile in profiles], dtype=bool)
+    }, index=pd.Index(list(column_profiles), dtype=object))
+
+def column_messages(table: pd.DataFrame, column_profiles: dict, checks: list, limit: int = None):
+    """
+    Messages of the columns flagged by each (mask, message(column, profile), summary) check, in column order.
+    With a `limit`, each check names at most that many columns and sums up the rest with its summary.
+    """
+    entries = []
+    summaries = []
+    for order, (mask, message, summary) in enumerate(checks):
+        positions = np.flatnonzero(mask).tolist()
+        if limit is not None and len(positions) > limit:
+            summaries.append(summary.format(count=len(positions) - limit))
+            positions = positions[:limit]
+        entries.extend((position, order, message) for position in positions)
+
+    entries.sort(key=lambda entry: entry[:2])
+    names = table.index.tolist()
+    return [message(names[position], column_profiles[names[position]]) for position, _, message in entries] + summaries
+
+class CompiledRules:
+    """Rule thresholds read once from the rules, evaluated as boolean masks over a profile table."""
+
+    def __init__(self, rules: dict):
+        col_rules = rules.get("column_cleaning", {})
+        missing_rules = rules.get("missing_values", {})
+        risk_rules = rules.get("risk_flags", {})
+
+        self.drop_missing_pct = col_rules.get("drop_column_if_missing_pct_gt", 100)
+        self.drop_constant = col_rules.get("drop_constant_columns", False)
+        self.drop_id_like = col_rules.get("drop_id_like_columns", False)
+        # column type -> (highest missing percentage still imputed, strategy)
+        self.imputation = {
+            column_type: (missing_rules[column_type]["if_missing_pct_lt"], missing_rules[column_type]["strategy"])
+            for column_type in ("numeric", "categorical") if column_type in missing_rules
+        }
+
+        self.high_missing_pct = risk_rules.get("data_quality", {}).get("high_missing_pct", 100)
+        self.high_outlier_pct = risk_rules.get("data_quality", {}).get("high_outlier_pct", 100)
+        self.extreme_values_pct = risk_rules.get("business_risks", {}).get("extreme_values_pct_gt", 100)
+
+        self.log_limit = rules.get("outputs", {}).get("max_logged_columns_per_rule")
+
+    def column_actions(self, table: pd.DataFrame):
+        """Action and imputation strategy of every column: the first drop rule that matches, else impute or skip imputation"""
+        missing = table["missing_pct"].to_numpy()
+        column_type = table["type"].to_numpy()
+
+        drop_missing = missing >= self.drop_missing_pct
+        drop_constant = np.full(len(table), bool(self.drop_constant)) & (table["unique_values"].to_numpy() <= 1)
+        drop_id_like = np.full(len(table), bool(self.drop_id_like)) & table["is_id_like"].to_numpy()
+
+        strategy = np.full(len(table), None, dtype=object)
+        imputable = np.zeros(len(table), dtype=bool)
+        configured = np.zeros(len(table), dtype=bool)
+        for type_name, (limit, type_strategy) in self.imputation.items():
+            of_type = column_type == type_name
+            configured |= of_type
+            imputable |= of_type & (missing <= limit)
+            strategy[of_type] = type_strategy
+
+        has_missing = configured & (missing > 0)
+        actions = np.select(
+            [drop_missing, drop_constant, drop_id_like, has_missing & imputable, has_missing],
+            [DROP_MISSING, DROP_CONSTANT, DROP_ID_LIKE, IMPUTE, IMPUTATION_SKIPPED],
+            default=KEEP
+        )
+        strategy[actions != IMPUTE] = None
+        return pd.DataFrame({"action": actions, "strategy": strategy}, index=table.index)
+
+    def risk_masks(self, table: pd.DataFrame):
+        """Per-column risk flags: high missing, high outlier and extreme value percentages"""
+        outliers = table["outlier_pct"].to_numpy()
+        return {
+            "high_missing": table["missing_pct"].to_numpy() >= self.high_missing_pct,
+            "high_outlier": outliers >= self.high_outlier_pct,
+            "extreme_values": outliers >= self.extreme_values_pct
+        }
@@ -0,0 +1,72 @@
+"""It renders plot jobs into PNG artifacts headlessly, without touching pyplot's global state."""
+import random
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from pipeline.tracing import span
+from profiling.parallel import process_context
+
+def correlation_plot_job(correlations: pd.Series, plot_path: str):
+    return {"kind": "correlation", "path": plot_path, "data": correlations}
+
+def distribution_plot_job(series: pd.Series, plot_path: str):
+    return {"kind": "distribution", "path": plot_path, "data": series.dropna(), "column": series.name}
+
+def boxplot_job(df: pd.DataFrame, num_col: str, cat_col: str, plot_path: str):
+    return {"kind": "boxplot", "path": plot_path, "data": df[[num_col, cat_col]], "num_col": num_col, "cat_col": cat_col}
+
+def render_plot(job: dict):
+    """Render a single plot job on its own Agg-backed Figure and return the saved path"""
+    with span(f"plot.{job['kind']}", rows=len(job["data"])):
+        return _render_plot(job)
+
+def _render_plot(job: dict):
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    if job["kind"] == "correlation":
+        job["data"].plot(kind='bar', ax=ax)
+
+    elif job["kind"] == "distribution":
+        ax.hist(job["data"])
+        ax.grid(True)
+        ax.set_title(f"Distribution of {job['column']}")
+        ax.set_xlabel(job["column"])
+        ax.set_ylabel("Frequency")
+
+    elif job["kind"] == "boxplot":
+        num_col, cat_col = job["num_col"], job["cat_col"]
+        job["data"].boxplot(column=num_col, by=cat_col, ax=ax)
+        ax.set_title(f"{num_col} by {cat_col}")
+        fig.suptitle("")
+        ax.set_xlabel(cat_col)
+        ax.set_ylabel(num_col)
+
+    else:
+        raise ValueError(f"Unknown plot kind: {job['kind']}")
+
+    fig.tight_layout()
+    fig.savefig(job["path"])
+    return job["path"]
+
+def render_plots(jobs: list, workers: int = 1):
+    """Render plot jobs, fanned out across a process pool when workers > 1; paths come back in job order"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [render_plot(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        chunksize = max(len(jobs) // (workers * 4), 1)
+        return list(pool.map(render_plot, jobs, chunksize=chunksize))
+
+def select_pairs(pairs: list, max_pairs: int = None, sampling: str = "first", seed: int = 0):
+    """Apply the pairwise plot cap: keep the first `max_pairs` pairs, or a seeded random sample kept in original order"""
+    if max_pairs is None or len(pairs) <= max_pairs:
+        return list(pairs)
+
+    if sampling == "random":
+        chosen = set(random.Random(seed).sample(range(len(pairs)), max_pairs))
+        return [pair for i, pair in enumerate(pairs) if i in chosen]
+
+    return list(pairs[:max_pairs])
@@ -1,10 +1,34 @@
 """It formats existing truth into consumable artifacts."""
 import os
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
+from profiling.sampling import describe_sample
 
-def generate_report(validation_result: dict, decision_plan: dict, cleaning_result: dict, eda_result: dict, model_result: dict, risk_summary: dict, output_path: str = "outputs/report.pdf"):
+def timing_table(timings: list):
+    """Appendix table of traced spans: stages first, inner hot loops indented under them"""
+    def number(value, digits):
+        return "" if value is None else f"{value:.{digits}f}"
+
+    data = [["Span", "Calls", "Wall s", "CPU s", "Peak RSS MB", "Rows", "Columns"]]
+    for row in sorted(timings, key=lambda row: row["category"] != "stage"):
+        name = row["name"] if row["category"] == "stage" else f"  {row['category']}: {row['name']}"
+        data.append([
+            name, row["calls"], number(row["wall_s"], 3), number(row["cpu_s"], 3), number(row["peak_rss_mb"], 1),
+            "" if row["rows"] is None else row["rows"], "" if row["columns"] is None else row["columns"]
+        ])
+
+    table = Table(data, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.grey)
+    ]))
+    return table
+
+def generate_report(validation_result: dict, decision_plan: dict, cleaning_result: dict, eda_result: dict, model_result: dict, risk_summary: dict, output_path: str = "outputs/report.pdf", timings: list = None):
     """Generate Report pdf which includes Executive Summary,Decision Taken, Key Findings, Risks & Warnings, Appendix"""
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -26,6 +50,11 @@ def generate_report(validation_result: dict, decision_plan: dict, cleaning_resul
 
     add_text(f"Dataset rows: {validation_result['metrics']['rows']}")
     add_text(f"Dataset columns: {validation_result['metrics']['columns']}")
+    if "memory_after_mb" in validation_result["metrics"]:
+        add_text(f"In-memory size: {validation_result['metrics']['memory_after_mb']} MB (from {validation_result['metrics']['memory_before_mb']} MB as parsed)")
+    sampling = decision_plan.get("sampling")
+    if sampling:
+        add_text(f"Sampled statistics: outlier percentages and EDA from a {describe_sample(sampling)}, with {sampling['confidence_level']*100:g}% confidence intervals; row counts and model training use every row")
     add_text(f"EDA allowed: {decision_plan.get('eda_allowed')}")
     add_text(f"Modeling allowed: {decision_plan.get('modeling', {}).get('modeling_allowed')}")
 
@@ -75,5 +104,11 @@ def generate_report(validation_result: dict, decision_plan: dict, cleaning_resul
         for r in risks:
             add_text(f"- {r}")
 
+    # Appendix: run timings (traced runs only)
+    if timings:
+        add_heading("Appendix: Run Timings")
+        add_text("Time spent per stage and in the traced inner loops, up to the start of report generation. CPU time is that of the calling thread; work done in worker processes shows up as wall time only.")
+        story.append(timing_table(timings))
+
     doc.build(story)
     return output_path
\ No newline at end of file
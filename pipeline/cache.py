@@ -0,0 +1,174 @@
+"""This module is responsible for caching parsed datasets in a columnar on-disk format."""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError: # not available on Windows; index updates are then unlocked
+    fcntl = None
+
+def _arrow():
+    """pyarrow and its Feather module, imported on first use so loading this module stays cheap; (None, None) without pyarrow"""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError: # Cache is simply unavailable without pyarrow
+        return None, None
+    return pa, feather
+
+HASH_BLOCK_SIZE = 8 * 1024 * 1024 # bytes read per step while hashing dataset content
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+@contextmanager
+def index_lock(directory: str):
+    """
+    Exclusive lock on the index of a store directory, held across each read-modify-write of it so concurrent
+    runs (batch or service workers, threads) neither lose each other's entries nor evict files just written
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILE), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _content_hash(dataset_path: str):
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(dataset_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+@functools.lru_cache(maxsize=64)
+def _memoized_content_hash(path: str, size: int, mtime_ns: int):
+    """Content hash of a file version; ingest, stage checkpoints and the model registry all key on the same input"""
+    return _content_hash(path)
+
+def file_fingerprint(dataset_path: str):
+    """Fingerprint a file by its path, size, modification time and content hash (hashed once per file version and process)"""
+    path = os.path.abspath(dataset_path)
+    stat = os.stat(path)
+
+    key = hashlib.sha256()
+    for part in (path, stat.st_size, stat.st_mtime_ns, _memoized_content_hash(path, stat.st_size, stat.st_mtime_ns)):
+        key.update(str(part).encode())
+    return key.hexdigest()
+
+class IngestCache:
+    """Content-addressed cache of parsed datasets stored as uncompressed Feather (Arrow IPC) files."""
+
+    def __init__(self, cache_dir: str = "outputs/cache/ingest", max_size_mb: float = 2048):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+
+    @property
+    def available(self):
+        return _arrow()[0] is not None
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp" # concurrent runs may share the directory
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path) # Atomic swap so readers never see a partial index
+
+    def _entry_path(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def get(self, dataset_path: str, key: str = None):
+        """Return the cached frame for a dataset, or None on a cache miss"""
+        if not self.available:
+            return None
+
+        key = key or file_fingerprint(dataset_path)
+        entry_path = self._entry_path(key)
+        _, feather = _arrow()
+        with index_lock(self.cache_dir):
+            index = self._load_index()
+            if key not in index or not os.path.exists(entry_path):
+                return None
+
+            # Memory-mapped, so the table stays readable even if another run evicts the file once the lock is released
+            table = feather.read_table(entry_path, memory_map=True)
+            index[key]["last_access"] = time.time()
+            self._save_index(index)
+
+        # split_blocks lets null-free numeric columns reuse the mapped buffers
+        return table.to_pandas(split_blocks=True)
+
+    def put(self, dataset_path: str, data: pd.DataFrame, key: str = None):
+        """Store a parsed frame in the cache and evict least recently used entries over the size cap"""
+        if not self.available:
+            return None
+
+        key = key or file_fingerprint(dataset_path)
+        pa, feather = _arrow()
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return None # Mixed-type object columns cannot be stored columnar; skip caching
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # Written outside the lock under a private name, then moved into place together with its index entry
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+
+        with index_lock(self.cache_dir):
+            os.replace(tmp_path, entry_path)
+            index = self._load_index()
+            index[key] = {
+                "source_path": os.path.abspath(dataset_path),
+                "bytes": os.path.getsize(entry_path),
+                "last_access": time.time()
+            }
+            self._evict(index)
+            self._save_index(index)
+        return entry_path
+
+    def _evict(self, index: dict):
+        """Drop least recently used entries until the cache fits within its size cap"""
+        total_bytes = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total_bytes <= self.max_size_bytes:
+                break
+            total_bytes -= index[key]["bytes"]
+            self._remove(index, key)
+
+    def _remove(self, index: dict, key: str):
+        entry_path = self._entry_path(key)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+        index.pop(key, None)
+
+    def invalidate(self, dataset_path: str = None):
+        """Remove cached entries of one dataset (any version of it), or every entry when no path is given"""
+        source_path = os.path.abspath(dataset_path) if dataset_path else None
+        with index_lock(self.cache_dir):
+            index = self._load_index()
+            removed = 0
+            for key in list(index):
+                if source_path is None or index[key]["source_path"] == source_path:
+                    self._remove(index, key)
+                    removed += 1
+
+            self._save_index(index)
+        return removed
@@ -0,0 +1,119 @@
+"""This module is responsible for checkpointing stage outputs on disk so unchanged stages are reused on re-runs."""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+OUTPUTS_FILE = "outputs.pkl"
+META_FILE = "meta.json"
+FILES_DIR = "files"
+
+def value_fingerprint(value):
+    """Content fingerprint of a picklable value"""
+    return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+def rules_subset(rules: dict, rule_keys: list):
+    """The parts of the rules a stage reads, addressed by dotted paths such as 'eda.skip_eda_if_rows_lt'"""
+    subset = {}
+    for path in rule_keys:
+        value = rules
+        for part in path.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        subset[path] = value
+    return subset
+
+def stage_key(stage_name: str, input_fingerprints: dict, rules_part: dict = None):
+    """Checkpoint key of a stage: its name, the fingerprints of its inputs and the rules it reads"""
+    key = hashlib.sha256()
+    key.update(json.dumps({
+        "stage": stage_name,
+        "inputs": input_fingerprints,
+        "rules": rules_part
+    }, sort_keys=True, default=str).encode())
+    return key.hexdigest()
+
+class StageCheckpoints:
+    """
+    On-disk stage outputs, one directory per (stage, key) holding the pickled outputs, their content
+    fingerprints and copies of the files the stage wrote (plots, artifacts, reports).
+    Records whether each stage of the current run was reused or recomputed.
+    """
+
+    def __init__(self, checkpoint_dir: str = "outputs/cache/stages", max_per_stage: int = 5):
+        self.checkpoint_dir = checkpoint_dir
+        self.max_per_stage = max_per_stage
+        self.status = {} # stage name -> "reused" | "recomputed" | "not checkpointed"
+
+    def _entry_dir(self, stage_name: str, key: str):
+        return os.path.join(self.checkpoint_dir, stage_name, key)
+
+    def load(self, stage_name: str, key: str):
+        """Outputs and output fingerprints of a checkpoint, with its files restored in place; None on a miss"""
+        entry_dir = self._entry_dir(stage_name, key)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+        stored_files = [os.path.join(entry_dir, FILES_DIR, str(i)) for i in range(len(meta["files"]))]
+        if not all(os.path.exists(path) for path in stored_files):
+            return None
+
+        with open(os.path.join(entry_dir, OUTPUTS_FILE), "rb") as f:
+            values = pickle.load(f)
+
+        # Files are restored rather than trusted in place, since another run may have overwritten them since
+        for stored, original in zip(stored_files, meta["files"]):
+            os.makedirs(os.path.dirname(original) or ".", exist_ok=True)
+            shutil.copyfile(stored, original)
+
+        os.utime(meta_path) # recently used
+        return values, meta["fingerprints"]
+
+    def save(self, stage_name: str, key: str, outputs: list, values: tuple, files: list = None):
+        """Store a stage's outputs and the files it wrote; returns the outputs' content fingerprints"""
+        payloads = [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in values]
+        fingerprints = {name: hashlib.blake2b(payload, digest_size=16).hexdigest() for name, payload in zip(outputs, payloads)}
+        files = [path for path in (files or []) if path and os.path.exists(path)]
+
+        entry_dir = self._entry_dir(stage_name, key)
+        tmp_dir = f"{entry_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_dir, FILES_DIR))
+
+        with open(os.path.join(tmp_dir, OUTPUTS_FILE), "wb") as f:
+            pickle.dump(tuple(values), f, protocol=pickle.HIGHEST_PROTOCOL)
+        for i, path in enumerate(files):
+            shutil.copyfile(path, os.path.join(tmp_dir, FILES_DIR, str(i)))
+        with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+            json.dump({"fingerprints": fingerprints, "files": files, "created": time.time()}, f, indent=2)
+
+        # Swap the finished directory in, so a crash never leaves a partial checkpoint behind
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        self._evict(stage_name)
+        return fingerprints
+
+    def _evict(self, stage_name: str):
+        """Keep only the most recently used checkpoints of a stage"""
+        stage_dir = os.path.join(self.checkpoint_dir, stage_name)
+        entries = [
+            os.path.join(stage_dir, name) for name in os.listdir(stage_dir)
+            if os.path.exists(os.path.join(stage_dir, name, META_FILE))
+        ]
+        entries.sort(key=lambda path: os.path.getmtime(os.path.join(path, META_FILE)), reverse=True)
+        for path in entries[self.max_per_stage:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        """Remove every checkpoint"""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+    def summary(self):
+        """One line per stage of the current run, in execution order"""
+        return [f"{stage}: {status}" for stage, status in self.status.items()]
@@ -1,41 +1,65 @@
 """This module is responsible for cleaning the dataset based on decision plan."""
 import pandas as pd
+from profiling.dataset_stats import DatasetStats
 
-def execute_cleaning(df: pd.DataFrame, decision_plan: dict):
+def execute_cleaning(df: pd.DataFrame, decision_plan: dict, stats: DatasetStats = None):
     """Clean the dataset based on decision plan"""
-    cleaned_df = df.copy()
     cleaning_log = []
+    cleaning_events = [] # structured counterpart of the log, one record per dropped or imputed column
 
     # Drop Columns
     drop_columns = decision_plan.get("columns_to_drop", [])
     for column in drop_columns:
-        if column in cleaned_df.columns:
-            cleaned_df.drop(columns=[column], inplace=True)
+        # Streamed datasets never materialize the columns dropped by the decision plan
+        at_ingest = column not in df.columns
+        if not at_ingest:
             cleaning_log.append(f"Dropped column '{column}' as per decision plan.")
+        else:
+            cleaning_log.append(f"Dropped column '{column}' at ingest as per decision plan.")
+        cleaning_events.append({"event": "drop_column", "column": column, "at_ingest": at_ingest})
 
-    # Imputation
+    dropped = set(drop_columns)
+    kept_columns = [column for column in df.columns if column not in dropped]
+
+    # Imputation: resolve every fill value first, then fill all imputed columns in one batch
     imputation_plan = decision_plan.get("imputation_plan", {})
+    fill_values = {}
     for column, strategy in imputation_plan.items():
 
-        if column not in cleaned_df.columns:
+        if column not in df.columns or column in dropped:
             continue
 
         if strategy == "median":
-            median_value = cleaned_df[column].median()
-            cleaned_df[column]= cleaned_df[column].fillna(median_value)
+            median_value = stats.medians[column] if stats is not None else df[column].median()
+            fill_values[column] = median_value
             cleaning_log.append(f"Imputed missing values in column '{column}' with median value {median_value}.")
 
         elif strategy == "mean":
-            mean_value = cleaned_df[column].mean()
-            cleaned_df[column]= cleaned_df[column].fillna(mean_value)
+            mean_value = stats.means[column] if stats is not None else df[column].mean()
+            fill_values[column] = mean_value
             cleaning_log.append(f"Imputed missing values in column '{column}' with mean value {mean_value}.")
 
         elif strategy == "mode":
-            mode_value = cleaned_df[column].mode()[0]
-            cleaned_df[column]= cleaned_df[column].fillna(mode_value)
+            mode_value = stats.mode(column) if stats is not None else df[column].mode()[0]
+            fill_values[column] = mode_value
             cleaning_log.append(f"Imputed missing values in column '{column}' with mode value {mode_value}.")
 
+        if column in fill_values:
+            cleaning_events.append({"event": "impute", "column": column, "strategy": strategy, "value": fill_values[column]})
+
+    imputed = df[list(fill_values)].fillna(fill_values) if fill_values else None
+
+    # Assemble the cleaned frame without a full copy: only imputed columns get new buffers,
+    # every other kept column shares its buffer with the input frame
+    cleaned_df = pd.DataFrame(
+        {column: imputed[column] if column in fill_values else df[column] for column in kept_columns},
+        index=df.index,
+        copy=False
+    )
+
     return {
         "cleaned_data": cleaned_df,
-        "cleaning_log": cleaning_log
+        "cleaning_log": cleaning_log,
+        "cleaning_events": cleaning_events,
+        "imputation_values": fill_values
     }
@@ -0,0 +1,73 @@
+"""This module is responsible for finding strongly correlated numeric column pairs with bounded memory."""
+import numpy as np
+import pandas as pd
+
+def standardize(df: pd.DataFrame, columns: list):
+    """Standardized float32 copy of the columns (NaN kept) and their not-null mask"""
+    values = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    mask = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        values = (values - mean) / np.where(std > 0, std, np.nan)
+    return values, mask
+
+def correlation_tile(z_i: np.ndarray, m_i: np.ndarray, z_j: np.ndarray, m_j: np.ndarray):
+    """Pearson correlation between two column blocks over their pairwise-complete rows (pandas' corr semantics)"""
+    if m_i.all() and m_j.all():
+        # No missing values: the standardized cross product is the correlation
+        n = z_i.shape[0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n > 1, (z_i.T @ z_j) / n, np.nan)
+
+    # Missing values: accumulate pairwise counts, sums and sums of squares restricted to rows where both are present
+    f_i, f_j = m_i.astype(np.float32), m_j.astype(np.float32)
+    x_i, x_j = np.where(m_i, z_i, 0), np.where(m_j, z_j, 0)
+
+    n = f_i.T @ f_j
+    sum_i, sum_j = x_i.T @ f_j, f_i.T @ x_j
+    sq_i, sq_j = (x_i * x_i).T @ f_j, f_i.T @ (x_j * x_j)
+    cross = x_i.T @ x_j
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = cross - sum_i * sum_j / n
+        var_i = sq_i - sum_i * sum_i / n
+        var_j = sq_j - sum_j * sum_j / n
+        corr = cov / np.sqrt(var_i * var_j)
+    return np.where(n > 1, corr, np.nan)
+
+def correlated_pairs(df: pd.DataFrame, columns: list, threshold: float = 0.0, top_k: int = 50, block_size: int = 512):
+    """
+    Top-k column pairs with |correlation| >= threshold, computed tile by tile. Column blocks are standardized as
+    their tile is reached, so only two blocks (never the whole numeric frame, nor columns squared) are resident.
+    """
+    columns = list(columns)
+
+    # Candidate pairs as parallel arrays, pruned back to top_k whenever they grow past 2 * top_k
+    left = np.empty(0, dtype=np.int64)
+    right = np.empty(0, dtype=np.int64)
+    values = np.empty(0, dtype=np.float32)
+
+    for i in range(0, len(columns), block_size):
+        z_i, m_i = standardize(df, columns[i:i + block_size])
+        for j in range(i, len(columns), block_size):
+            # Standardizing is per column, so a block standardized on its own matches the whole-frame result
+            z_j, m_j = (z_i, m_i) if j == i else standardize(df, columns[j:j + block_size])
+            tile = correlation_tile(z_i, m_i, z_j, m_j)
+            rows, cols = np.nonzero(np.abs(tile) >= threshold) # NaN never passes
+            keep = rows + i < cols + j # upper triangle only: no self pairs, no duplicates
+            rows, cols = rows[keep], cols[keep]
+
+            left = np.concatenate([left, rows + i])
+            right = np.concatenate([right, cols + j])
+            values = np.concatenate([values, np.clip(tile[rows, cols], -1, 1)])
+
+            if len(values) > 2 * top_k:
+                best = np.argpartition(-np.abs(values), top_k)[:top_k]
+                left, right, values = left[best], right[best], values[best]
+
+    order = np.argsort(-np.abs(values), kind="stable")[:top_k]
+    return [
+        {"column_1": columns[left[k]], "column_2": columns[right[k]], "correlation": round(float(values[k]), 3)}
+        for k in order
+    ]
@@ -0,0 +1,61 @@
+"""This module is responsible for shrinking the dtypes of a parsed dataset before any stage works on it."""
+import numpy as np
+import pandas as pd
+
+MB = 1024 ** 2
+
+def memory_mb(df: pd.DataFrame):
+    """In-memory size of a frame, string contents included"""
+    return df.memory_usage(index=True, deep=True).sum() / MB
+
+def downcast_integer(series: pd.Series):
+    """Smallest signed integer dtype holding every value; integers always fit exactly"""
+    return pd.to_numeric(series, downcast="integer")
+
+def downcast_float(series: pd.Series):
+    """float32 copy of a float64 column when every value survives the round trip unchanged, else the column itself"""
+    values = series.to_numpy()
+    narrowed = values.astype(np.float32)
+    with np.errstate(over="ignore", invalid="ignore"):
+        exact = np.array_equal(narrowed.astype(np.float64), values, equal_nan=True)
+    return pd.Series(narrowed, index=series.index, name=series.name) if exact else series
+
+def is_text(series: pd.Series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+def optimize_dtypes(df: pd.DataFrame, dtype_rules: dict = None):
+    """
+    Downcast integer columns, optionally float columns that lose nothing in float32, and turn low-cardinality
+    text columns into categories. Values are unchanged; the before/after footprint is kept in df.attrs.
+    """
+    dtype_rules = dtype_rules or {}
+    max_unique_ratio = dtype_rules.get("category_max_unique_ratio", 0.5)
+    before = memory_mb(df)
+
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype):
+            columns[column] = series
+        elif pd.api.types.is_integer_dtype(dtype) and dtype_rules.get("downcast_integers", True):
+            columns[column] = downcast_integer(series)
+        elif dtype == np.float64 and dtype_rules.get("downcast_floats", False):
+            columns[column] = downcast_float(series)
+        elif is_text(series) and not isinstance(dtype, pd.CategoricalDtype):
+            # Repeated values are stored once as categories; mostly unique text gains nothing from it
+            present = series.count()
+            if present and series.nunique(dropna=True) / present <= max_unique_ratio:
+                columns[column] = series.astype("category")
+            else:
+                columns[column] = series
+        else:
+            columns[column] = series
+
+    optimized = pd.DataFrame(columns, index=df.index, copy=False)
+    optimized.attrs["memory_footprint"] = {
+        "memory_before_mb": round(float(before), 3),
+        "memory_after_mb": round(float(memory_mb(optimized)), 3)
+    }
+    return optimized
@@ -1,14 +1,20 @@
 """This module is responsible for exploratory data analysis (EDA) on the dataset."""
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
+from profiling.dataset_stats import DatasetStats
+from pipeline.correlation import correlated_pairs
+from profiling.sampling import correlation_interval, describe_sample
+from pipeline.tracing import span
+from outputs.plot_renderer import correlation_plot_job, distribution_plot_job, boxplot_job, render_plots, select_pairs
 
-def execute_eda(df: pd.DataFrame, decision_plan: dict, output_dir: str = "outputs/eda"):
+def execute_eda(df: pd.DataFrame, decision_plan: dict, output_dir: str = "outputs/eda", stats: DatasetStats = None, rules: dict = None):
     """Execute exploratory data analysis based on decision plan."""
     
     eda_metrics = {}
     eda_log = []
     plots = []
+    plot_jobs = [] # rendered together at the end, in this order
+    eda_rules = (rules or {}).get("eda", {})
 
     if not decision_plan.get("eda_allowed", False):
         eda_log.append("EDA skipped as per decision plan.")
@@ -20,60 +26,94 @@ def execute_eda(df: pd.DataFrame, decision_plan: dict, output_dir: str = "output
     
     os.makedirs(output_dir, exist_ok=True)
 
-    numeric_columns = df.select_dtypes(include=['number']).columns
-    categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+    # Cleaning keeps every row, so the run's bounded sample selects the same rows of the cleaned frame
+    sample_info = stats.sample_info if stats is not None else None
+    if sample_info is not None:
+        df = df.iloc[stats.sample_positions]
+        eda_log.append(f"EDA ran on a {describe_sample(sample_info)}.")
 
-    # Numeric vs Numeric Correlation
+    # Dtypes survive cleaning, so the run's classification only needs filtering to the remaining columns
+    if stats is not None:
+        numeric_columns = [c for c in stats.numeric_columns if c in df.columns]
+        categorical_columns = [c for c in stats.categorical_columns if c in df.columns]
+    else:
+        numeric_columns = df.select_dtypes(include=['number']).columns
+        categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+
+    # Numeric vs Numeric Correlation: only the strongest pairs above the threshold are kept
     if len(numeric_columns) >= 2:
-        corr_matrix = df[numeric_columns].corr()
-        eda_metrics["correlation_matrix"] = corr_matrix.round(3).to_dict()
-        eda_log.append("Calculated correlation matrix for numeric columns.")
+        threshold = eda_rules.get("correlation_threshold", 0.0)
+        pairs = correlated_pairs(
+            df,
+            numeric_columns,
+            threshold=threshold,
+            top_k=eda_rules.get("correlation_top_k", 50),
+            block_size=eda_rules.get("correlation_block_size", 512)
+        )
+        eda_log.append(f"Calculated pairwise correlations for {len(numeric_columns)} numeric columns; {len(pairs)} strongest pairs with |r| >= {threshold} kept.")
 
-        plt.figure()
-        corr_matrix.plot(kind='bar')
-        plot_path = os.path.join(output_dir, "numeric_correlation.png")
-        plt.tight_layout()
-        plt.savefig(plot_path)
-        plt.close()
-        plots.append(plot_path)
-        eda_log.append(f"Saved numeric correlation plot at {plot_path}.")
+        if pairs:
+            if sample_info is not None:
+                for pair in pairs:
+                    pair["ci"] = correlation_interval(pair["correlation"], len(df), sample_info["confidence_level"])
+                eda_log.append(f"Correlations carry {sample_info['confidence_level']*100:g}% confidence intervals over the sampled rows.")
+            eda_metrics["correlation_pairs"] = pairs
+            pair_correlations = pd.Series(
+                [pair["correlation"] for pair in pairs],
+                index=[f"{pair['column_1']} vs {pair['column_2']}" for pair in pairs],
+                name="correlation"
+            )
+            plot_path = os.path.join(output_dir, "numeric_correlation.png")
+            plot_jobs.append(correlation_plot_job(pair_correlations, plot_path))
+            eda_log.append(f"Saved numeric correlation plot at {plot_path}.")
 
     else:
         eda_log.append("Not enough numeric columns for correlation analysis.")
 
     # Numeric Distributions
     for column in numeric_columns:
-        plt.figure()
-        df[column].dropna().hist()
-        plt.title(f"Distribution of {column}")
-        plt.xlabel(column)
-        plt.ylabel("Frequency")
         plot_path = os.path.join(output_dir, f"{column}_distribution.png")
-        plt.tight_layout()
-        plt.savefig(plot_path)
-        plt.close()
-        plots.append(plot_path)
+        plot_jobs.append(distribution_plot_job(df[column], plot_path))
         eda_log.append(f"Saved distribution plot for numeric column '{column}' at {plot_path}.")
     
-    # Category vs Numeric: Group means
+    # Free-text or near-unique columns would produce one metric entry per distinct value; leave them out
+    max_cardinality = eda_rules.get("max_group_cardinality")
+    grouped_columns = []
     for cat_col in categorical_columns:
+        cardinality = stats.unique_counts[cat_col] if stats is not None else df[cat_col].nunique()
+        if max_cardinality is not None and cardinality > max_cardinality:
+            eda_log.append(f"Skipped group analysis for categorical column '{cat_col}': {cardinality} distinct values exceed the limit of {max_cardinality}.")
+            continue
+        grouped_columns.append(cat_col)
+
+    # Pairwise boxplots grow as categorical x numeric, so only a capped (optionally sampled) subset is rendered
+    all_pairs = [(cat_col, num_col) for cat_col in grouped_columns for num_col in numeric_columns]
+    plotted_pairs = set(select_pairs(
+        all_pairs,
+        max_pairs=eda_rules.get("max_pairwise_plots"),
+        sampling=eda_rules.get("pairwise_plot_sampling", "first"),
+        seed=eda_rules.get("plot_seed", 0)
+    ))
+    if len(plotted_pairs) < len(all_pairs):
+        eda_log.append(f"Rendering {len(plotted_pairs)} of {len(all_pairs)} categorical vs numeric boxplots as per plot cap.")
+    
+    # Category vs Numeric: Group means (one aggregation per categorical column, so its keys are hashed once)
+    for cat_col in grouped_columns:
+        all_group_means = df.groupby(cat_col)[list(numeric_columns)].mean() if len(numeric_columns) else None
         for num_col in numeric_columns:
-            group_means = df.groupby(cat_col)[num_col].mean()
+            group_means = all_group_means[num_col]
             eda_metrics[f"{cat_col}_vs_{num_col}_mean"] = group_means.round(2).to_dict()
             eda_log.append(f"Calculated group means of numerical column '{num_col}' group by categorical column '{cat_col}'.")
 
-            plt.figure()
-            df.boxplot(column=num_col, by=cat_col)
-            plt.title(f"{num_col} by {cat_col}")
-            plt.suptitle("")
-            plt.xlabel(cat_col)
-            plt.ylabel(num_col)
+            if (cat_col, num_col) not in plotted_pairs:
+                continue
+
             plot_path = os.path.join(output_dir, f"{cat_col}_vs_{num_col}_boxplot.png")
-            plt.tight_layout()
-            plt.savefig(plot_path)
-            plt.close()
-            plots.append(plot_path)
+            plot_jobs.append(boxplot_job(df, num_col, cat_col, plot_path))
             eda_log.append(f"Saved boxplot for '{num_col}' by '{cat_col}' at {plot_path}.")
+
+    with span("eda.render_plots", plots=len(plot_jobs)):
+        plots = render_plots(plot_jobs, workers=eda_rules.get("plot_workers", 1))
         
     return {
         "eda_metrics": eda_metrics,
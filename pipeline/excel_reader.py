@@ -0,0 +1,123 @@
+"""This module is responsible for streaming rows out of Excel workbooks and loading several sheets in parallel."""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+from profiling.parallel import process_context
+
+STREAMED_EXTENSIONS = (".xlsx",) # workbooks openpyxl reads; legacy .xls files go through pd.read_excel
+EXCEL_CHUNK_ROWS = 50_000 # rows held as Python objects before they are parsed into a frame
+
+def _open_workbook(dataset_path: str):
+    # Read-only workbooks parse sheet XML lazily, row by row, instead of building every cell up front
+    import openpyxl
+    return openpyxl.load_workbook(dataset_path, read_only=True, data_only=True, keep_links=False)
+
+def sheet_names(dataset_path: str):
+    workbook = _open_workbook(dataset_path)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+def cell_value(cell):
+    """Cell value as pd.read_excel sees it: blanks as '', errors as NaN, integral numbers as int"""
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        integer = int(value)
+        return integer if integer == value else float(value)
+    return value
+
+def _rows(worksheet):
+    """
+    Rows of a sheet with trailing blank cells trimmed. Blank rows between data rows are kept (they become rows of
+    missing values, as in pd.read_excel); blank rows before the first and after the last data row are dropped.
+    """
+    started = False
+    blank_rows = 0
+    for row in worksheet.iter_rows():
+        values = [cell_value(cell) for cell in row]
+        while values and values[-1] == "":
+            values.pop()
+        if not values:
+            blank_rows += started
+            continue
+        yield from ([] for _ in range(blank_rows))
+        started = True
+        blank_rows = 0
+        yield values
+
+def _parse(batch: list, keep: list, names: list, start: int = 0):
+    """Type-infer a batch of rows the way pd.read_excel does, keeping the selected cells of each row"""
+    rows = [[row[i] if i < len(row) else "" for i in keep] for row in batch]
+    data = TextParser(rows, header=None, names=names).read()
+    data.index = pd.RangeIndex(start, start + len(data)) # row numbers continue across chunks, as with read_csv chunks
+    return data
+
+def iter_sheet_chunks(dataset_path: str, sheet=None, usecols=None, chunk_rows: int = EXCEL_CHUNK_ROWS):
+    """
+    Yield a sheet (the first one by default) as frames of at most `chunk_rows` rows. The first non-blank row
+    is the header; cells to the right of its last name are ignored.
+    """
+    workbook = _open_workbook(dataset_path)
+    try:
+        worksheet = workbook.worksheets[0] if sheet is None else workbook[sheet]
+        rows = _rows(worksheet)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        # Blank and repeated names are filled in and de-duplicated exactly as pd.read_excel does
+        columns = list(TextParser([header], header=0).read().columns)
+        keep = [i for i, column in enumerate(columns) if usecols is None or usecols(column)]
+        names = [columns[i] for i in keep]
+        if not names:
+            yield pd.DataFrame() # nothing selected
+            return
+
+        batch = []
+        start = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield _parse(batch, keep, names, start)
+                start += len(batch)
+                batch = []
+        if batch or not start:
+            yield _parse(batch, keep, names, start)
+    finally:
+        workbook.close()
+
+def combine_chunks(chunks: list):
+    """Concatenate chunks; columns whose chunks disagreed on a type are inferred again over all rows"""
+    if not chunks:
+        return pd.DataFrame() # empty sheet
+    if len(chunks) == 1:
+        return chunks[0]
+    data = pd.concat(chunks, ignore_index=True)
+    for column in data.columns:
+        if data[column].dtype == object and len({chunk[column].dtype for chunk in chunks}) > 1:
+            data[column] = data[column].infer_objects()
+    return data
+
+def read_sheet(dataset_path: str, sheet=None, usecols=None, chunk_rows: int = EXCEL_CHUNK_ROWS):
+    """Whole sheet as one frame, parsed chunk by chunk"""
+    return combine_chunks(list(iter_sheet_chunks(dataset_path, sheet, usecols, chunk_rows)))
+
+def read_sheets(dataset_path: str, sheets: list, usecols=None, workers: int = 1, chunk_rows: int = EXCEL_CHUNK_ROWS):
+    """
+    Frames of the given sheets, in order. With several workers each sheet is parsed in its own process, which
+    opens the workbook independently; `usecols` must then be picklable.
+    """
+    workers = min(workers, len(sheets))
+    if workers <= 1:
+        return [read_sheet(dataset_path, sheet, usecols, chunk_rows) for sheet in sheets]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        futures = [pool.submit(read_sheet, dataset_path, sheet, usecols, chunk_rows) for sheet in sheets]
+        return [future.result() for future in futures]
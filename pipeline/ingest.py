@@ -1,27 +1,220 @@
 """This module is responsible for ingesting dataset and rules"""
 
+import hashlib
+import json
 import os
+from functools import partial
 import pandas as pd
 import yaml
+from pipeline.cache import IngestCache, file_fingerprint
+from pipeline.dtype_optimizer import optimize_dtypes
+from pipeline.excel_reader import STREAMED_EXTENSIONS, EXCEL_CHUNK_ROWS, read_sheets, sheet_names
+from profiling.parallel import resolve_workers
+
+SAMPLE_ROWS = 1000 # rows read up-front to estimate the in-memory size of a streamed dataset
+CHUNK_BUDGET_FRACTION = 0.25 # share of the memory budget a single chunk may occupy
 
 # Custom Exception
 class IngestError(Exception):
     pass
 
+class ChunkedDataset:
+    """Lazily materialized view over a CSV file which is read in bounded-size chunks."""
+
+    def __init__(self, dataset_path: str, memory_budget_mb: float = 1024, chunk_rows: int = None, usecols=None):
+        self.path = dataset_path
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.usecols = usecols # columns parsed when no explicit subset is requested (None = all)
+
+        sample = pd.read_csv(dataset_path, nrows=SAMPLE_ROWS, usecols=usecols)
+        self.columns = list(sample.columns)
+        self.dtypes = sample.dtypes.to_dict() # as inferred from the sample
+
+        # Estimate bytes per row (in memory, per column) and number of rows from the sample
+        sample_rows = max(len(sample), 1)
+        self.column_row_bytes = (sample.memory_usage(index=False, deep=True) / sample_rows).to_dict()
+        self.estimated_rows = self._estimate_rows(len(sample))
+        self.row_count = None # exact count, known once the file has been streamed
+
+        row_bytes = max(sum(self.column_row_bytes.values()), 1)
+        if chunk_rows is None:
+            chunk_rows = int(self.memory_budget_bytes * CHUNK_BUDGET_FRACTION // row_bytes)
+        self.chunk_rows = max(int(chunk_rows), 1)
+
+    def _estimate_rows(self, sample_rows: int):
+        """Estimate the total row count from the on-disk size of the sampled lines"""
+        if sample_rows < SAMPLE_ROWS:
+            return sample_rows # Whole file fits in the sample
+
+        with open(self.path, "rb") as f:
+            f.readline() # header
+            sample_bytes = sum(len(f.readline()) for _ in range(sample_rows))
+
+        data_bytes = os.path.getsize(self.path)
+        return int(data_bytes / max(sample_bytes, 1) * sample_rows)
+
+    @property
+    def rows(self):
+        return self.row_count if self.row_count is not None else self.estimated_rows
+
+    def estimate_memory(self, columns: list = None):
+        """Estimated in-memory size (bytes) of the given columns once fully materialized"""
+        columns = self.columns if columns is None else columns
+        return int(sum(self.column_row_bytes.get(c, 0) for c in columns) * self.rows)
+
+    def iter_chunks(self, columns: list = None):
+        """Yield the dataset as DataFrame chunks of at most `chunk_rows` rows"""
+        rows = 0
+        with pd.read_csv(self.path, usecols=columns if columns is not None else self.usecols, chunksize=self.chunk_rows) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                if columns is not None:
+                    chunk = chunk[columns] # usecols does not preserve the requested order
+                yield chunk
+
+        self.row_count = rows
+
+    def iter_column_batches(self):
+        """Yield fully materialized frames of column subsets that each fit within the memory budget"""
+        batch = []
+        batch_bytes = 0
+        for column in self.columns:
+            column_bytes = self.estimate_memory([column])
+            if batch and batch_bytes + column_bytes > self.memory_budget_bytes:
+                yield self.materialize(batch)
+                batch, batch_bytes = [], 0
+            batch.append(column)
+            batch_bytes += column_bytes
+
+        if batch:
+            yield self.materialize(batch)
+
+    def materialize(self, columns: list = None, exclude: list = None):
+        """Load the given columns into a single DataFrame, enforcing the memory budget"""
+        columns = self.columns if columns is None else list(columns)
+        if exclude:
+            columns = [c for c in columns if c not in exclude]
+
+        estimated = self.estimate_memory(columns)
+        if estimated > self.memory_budget_bytes:
+            raise IngestError(f"Materializing {len(columns)} columns needs ~{estimated / 1024**2:.1f} MB, which exceeds the memory budget of {self.memory_budget_bytes / 1024**2:.1f} MB")
+
+        chunks = list(self.iter_chunks(columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(chunks, ignore_index=True)
+
+def _selected(included, exclude, column):
+    return (included is None or column in included) and column not in exclude
+
+def column_filter(ingest_rules: dict):
+    """usecols predicate keeping the columns the rules ask for (ingest.columns) minus ingest.exclude_columns; None parses all"""
+    columns = ingest_rules.get("columns")
+    exclude = set(ingest_rules.get("exclude_columns") or [])
+    if columns is None and not exclude:
+        return None
+    included = None if columns is None else set(columns)
+    return partial(_selected, included, exclude) # picklable, so Excel sheet workers can apply it
+
+def select_sheets(dataset_path: str, excel_rules: dict):
+    """Sheets to load: the first one (null), every one ('all') or a list of names"""
+    sheets = excel_rules.get("sheets")
+    available = sheet_names(dataset_path)
+    if sheets is None:
+        return available[:1]
+    if sheets == "all":
+        return available
+
+    sheets = [sheets] if isinstance(sheets, str) else list(sheets)
+    missing = [sheet for sheet in sheets if sheet not in available]
+    if missing:
+        raise IngestError(f"Sheets not found in {dataset_path}: {missing}. Available sheets: {available}")
+    return sheets
+
+def load_excel(dataset_path: str, ingest_rules: dict, usecols=None):
+    """Stream the selected sheets of a workbook, in parallel worker processes if configured, and stack their rows"""
+    excel_rules = ingest_rules.get("excel", {})
+    sheets = select_sheets(dataset_path, excel_rules)
+    frames = read_sheets(
+        dataset_path,
+        sheets,
+        usecols=usecols,
+        workers=resolve_workers(excel_rules.get("workers", 1)),
+        chunk_rows=excel_rules.get("chunk_rows") or EXCEL_CHUNK_ROWS
+    )
+
+    sheet_column = excel_rules.get("sheet_column")
+    if sheet_column is not None:
+        frames = [frame.assign(**{sheet_column: sheet}) for frame, sheet in zip(frames, sheets)]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
 # Load Dataset Function
-def load_dataset(dataset_path: str):
+def load_dataset(dataset_path: str, ingest_rules: dict = None):
     """Load dataset from a CSV or Excel file"""
 
+    ingest_rules = ingest_rules or {}
+    usecols = column_filter(ingest_rules)
+
     if not os.path.exists(dataset_path):
         raise IngestError(f"Dataset not found at {dataset_path}")
     
+    if not dataset_path.endswith((".csv", ".xls","xlsx")):
+        raise IngestError("Unsupported file format. Only CSV and Excel files are supported") 
+
+    if dataset_path.endswith(".csv") and ingest_rules.get("streaming", False):
+        return ChunkedDataset(
+            dataset_path,
+            memory_budget_mb=ingest_rules.get("memory_budget_mb", 1024),
+            chunk_rows=ingest_rules.get("chunk_rows"),
+            usecols=usecols
+        )
+
+    # Reuse the columnar copy of an unchanged file instead of re-parsing it; workbooks are converted once even with the cache off
+    cache_rules = ingest_rules.get("cache", {})
+    excel_rules = ingest_rules.get("excel", {})
+    streamed_excel = dataset_path.endswith(STREAMED_EXTENSIONS)
+    cache = None
+    if cache_rules.get("enabled", False) or (streamed_excel and excel_rules.get("convert_to_feather", True)):
+        cache = IngestCache(cache_rules.get("directory", "outputs/cache/ingest"), cache_rules.get("max_size_mb", 2048))
+        if not cache.available:
+            if cache_rules.get("enabled", False):
+                raise IngestError("Ingest cache requires pyarrow to be installed")
+            cache = None # without pyarrow the workbook is simply parsed on every run
+
+    if cache is not None:
+        key = file_fingerprint(dataset_path)
+        # A column subset, or another set of sheets, is a different parse of the same file
+        selection = []
+        if usecols is not None:
+            selection = [ingest_rules.get("columns"), sorted(ingest_rules.get("exclude_columns") or [])]
+        if streamed_excel and (excel_rules.get("sheets") is not None or excel_rules.get("sheet_column") is not None):
+            selection += [excel_rules.get("sheets"), excel_rules.get("sheet_column")]
+        if selection:
+            key = hashlib.sha256(f"{key}:{json.dumps(selection, default=str)}".encode()).hexdigest()
+        data = cache.get(dataset_path, key)
+        if data is not None:
+            return apply_dtype_optimization(data, ingest_rules)
+
     if dataset_path.endswith(".csv"):
-        return pd.read_csv(dataset_path)
+        data = pd.read_csv(dataset_path, usecols=usecols)
+    elif streamed_excel:
+        data = load_excel(dataset_path, ingest_rules, usecols)
+    else:
+        data = pd.read_excel(dataset_path, usecols=usecols)
     
-    if dataset_path.endswith((".xls","xlsx")):
-        return pd.read_excel(dataset_path)
+    if cache is not None:
+        cache.put(dataset_path, data, key)
+
+    return apply_dtype_optimization(data, ingest_rules)
 
-    raise IngestError("Unsupported file format. Only CSV and Excel files are supported") 
+def apply_dtype_optimization(data: pd.DataFrame, ingest_rules: dict):
+    """Apply the ingest-time dtype optimization when the rules enable it"""
+    dtype_rules = ingest_rules.get("optimize_dtypes", {})
+    if not dtype_rules.get("enabled", False):
+        return data
+    return optimize_dtypes(data, dtype_rules)
 
 def load_rules(rules_path: str):
     """Load rules from a YAML file"""
@@ -35,8 +228,8 @@ def load_rules(rules_path: str):
 def load_inputs(dataset_path: str, rules_path: str):
     """Entry point for data and rules ingestion."""
 
-    data = load_dataset(dataset_path)
     rules = load_rules(rules_path)
+    data = load_dataset(dataset_path, rules.get("ingest", {}))
     
     return {
         "data":data,
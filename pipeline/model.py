@@ -1,18 +1,193 @@
 """This module is responsible for model training and evaluation."""
 import os
+import json
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import root_mean_squared_error
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
+from profiling.dataset_stats import DatasetStats
+from profiling.parallel import resolve_workers
+from pipeline.ingest import ChunkedDataset
+from pipeline.model_search import METRICS, build_model, search_models
+from pipeline.model_registry import ModelRegistry, model_fingerprint, streamed_model_fingerprint
+from pipeline.tracing import span
 
 ALLOWED_MODELS = {
     "linear_regression": LinearRegression,
     "random_forest": RandomForestRegressor
 }
 
-def execute_model(df: pd.DataFrame, decision_plan: dict,rules: dict, output_dir: str="outputs/model",):
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+SPEC_SUFFIX = ".spec.json" # written next to each artifact, describing how to prepare its input
+
+def scoring_spec(target_column: str, features: list, fill_values: dict = None):
+    """What scoring needs to reproduce training's input: feature order and the imputation values of those features"""
+    return {
+        "target_column": target_column,
+        "features": [str(c) for c in features],
+        "imputation_values": {c: v for c, v in (fill_values or {}).items() if c in features}
+    }
+
+def spec_path(model_path: str):
+    return os.path.splitext(model_path)[0] + SPEC_SUFFIX
+
+def save_model_spec(model_path: str, model_used: str, spec: dict):
+    """Persist the scoring spec of an artifact alongside it"""
+    with open(spec_path(model_path), "w") as f:
+        json.dump({"model_used": model_used, **spec}, f, indent=2, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+
+def load_model_spec(model_path: str):
+    """Scoring spec persisted alongside an artifact"""
+    with open(spec_path(model_path), "r") as f:
+        return json.load(f)
+
+def holdout_mask(row_ids: np.ndarray, test_size: float = TEST_SIZE, seed: int = RANDOM_STATE):
+    """Deterministic hash-based hold-out split: True for test rows, independent of how rows are chunked"""
+    hashes = pd.util.hash_array(row_ids.astype(np.uint64) ^ np.uint64(seed))
+    return (hashes % 10_000) < int(test_size * 10_000)
+
+class NormalEquations:
+    """Running sums of the normal equations (XᵀX, Xᵀy, yᵀy) of an intercept-augmented design."""
+
+    def __init__(self, n_features: int):
+        self.xtx = np.zeros((n_features + 1, n_features + 1))
+        self.xty = np.zeros(n_features + 1)
+        self.yty = 0.0
+        self.rows = 0
+
+    def update(self, X: np.ndarray, y: np.ndarray):
+        design = np.column_stack([np.ones(len(X)), X])
+        self.xtx += design.T @ design
+        self.xty += design.T @ y
+        self.yty += float(y @ y)
+        self.rows += len(X)
+
+    def solve(self):
+        """Least-squares coefficients (intercept first); lstsq copes with collinear features like LinearRegression"""
+        return np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+
+    def squared_error(self, beta: np.ndarray):
+        """Sum of squared residuals of `beta` over the accumulated rows, without revisiting them"""
+        return max(self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta, 0.0)
+
+def train_linear_out_of_core(dataset: ChunkedDataset, features: list, target_column: str, fill_values: dict = None):
+    """Fit a linear regression by streaming the dataset once, accumulating train and test normal equations per chunk"""
+    fill_values = {c: v for c, v in (fill_values or {}).items() if c in features or c == target_column}
+    train, test = NormalEquations(len(features)), NormalEquations(len(features))
+    shift = None
+    chunks = 0
+
+    for chunk in dataset.iter_chunks(features + [target_column]):
+        chunks += 1
+        with span("model.chunk", rows=len(chunk), columns=len(features)):
+            if fill_values:
+                chunk = chunk.fillna(fill_values)
+            chunk = chunk[chunk[target_column].notna()]
+
+            X = chunk[features].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+            y = chunk[target_column].to_numpy(dtype=np.float64)
+
+            # Shift by the first chunk's means so the accumulated sums stay well conditioned
+            if shift is None and len(chunk):
+                shift = (X.mean(axis=0), y.mean())
+            if shift is not None:
+                X, y = X - shift[0], y - shift[1]
+
+            is_test = holdout_mask(chunk.index.to_numpy())
+            train.update(X[~is_test], y[~is_test])
+            test.update(X[is_test], y[is_test])
+
+    if train.rows == 0 or test.rows == 0:
+        return None
+
+    beta = train.solve()
+    rmse = float(np.sqrt(test.squared_error(beta) / test.rows))
+
+    # Undo the shift and expose the fit as a regular LinearRegression for persisting and scoring
+    x_shift, y_shift = shift
+    model = LinearRegression()
+    model.coef_ = beta[1:]
+    model.intercept_ = float(beta[0] + y_shift - beta[1:] @ x_shift)
+    model.n_features_in_ = len(features)
+    model.feature_names_in_ = np.asarray(features, dtype=object)
+
+    return {"model": model, "rmse": rmse, "train_rows": train.rows, "test_rows": test.rows, "chunks": chunks}
+
+def open_registry(model_rules: dict):
+    """Model registry configured under model_constraints.registry, or None when disabled"""
+    registry_rules = model_rules.get("registry", {})
+    if not registry_rules.get("enabled", False):
+        return None
+    return ModelRegistry(
+        registry_rules.get("directory", "outputs/cache/models"),
+        max_entries=registry_rules.get("max_entries", 20),
+        max_size_mb=registry_rules.get("max_size_mb", 1024),
+        max_age_days=registry_rules.get("max_age_days", 30)
+    )
+
+def model_params(model_name: str):
+    """Parameters that determine what a model learns (thread counts excluded)"""
+    params = build_model(ALLOWED_MODELS[model_name], RANDOM_STATE).get_params()
+    params.pop("n_jobs", None)
+    return params
+
+def load_registered_model(registry: ModelRegistry, key: str, output_dir: str, model_log: list, spec: dict):
+    """Result of a registry hit: the stored artifact restored into output_dir with its metrics and log"""
+    record = registry.get(key)
+    if record is None:
+        model_log.append(f"Model registry miss ({key[:12]}): training from scratch.")
+        return None
+
+    model_path = registry.restore(key, os.path.join(output_dir, f"{record['model_used']}.joblib"))
+    if model_path is None:
+        model_log.append(f"Model registry entry ({key[:12]}) was evicted by a concurrent run: training from scratch.")
+        return None
+    save_model_spec(model_path, record["model_used"], spec)
+    model_log.append(f"Model registry hit ({key[:12]}): loaded stored {record['model_used']} artifact and metrics instead of retraining.")
+    model_log.extend(record["model_log"])
+    return {
+        "model_used": record["model_used"],
+        "metrics": record["metrics"],
+        "model_artifact": model_path,
+        "model_log": model_log
+    }
+
+def select_model(X_train: pd.DataFrame, y_train: pd.Series, candidates: dict, default_model: str, metric: str,
+                 search_rules: dict, model_log: list):
+    """Pick the candidate with the best mean cross-validation score and return it with that score; falls back to the default model if none finish"""
+    folds = search_rules.get("cv_folds", 5)
+    with span("model.search", rows=X_train.shape[0], columns=X_train.shape[1], candidates=len(candidates)):
+        results = search_models(
+            X_train.to_numpy(dtype="float64"),
+            y_train.to_numpy(dtype="float64"),
+            candidates,
+            folds=folds,
+            metric=metric,
+            workers=search_rules.get("workers", 1),
+            time_budget_s=search_rules.get("time_budget_s"),
+            random_state=RANDOM_STATE
+        )
+
+    for name, result in results.items():
+        if result["score"] is None:
+            model_log.append(f"Candidate {name}: {result['folds']} of {folds} folds finished within the time budget ({result['seconds']:.2f}s); not considered.")
+        else:
+            model_log.append(f"Candidate {name}: mean {folds}-fold CV {metric} {round(result['score'], 4)} in {result['seconds']:.2f}s.")
+
+    scored = {name: result["score"] for name, result in results.items() if result["score"] is not None}
+    if not scored:
+        model_log.append(f"No candidate finished cross-validation within the time budget; using default model {default_model}.")
+        return default_model, None
+
+    best = min(scored, key=scored.get)
+    model_log.append(f"Selected {best} by cross-validated {metric}.")
+    return best, scored[best]
+
+def execute_model(df: pd.DataFrame, decision_plan: dict,rules: dict, output_dir: str="outputs/model", stats: DatasetStats = None, fill_values: dict = None):
     """Implement model training and evaluation based on decision plan and rules."""
     
     model_log = []
@@ -39,12 +214,18 @@ def execute_model(df: pd.DataFrame, decision_plan: dict,rules: dict, output_dir:
             "model_log": model_log
         }
     
+    if isinstance(df, ChunkedDataset):
+        return execute_model_out_of_core(df, decision_plan, rules, output_dir, fill_values)
+    
     # Prepare X and Y
     X = df.drop(columns=[target_column])
     y = df[target_column]
 
     # Numeric features only for modeling    
-    X = X.select_dtypes(include=['number']).fillna(0)
+    if stats is not None:
+        X = X[[c for c in stats.numeric_columns if c in X.columns]].fillna(0)
+    else:
+        X = X.select_dtypes(include=['number']).fillna(0)
 
     if X.empty:
         model_log.append("No numeric features available for modeling.")
@@ -55,7 +236,7 @@ def execute_model(df: pd.DataFrame, decision_plan: dict,rules: dict, output_dir:
             "model_log": model_log
         }
     
-    model_rules = rules.get("modeling",{})
+    model_rules = rules.get("model_constraints",{})
     max_features = model_rules.get("max_features",15)
     model_name = model_rules.get("default_model","linear_regression")
     
@@ -65,29 +246,148 @@ def execute_model(df: pd.DataFrame, decision_plan: dict,rules: dict, output_dir:
     
     # Train / Test
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE
     )
 
+    # Model Selection: cross-validate every allowed model on the training split
+    search_rules = model_rules.get("model_search", {})
+    metric = model_rules.get("evaluation_metric", "rmse")
+    if metric not in METRICS:
+        model_log.append(f"Evaluation metric '{metric}' is not supported; using rmse.")
+        metric = "rmse"
+
+    candidates = {name: ALLOWED_MODELS[name] for name in model_rules.get("allowed_models", [model_name]) if name in ALLOWED_MODELS}
+    search = search_rules.get("enabled", False) and len(candidates) > 1
+
+    # Model Registry: an identical earlier run (data, target, model config, split) is reused instead of retrained
+    registry = open_registry(model_rules)
+    if registry is not None:
+        if search:
+            model_spec = {"candidates": {name: model_params(name) for name in candidates}, "metric": metric, "cv_folds": search_rules.get("cv_folds", 5)}
+        else:
+            model_spec = {model_name: model_params(model_name) if model_name in ALLOWED_MODELS else {}}
+        registry_key = model_fingerprint(X, y, target_column, model_spec, RANDOM_STATE, TEST_SIZE)
+        registered = load_registered_model(registry, registry_key, output_dir, model_log, scoring_spec(target_column, X.columns, fill_values))
+        if registered is not None:
+            return registered
+    training_log_start = len(model_log)
+
+    cv_score = None
+    if search:
+        model_name, cv_score = select_model(X_train, y_train, candidates, model_name, metric, search_rules, model_log)
+
     model_cls = ALLOWED_MODELS.get(model_name, LinearRegression)
-    model = model_cls()
-    model.fit(X_train, y_train)
+    model = build_model(model_cls, RANDOM_STATE, n_jobs=resolve_workers(model_rules.get("fit_workers", 1)))
+    with span("model.fit", rows=X_train.shape[0], columns=X_train.shape[1], model=model_name):
+        model.fit(X_train, y_train)
 
-    preds = model.predict(X_test)
-    rmse = root_mean_squared_error(y_test, preds, squared=False)
+    with span("model.predict", rows=X_test.shape[0], columns=X_test.shape[1], model=model_name):
+        preds = model.predict(X_test)
+    rmse = root_mean_squared_error(y_test, preds)
     metrics["rmse"] = round(rmse, 4)
+    if cv_score is not None:
+        metrics[f"cv_{metric}"] = round(cv_score, 4)
 
-    # Persist artifact
+    # Persist artifact (only the selected model)
     os.makedirs(output_dir, exist_ok=True)
     model_path = os.path.join(output_dir, f"{model_name}.joblib")
     joblib.dump(model, model_path)
+    save_model_spec(model_path, model_name, scoring_spec(target_column, X.columns, fill_values))
 
     model_log.append(f"Trained {model_name} model.")
     model_log.append(f"Target column: '{target_column}'.")
     model_log.append(f"RMSE on test set: {metrics['rmse']}.")
 
+    if registry is not None:
+        registry.put(registry_key, model_path, {"model_used": model_name, "metrics": metrics, "model_log": model_log[training_log_start:]})
+
+    return {
+        "model_used": model_name,
+        "metrics": metrics,
+        "model_artifact": model_path,
+        "model_log": model_log
+    }
+
+def execute_model_out_of_core(dataset: ChunkedDataset, decision_plan: dict, rules: dict, output_dir: str = "outputs/model", fill_values: dict = None):
+    """Train the linear model chunk by chunk on a streamed dataset; returns the same result as execute_model."""
+
+    model_log = []
+    metrics = {}
+    target_column = decision_plan.get("modeling", {}).get("target_column")
+
+    # Same feature selection as in memory: numeric, surviving, non-target columns in file order
+    dropped = set(decision_plan.get("columns_to_drop", []))
+    if target_column in dropped:
+        model_log.append("Target column 'target' not found in dataset. Modeling aborted.")
+        return {
+            "model_used": None,
+            "metrics": metrics,
+            "model_artifact": None,
+            "model_log": model_log
+        }
+
+    features = [
+        c for c in dataset.columns
+        if c != target_column and c not in dropped and pd.api.types.is_numeric_dtype(dataset.dtypes[c])
+    ]
+
+    if not features:
+        model_log.append("No numeric features available for modeling.")
+        return {
+            "model_used": None,
+            "metrics": metrics,
+            "model_artifact": None,
+            "model_log": model_log
+        }
+
+    model_rules = rules.get("model_constraints",{})
+    max_features = model_rules.get("max_features",15)
+    model_name = model_rules.get("default_model","linear_regression")
+
+    if model_name != "linear_regression":
+        model_log.append(f"Out-of-core training supports linear_regression only; used it instead of {model_name}.")
+        model_name = "linear_regression"
+
+    if len(features) > max_features:
+        features = features[:max_features]
+        model_log.append(f"Feature count exceed limit.Truncated to first {max_features} features")
+
+    registry = open_registry(model_rules)
+    if registry is not None:
+        registry_key = streamed_model_fingerprint(dataset.path, features, target_column, fill_values, {"out_of_core": model_params(model_name)}, RANDOM_STATE, TEST_SIZE)
+        registered = load_registered_model(registry, registry_key, output_dir, model_log, scoring_spec(target_column, features, fill_values))
+        if registered is not None:
+            return registered
+    training_log_start = len(model_log)
+
+    fit = train_linear_out_of_core(dataset, features, target_column, fill_values)
+    if fit is None:
+        model_log.append("Not enough rows with a target value for a train/test split. Modeling aborted.")
+        return {
+            "model_used": None,
+            "metrics": metrics,
+            "model_artifact": None,
+            "model_log": model_log
+        }
+
+    metrics["rmse"] = round(fit["rmse"], 4)
+
+    # Persist artifact
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, f"{model_name}.joblib")
+    joblib.dump(fit["model"], model_path)
+    save_model_spec(model_path, model_name, scoring_spec(target_column, features, fill_values))
+
+    model_log.append(f"Trained {model_name} model out-of-core on {fit['train_rows']} rows streamed in {fit['chunks']} chunks.")
+    model_log.append(f"Target column: '{target_column}'.")
+    model_log.append(f"RMSE on test set: {metrics['rmse']} ({fit['test_rows']} hash-selected hold-out rows).")
+
+    if registry is not None:
+        registry.put(registry_key, model_path, {"model_used": model_name, "metrics": metrics, "model_log": model_log[training_log_start:]})
+
     return {
         "model_used": model_name,
         "metrics": metrics,
         "model_artifact": model_path,
         "model_log": model_log
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,148 @@
+"""This module is responsible for registering trained model artifacts so unchanged training runs can be reused."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import pandas as pd
+from pipeline.cache import file_fingerprint, index_lock
+
+INDEX_FILE = "index.json"
+
+def model_fingerprint(X: pd.DataFrame, y: pd.Series, target_column: str, model_spec: dict, split_seed: int, test_size: float):
+    """Fingerprint a training run by its feature matrix, target, model configuration and split"""
+    key = hashlib.sha256()
+    key.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    key.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    key.update(json.dumps({
+        "features": [str(c) for c in X.columns],
+        "dtypes": [str(t) for t in X.dtypes],
+        "target": target_column,
+        "model": model_spec,
+        "split_seed": split_seed,
+        "test_size": test_size
+    }, sort_keys=True, default=str).encode())
+    return key.hexdigest()
+
+def streamed_model_fingerprint(dataset_path: str, features: list, target_column: str, fill_values: dict, model_spec: dict, split_seed: int, test_size: float):
+    """Fingerprint an out-of-core training run by the file content instead of a materialized matrix"""
+    key = hashlib.sha256()
+    key.update(file_fingerprint(dataset_path).encode())
+    key.update(json.dumps({
+        "features": features,
+        "target": target_column,
+        "fill_values": fill_values or {},
+        "model": model_spec,
+        "split_seed": split_seed,
+        "test_size": test_size
+    }, sort_keys=True, default=str).encode())
+    return key.hexdigest()
+
+class ModelRegistry:
+    """Fingerprint-keyed store of model artifacts with their metrics and training log, bounded by age, count and size."""
+
+    def __init__(self, registry_dir: str = "outputs/cache/models", max_entries: int = 20, max_size_mb: float = 1024, max_age_days: float = 30):
+        self.registry_dir = registry_dir
+        self.max_entries = max_entries
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 3600 if max_age_days else None
+        self.index_path = os.path.join(registry_dir, INDEX_FILE)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict):
+        os.makedirs(self.registry_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp" # concurrent runs may share the directory
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path) # Atomic swap so readers never see a partial index
+
+    def _entry_path(self, key: str):
+        return os.path.join(self.registry_dir, f"{key}.joblib")
+
+    def _expired(self, entry: dict, now: float):
+        return self.max_age_seconds is not None and now - entry["created"] > self.max_age_seconds
+
+    def get(self, key: str):
+        """Return the record of a registered run, or None on a miss"""
+        entry_path = self._entry_path(key)
+        with index_lock(self.registry_dir):
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None or not os.path.exists(entry_path):
+                return None
+
+            if self._expired(entry, time.time()):
+                self._remove(index, key)
+                self._save_index(index)
+                return None
+
+            entry["last_access"] = time.time()
+            self._save_index(index)
+            return entry["record"]
+
+    def restore(self, key: str, artifact_path: str):
+        """Copy the registered artifact to `artifact_path`; None if another run evicted it since `get`"""
+        os.makedirs(os.path.dirname(artifact_path) or ".", exist_ok=True)
+        with index_lock(self.registry_dir): # not evicted halfway through the copy
+            if not os.path.exists(self._entry_path(key)):
+                return None
+            shutil.copyfile(self._entry_path(key), artifact_path)
+        return artifact_path
+
+    def put(self, key: str, artifact_path: str, record: dict):
+        """Register a trained artifact with its record (model used, metrics, training log) and apply the limits"""
+        os.makedirs(self.registry_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # Copied outside the lock under a private name, then moved into place together with its index entry
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(artifact_path, tmp_path)
+
+        with index_lock(self.registry_dir):
+            os.replace(tmp_path, entry_path)
+            now = time.time()
+            index = self._load_index()
+            index[key] = {
+                "record": record,
+                "bytes": os.path.getsize(entry_path),
+                "created": now,
+                "last_access": now
+            }
+            self._evict(index)
+            self._save_index(index)
+        return entry_path
+
+    def _evict(self, index: dict):
+        """Drop expired entries, then least recently used ones until the count and size limits hold"""
+        now = time.time()
+        for key in [k for k in index if self._expired(index[k], now)]:
+            self._remove(index, key)
+
+        total_bytes = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if len(index) <= self.max_entries and total_bytes <= self.max_size_bytes:
+                break
+            total_bytes -= index[key]["bytes"]
+            self._remove(index, key)
+
+    def _remove(self, index: dict, key: str):
+        entry_path = self._entry_path(key)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+        index.pop(key, None)
+
+    def clear(self):
+        """Remove every registered artifact"""
+        with index_lock(self.registry_dir):
+            index = self._load_index()
+            removed = len(index)
+            for key in list(index):
+                self._remove(index, key)
+            self._save_index(index)
+        return removed
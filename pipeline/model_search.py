@@ -0,0 +1,116 @@
+"""This module is responsible for selecting the best allowed model with k-fold cross-validation under a time budget."""
+import os
+import queue
+import signal
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from sklearn.model_selection import KFold
+from sklearn.metrics import root_mean_squared_error
+from profiling.parallel import process_context, resolve_workers
+
+METRICS = {
+    "rmse": root_mean_squared_error # lower is better
+}
+
+def build_model(model_cls, random_state: int, n_jobs: int = 1):
+    """Instantiate a candidate, seeded and limited to `n_jobs` threads where the estimator supports it"""
+    params = model_cls().get_params()
+    kwargs = {}
+    if "random_state" in params:
+        kwargs["random_state"] = random_state
+    if "n_jobs" in params:
+        kwargs["n_jobs"] = n_jobs
+    return model_cls(**kwargs)
+
+def _fold_worker(matrix_dir: str, model_name: str, model_cls, fold: int, folds: int, metric: str, random_state: int):
+    """Fit one candidate on one fold, reading the shared feature matrix through a read-only memory map"""
+    X = np.load(os.path.join(matrix_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(matrix_dir, "y.npy"), mmap_mode="r")
+
+    started = time.perf_counter()
+    train_idx, valid_idx = list(KFold(n_splits=folds, shuffle=True, random_state=random_state).split(X))[fold]
+    model = build_model(model_cls, random_state)
+    model.fit(X[train_idx], y[train_idx])
+    score = METRICS[metric](y[valid_idx], model.predict(X[valid_idx]))
+    return model_name, fold, float(score), time.perf_counter() - started
+
+def _report_pid(pids):
+    """Pool initializer: tell the parent which process it is, so the parent can stop it on a budget overrun"""
+    pids.put(os.getpid())
+
+def stop_workers(pool: ProcessPoolExecutor, pids, pending: set):
+    """Terminate the worker processes of a pool (ProcessPoolExecutor.terminate_workers where Python provides it)"""
+    terminate_workers = getattr(pool, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    # Killing one worker breaks the pool: the executor then terminates the others and fails every pending future.
+    # Workers report their pid (_report_pid) before taking a task, so wait for a report if none has arrived yet
+    while not all(future.done() for future in pending):
+        try:
+            os.kill(pids.get(timeout=0.1), signal.SIGTERM)
+        except (queue.Empty, ProcessLookupError):
+            pass
+
+def search_models(X: np.ndarray, y: np.ndarray, candidates: dict, folds: int = 5, metric: str = "rmse",
+                  workers: int = 1, time_budget_s: float = None, random_state: int = 42):
+    """
+    Cross-validate every candidate, one task per (model, fold), and return per-candidate results:
+    {name: {"score": mean fold score or None, "folds": completed folds, "seconds": summed fit time}}.
+    Candidates that do not finish every fold within the budget get a score of None.
+    """
+    workers = resolve_workers(workers)
+    folds = max(min(folds, len(y)), 2)
+    deadline = time.perf_counter() + time_budget_s if time_budget_s else None
+    results = {name: {"score": None, "folds": 0, "seconds": 0.0, "fold_scores": []} for name in candidates}
+    tasks = [(name, fold) for fold in range(folds) for name in candidates] # round-robin, so every model progresses
+
+    def record(outcome):
+        name, _, score, seconds = outcome
+        results[name]["fold_scores"].append(score)
+        results[name]["folds"] += 1
+        results[name]["seconds"] += seconds
+
+    with tempfile.TemporaryDirectory(prefix="model_search_") as matrix_dir:
+        # One on-disk copy of the matrix, memory-mapped by every task instead of pickled into it
+        np.save(os.path.join(matrix_dir, "X.npy"), np.ascontiguousarray(X, dtype=np.float64))
+        np.save(os.path.join(matrix_dir, "y.npy"), np.asarray(y, dtype=np.float64))
+
+        if workers <= 1:
+            for name, fold in tasks:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                record(_fold_worker(matrix_dir, name, candidates[name], fold, folds, metric, random_state))
+        else:
+            context = process_context()
+            pids = context.Queue()
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_report_pid, initargs=(pids,))
+            pending = set()
+            try:
+                pending = {
+                    pool.submit(_fold_worker, matrix_dir, name, candidates[name], fold, folds, metric, random_state)
+                    for name, fold in tasks
+                }
+                while pending:
+                    timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+                    done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    if not done:
+                        break # budget exhausted
+                    for future in done:
+                        record(future.result())
+            finally:
+                # Queued folds are dropped. Folds still running would outlive the budget and the matrix files
+                # deleted below, so their processes are stopped before the pool is joined
+                if pending:
+                    stop_workers(pool, pids, pending)
+                pool.shutdown(wait=True, cancel_futures=True)
+                pids.close()
+
+    for result in results.values():
+        if result["folds"] == folds:
+            result["score"] = float(np.mean(result["fold_scores"]))
+        del result["fold_scores"]
+
+    return results
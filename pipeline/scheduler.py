@@ -0,0 +1,249 @@
+"""This module is responsible for running pipeline stages as a dependency graph, overlapping independent stages."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pipeline.checkpoint import StageCheckpoints, rules_subset, stage_key, value_fingerprint
+from pipeline.tracing import NULL_SPAN, span
+from profiling.parallel import process_context
+
+POLL_SECONDS = 0.1 # how often a waiting scheduler checks for cancellation
+
+# Custom Exception
+class SchedulerError(Exception):
+    pass
+
+class StageCancelled(SchedulerError):
+    pass
+
+class Stage:
+    """A named step which reads its declared inputs from the run context and publishes its declared outputs to it."""
+
+    def __init__(self, name: str, func, inputs: list, outputs: list, executor: str = "thread",
+                 rule_keys: list = None, checkpoint: bool = True, artifacts=None, unkeyed_inputs: list = None):
+        if executor not in ("thread", "process"):
+            raise SchedulerError(f"Stage '{name}': executor must be 'thread' or 'process'")
+        self.name = name
+        self.func = func # called with the inputs as keyword arguments; returns one value per output (a tuple for several)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.executor = executor
+        self.rule_keys = rule_keys # dotted rule paths the stage reads from its 'rules' input (None = all of it)
+        self.checkpoint = checkpoint # cheap or pass-through stages are recomputed instead of stored
+        self.artifacts = artifacts # callable(outputs dict) -> paths of the files the stage writes
+        self.unkeyed_inputs = set(unkeyed_inputs or []) # inputs that differ every run; only whether they are set is keyed
+
+    def values(self, value):
+        """The stage's return value as one value per declared output"""
+        values = (value,) if len(self.outputs) == 1 else tuple(value)
+        if len(values) != len(self.outputs):
+            raise SchedulerError(f"Stage '{self.name}' returned {len(values)} values for outputs {self.outputs}")
+        return values
+
+    def key(self, context: dict, fingerprints: dict):
+        """Checkpoint key from the fingerprints of the stage's inputs and the subset of rules it reads"""
+        inputs = {}
+        for name in self.inputs:
+            if name == "rules" and self.rule_keys is not None:
+                continue
+            if name in self.unkeyed_inputs:
+                inputs[name] = context[name] is not None
+                continue
+            if name not in fingerprints:
+                fingerprints[name] = value_fingerprint(context[name])
+            inputs[name] = fingerprints[name]
+        rules_part = rules_subset(context["rules"], self.rule_keys) if "rules" in self.inputs and self.rule_keys is not None else None
+        return stage_key(self.name, inputs, rules_part)
+
+class StageRun:
+    """Bookkeeping of one run: the context, the fingerprints of its entries and the optional checkpoint store."""
+
+    def __init__(self, context: dict, fingerprints: dict = None, checkpoints: StageCheckpoints = None):
+        self.context = context
+        self.fingerprints = dict(fingerprints or {})
+        self.checkpoints = checkpoints
+        self.keys = {}
+
+    def reuse(self, stage: Stage):
+        """Publish a stored checkpoint of the stage if there is one; True when the stage needs no run"""
+        if self.checkpoints is None:
+            return False
+        self.keys[stage.name] = key = stage.key(self.context, self.fingerprints)
+        if not stage.checkpoint:
+            return False
+
+        stored = self.checkpoints.load(stage.name, key)
+        if stored is None:
+            return False
+
+        values, fingerprints = stored
+        self.context.update(zip(stage.outputs, values))
+        self.fingerprints.update(fingerprints)
+        self.checkpoints.status[stage.name] = "reused"
+        return True
+
+    def publish(self, stage: Stage, value):
+        """Store the stage's return value in the context under its declared output names, checkpointing it if enabled"""
+        values = stage.values(value)
+        self.context.update(zip(stage.outputs, values))
+        if self.checkpoints is None:
+            return
+
+        key = self.keys[stage.name]
+        if stage.checkpoint:
+            files = stage.artifacts(dict(zip(stage.outputs, values))) if stage.artifacts else []
+            self.fingerprints.update(self.checkpoints.save(stage.name, key, stage.outputs, values, files))
+            self.checkpoints.status[stage.name] = "recomputed"
+        else:
+            # Not stored, so outputs are identified by how they were derived
+            self.fingerprints.update({name: stage_key(stage.name, {"key": key, "output": name}) for name in stage.outputs})
+            self.checkpoints.status[stage.name] = "not checkpointed"
+
+def topological_order(stages: list, context: dict):
+    """Stages in a valid serial order (declaration order among ready stages); rejects unknown inputs and cycles"""
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers or output in context:
+                raise SchedulerError(f"Output '{output}' is produced more than once")
+            producers[output] = stage.name
+
+    for stage in stages:
+        for name in stage.inputs:
+            if name not in producers and name not in context:
+                raise SchedulerError(f"Stage '{stage.name}' needs '{name}', which no stage produces")
+
+    available = set(context)
+    remaining = list(stages)
+    order = []
+    while remaining:
+        ready = [stage for stage in remaining if set(stage.inputs) <= available]
+        if not ready:
+            raise SchedulerError(f"Stages {[stage.name for stage in remaining]} form a dependency cycle")
+        stage = ready[0]
+        order.append(stage)
+        remaining.remove(stage)
+        available.update(stage.outputs)
+    return order
+
+def select_stages(stages: list, targets: list = None, skip: list = None):
+    """
+    Subset of the stages to run: the targets plus every stage they depend on (all stages when no targets),
+    minus the skipped stages and every stage that depends on one of them.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in (targets or []) + (skip or []) if name not in by_name]
+    if unknown:
+        raise SchedulerError(f"Unknown stages {unknown}; available: {list(by_name)}")
+
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    selected = set(by_name) if not targets else set()
+    pending = list(targets or [])
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(producers[i] for i in by_name[name].inputs if i in producers)
+
+    removed = set(skip or [])
+    changed = True
+    while changed:
+        dependents = {
+            stage.name for stage in stages
+            if stage.name not in removed and any(producers.get(i) in removed for i in stage.inputs)
+        }
+        changed = bool(dependents)
+        removed |= dependents
+
+    return [stage for stage in stages if stage.name in selected and stage.name not in removed]
+
+def timed_call(func, inputs: dict, name: str = None):
+    """Call a stage function and measure its wall-clock time where it runs (traced as a stage span when tracing is on)"""
+    started = time.perf_counter()
+    with span(name or func.__name__, "stage"):
+        value = func(**inputs)
+    return value, time.perf_counter() - started
+
+def run_stages(stages: list, context: dict = None, workers: int = 1, cancel_event: threading.Event = None,
+               checkpoints: StageCheckpoints = None, fingerprints: dict = None, timings: dict = None):
+    """
+    Run stages as soon as their inputs are available, up to `workers` at a time, and return the final context.
+    With workers <= 1 stages run serially in topological order. A failing stage stops new stages from starting,
+    lets running ones finish and re-raises its exception; setting `cancel_event` does the same with StageCancelled.
+    With `checkpoints`, a stage whose inputs and rules are unchanged is loaded from disk instead of run;
+    `fingerprints` may identify expensive initial context entries (e.g. the dataset) without hashing them.
+    Each stage's wall-clock seconds (including checkpoint loads and saves) are recorded in `timings` when given,
+    and each stage runs inside a span of the active tracer (see pipeline.tracing).
+    """
+    timings = {} if timings is None else timings
+    context = dict(context or {})
+    order = topological_order(stages, context)
+    run = StageRun(context, fingerprints, checkpoints)
+
+    if workers <= 1:
+        for stage in order:
+            if cancel_event is not None and cancel_event.is_set():
+                raise StageCancelled(f"Run cancelled before stage '{stage.name}'")
+            started = time.perf_counter()
+            with span(stage.name, "stage") as stage_span:
+                if run.reuse(stage):
+                    stage_span.set(checkpoint="reused")
+                else:
+                    run_stage(stage, run)
+            timings[stage.name] = time.perf_counter() - started
+        return context
+
+    pools = {"thread": ThreadPoolExecutor(max_workers=workers)}
+    if any(stage.executor == "process" for stage in stages):
+        pools["process"] = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+
+    remaining = list(order)
+    running = {}
+    try:
+        while remaining or running:
+            # Submit every stage whose inputs are available, in serial order, while there is capacity
+            for stage in [s for s in remaining if set(s.inputs) <= context.keys()]:
+                if len(running) >= workers:
+                    break
+                started = time.perf_counter()
+                with span(stage.name, "checkpoint") if checkpoints is not None else NULL_SPAN as lookup:
+                    reused = run.reuse(stage)
+                    lookup.set(checkpoint="reused" if reused else "miss")
+                if reused:
+                    timings[stage.name] = time.perf_counter() - started
+                    remaining.remove(stage)
+                    continue
+                inputs = {name: context[name] for name in stage.inputs}
+                running[pools[stage.executor].submit(timed_call, stage.func, inputs, stage.name)] = stage
+                remaining.remove(stage)
+
+            if not running:
+                continue # only reused stages this round; their outputs may have made more stages ready
+            done, _ = wait(running, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                raise StageCancelled(f"Run cancelled while {[s.name for s in running.values()]} were running")
+
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    value, seconds = future.result()
+                    started = time.perf_counter()
+                    run.publish(stage, value)
+                    timings[stage.name] = seconds + time.perf_counter() - started
+                except Exception as exc:
+                    exc.add_note(f"Raised in pipeline stage '{stage.name}'")
+                    raise
+    finally:
+        # Nothing new starts after a failure or cancellation; stages already running are allowed to finish
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return context
+
+def run_stage(stage: Stage, run: StageRun):
+    """Run one stage in the calling thread and publish its outputs"""
+    inputs = {name: run.context[name] for name in stage.inputs}
+    try:
+        run.publish(stage, stage.func(**inputs))
+    except Exception as exc:
+        exc.add_note(f"Raised in pipeline stage '{stage.name}'")
+        raise
@@ -0,0 +1,112 @@
+"""This module is responsible for batch scoring datasets with a persisted model artifact."""
+import argparse
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from pipeline.ingest import ChunkedDataset, IngestError
+from pipeline.excel_reader import STREAMED_EXTENSIONS, EXCEL_CHUNK_ROWS, iter_sheet_chunks
+from pipeline.model import load_model_spec
+
+# Custom Exception
+class ScoringError(Exception):
+    pass
+
+def prepare_features(chunk: pd.DataFrame, spec: dict):
+    """Apply training's input preparation to a chunk: imputation plan, numeric coercion, remaining gaps as 0"""
+    X = chunk[spec["features"]]
+    if spec["imputation_values"]:
+        X = X.fillna(spec["imputation_values"])
+    return X.apply(pd.to_numeric, errors="coerce").fillna(0)
+
+def iter_input_chunks(dataset_path: str, columns: list, memory_budget_mb: float = 1024, chunk_rows: int = None):
+    """Yield the feature columns of the input in bounded chunks (legacy .xls files are read whole, then sliced)"""
+    if dataset_path.endswith(".csv"):
+        dataset = ChunkedDataset(dataset_path, memory_budget_mb=memory_budget_mb, chunk_rows=chunk_rows)
+        missing = [c for c in columns if c not in dataset.columns]
+        if missing:
+            raise ScoringError(f"Input is missing model features: {missing}")
+        yield from dataset.iter_chunks(columns)
+        return
+
+    if not dataset_path.endswith((".xls", ".xlsx")):
+        raise IngestError("Unsupported file format. Only CSV and Excel files are supported")
+
+    if dataset_path.endswith(STREAMED_EXTENSIONS):
+        # Only the feature columns of the first sheet are parsed, a bounded chunk of rows at a time
+        checked = False
+        for chunk in iter_sheet_chunks(dataset_path, usecols=set(columns).__contains__, chunk_rows=chunk_rows or EXCEL_CHUNK_ROWS):
+            if not checked:
+                missing = [c for c in columns if c not in chunk.columns]
+                if missing:
+                    raise ScoringError(f"Input is missing model features: {missing}")
+                checked = True
+            if len(chunk):
+                yield chunk[columns]
+        if not checked:
+            raise ScoringError(f"Input is missing model features: {columns}") # empty sheet
+        return
+
+    data = pd.read_excel(dataset_path)
+    missing = [c for c in columns if c not in data.columns]
+    if missing:
+        raise ScoringError(f"Input is missing model features: {missing}")
+    step = chunk_rows or len(data) or 1
+    for start in range(0, len(data), step):
+        yield data.iloc[start:start + step][columns]
+
+def score_dataset(dataset_path: str, model_path: str, output_path: str = "outputs/predictions.csv",
+                  memory_budget_mb: float = 1024, chunk_rows: int = None):
+    """Score a dataset chunk by chunk with a persisted model, appending predictions to a CSV file."""
+    if not os.path.exists(dataset_path):
+        raise IngestError(f"Dataset not found at {dataset_path}")
+    if not os.path.exists(model_path):
+        raise ScoringError(f"Model artifact not found at {model_path}")
+
+    scoring_log = []
+    spec = load_model_spec(model_path)
+
+    # Memory-mapped load: the artifact's arrays are shared page cache, not private copies per scorer
+    model = joblib.load(model_path, mmap_mode="r")
+    scoring_log.append(f"Loaded {spec['model_used']} artifact from {model_path} (memory-mapped).")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    started = time.perf_counter()
+    rows = 0
+    chunks = 0
+
+    with open(output_path, "w", newline="") as f:
+        for chunk in iter_input_chunks(dataset_path, spec["features"], memory_budget_mb, chunk_rows):
+            predictions = model.predict(prepare_features(chunk, spec))
+            pd.DataFrame({"row": chunk.index, "prediction": np.asarray(predictions)}).to_csv(f, header=chunks == 0, index=False)
+            rows += len(chunk)
+            chunks += 1
+
+    seconds = time.perf_counter() - started
+    rows_per_second = rows / seconds if seconds > 0 else float("inf")
+
+    scoring_log.append(f"Applied imputation to {len(spec['imputation_values'])} of {len(spec['features'])} features.")
+    scoring_log.append(f"Scored {rows} rows in {chunks} chunks in {seconds:.2f}s ({rows_per_second:,.0f} rows/sec).")
+    scoring_log.append(f"Saved predictions at {output_path}.")
+
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows_per_second,
+        "predictions_path": output_path,
+        "scoring_log": scoring_log
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", help="CSV or Excel file to score")
+    parser.add_argument("--model", default="outputs/model/linear_regression.joblib", help="artifact persisted by the pipeline")
+    parser.add_argument("--output", default="outputs/predictions.csv")
+    parser.add_argument("--memory-budget-mb", type=float, default=1024)
+    parser.add_argument("--chunk-rows", type=int, default=None, help="rows per chunk (derived from the memory budget when omitted)")
+    args = parser.parse_args()
+
+    result = score_dataset(args.dataset, args.model, args.output, args.memory_budget_mb, args.chunk_rows)
+    for line in result["scoring_log"]:
+        print(line)
@@ -0,0 +1,232 @@
+"""This module is responsible for tracing where a run spends its time and memory, at near-zero cost when disabled."""
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError: # not available on Windows; peak RSS is then left out
+    resource = None
+
+MB = 1024 ** 2
+
+_tracer = None # active tracer of this process; while None every span is a shared no-op
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / MB if sys.platform == "darwin" else peak / 1024 # bytes on macOS, kilobytes elsewhere
+
+def frame_shape(data):
+    """Row and column counts of a frame or streamed dataset, as span attributes"""
+    shape = getattr(data, "shape", None)
+    if shape is not None:
+        return {"rows": int(shape[0]), "columns": int(shape[1])}
+    return {"rows": getattr(data, "rows", None), "columns": len(getattr(data, "columns", []))}
+
+class _NullSpan:
+    """Stands in for a span while tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class Span:
+    """
+    One timed region: wall and thread CPU seconds, growth of the process's peak RSS and, when the tracer
+    traces memory, the Python allocations made inside it (tracemalloc is process-wide, so spans overlapping
+    in other threads share their peaks).
+    """
+
+    def __init__(self, tracer, name: str, category: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.child_peak = 0 # highest traced allocation seen by finished nested spans
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.depth = len(stack)
+        self.id = self.tracer._next_id()
+        self.parent_id = stack[-1].id if stack else None # spans nest per thread
+        if self.tracer.memory:
+            self.traced_start, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak) # keep the parent's peak before resetting it
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.rss_start = peak_rss_mb()
+        self.cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu_start
+        rss = peak_rss_mb()
+        stack = self.tracer._stack()
+        stack.pop()
+
+        record = {
+            "id": self.id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "category": self.category,
+            "start_s": round(self.start - self.tracer.origin, 6),
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "depth": self.depth,
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+            "peak_rss_mb": None if rss is None else round(rss, 2),
+            "rss_growth_mb": None if rss is None else round(rss - self.rss_start, 2)
+        }
+        if self.tracer.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            record["alloc_mb"] = round((current - self.traced_start) / MB, 3)
+            record["peak_alloc_mb"] = round((peak - self.traced_start) / MB, 3)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(self.attrs)
+        self.tracer._record(record)
+        return False
+
+class Tracer:
+    """Finished spans of one run, exportable as JSON or as Chrome trace events (chrome://tracing, Perfetto)."""
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.spans = []
+        self.origin = time.perf_counter()
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _next_id(self):
+        return next(self._ids) # itertools.count is atomic under the GIL
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, record: dict):
+        with self._lock:
+            self.spans.append(record)
+
+    def current(self):
+        """Innermost open span of the calling thread, if any"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def summary(self):
+        """One row per (category, name) in order of first completion: calls, total wall/CPU seconds, peaks and largest shape"""
+        with self._lock:
+            spans = list(self.spans)
+
+        rows = {}
+        for span in spans:
+            row = rows.setdefault((span["category"], span["name"]), {
+                "category": span["category"], "name": span["name"], "calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                "peak_rss_mb": None, "peak_alloc_mb": None, "rows": None, "columns": None
+            })
+            row["calls"] += 1
+            row["wall_s"] += span["wall_s"]
+            row["cpu_s"] += span["cpu_s"]
+            for key in ("peak_rss_mb", "peak_alloc_mb", "rows", "columns"):
+                if span.get(key) is not None:
+                    row[key] = span[key] if row[key] is None else max(row[key], span[key])
+        return list(rows.values())
+
+    def to_json(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"started_at": self.started_at, "memory": self.memory, "spans": self.spans, "summary": self.summary()}, f, indent=2, default=str)
+        return path
+
+    def to_chrome_trace(self, path: str):
+        """Complete ('X') events in microseconds, one track per thread"""
+        reserved = {"name", "category", "start_s", "wall_s", "pid", "thread"}
+        events = [{
+            "name": span["name"],
+            "cat": span["category"],
+            "ph": "X",
+            "ts": round(span["start_s"] * 1e6, 1),
+            "dur": round(span["wall_s"] * 1e6, 1),
+            "pid": span["pid"],
+            "tid": span["thread"],
+            "args": {key: value for key, value in span.items() if key not in reserved}
+        } for span in self.spans]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+    def __getstate__(self):
+        # Locks and thread-local stacks do not pickle; checkpoint fingerprints only need the spans
+        return {"memory": self.memory, "spans": self.spans, "origin": self.origin, "started_at": self.started_at}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(max((span["id"] for span in self.spans), default=0) + 1)
+
+def span(name: str, category: str = "inner", **attrs):
+    """Context manager timing a region under the active tracer; the shared no-op span when tracing is disabled"""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, category, attrs)
+
+def annotate(**attrs):
+    """Attach attributes (e.g. rows, columns) to the calling thread's innermost open span"""
+    tracer = _tracer
+    if tracer is None:
+        return
+    current = tracer.current()
+    if current is not None:
+        current.set(**attrs)
+
+@contextmanager
+def tracing(enabled: bool = True, memory: bool = False):
+    """Make a new tracer the active one for the duration of the block; yields None when disabled"""
+    global _tracer
+    if not enabled:
+        yield None
+        return
+
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    previous, _tracer = _tracer, Tracer(memory=memory)
+    try:
+        yield _tracer
+    finally:
+        _tracer = previous
+        if started_tracemalloc:
+            tracemalloc.stop()
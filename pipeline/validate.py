@@ -1,21 +1,56 @@
 """This module is responsible for validating dataset and rules"""
 import pandas as pd
+from pipeline.ingest import ChunkedDataset
+from profiling.dataset_stats import DatasetStats
 
 # Custom error for this module
 class ValidationError(Exception):
     pass
 
-def validate_dataset(df:pd.DataFrame, rules: dict):
+def streaming_metrics(dataset: ChunkedDataset):
+    """Calculate validation metrics in a single pass over the chunks of a streamed dataset"""
+    rows = 0
+    missing_cells = 0
+    numeric_columns = set(dataset.columns)
+
+    for chunk in dataset.iter_chunks():
+        rows += len(chunk)
+        missing_cells += int(chunk.isnull().sum().sum())
+        # A column only counts as numeric if every chunk parsed it as numeric
+        numeric_columns &= set(chunk.select_dtypes(include='number').columns)
+
+    total_cells = rows * len(dataset.columns)
+    return {
+        "rows": rows,
+        "columns": len(dataset.columns),
+        "overall_missing_pct":round(missing_cells/total_cells*100,2) if total_cells else 0.0,
+        "numeric_columns":len(numeric_columns)
+    }
+
+def validate_dataset(df:pd.DataFrame, rules: dict, stats: DatasetStats = None):
     """Validate dataset against rules"""
     validation_rules = rules.get("dataset_validation")
 
     # Calculate metrics from dataset
-    metrics = {
-        "rows": df.shape[0],
-        "columns": df.shape[1],
-        "overall_missing_pct":round(df.isnull().mean().mean()*100,2),
-        "numeric_columns":df.select_dtypes(include='number').shape[1]
-    }
+    if isinstance(df, ChunkedDataset):
+        metrics = streaming_metrics(df)
+    elif stats is not None:
+        metrics = {
+            "rows": stats.total_rows,
+            "columns": len(stats.columns),
+            "overall_missing_pct":round(stats.missing_fraction.mean()*100,2),
+            "numeric_columns":len(stats.numeric_columns)
+        }
+    else:
+        metrics = {
+            "rows": df.shape[0],
+            "columns": df.shape[1],
+            "overall_missing_pct":round(df.isnull().mean().mean()*100,2),
+            "numeric_columns":df.select_dtypes(include='number').shape[1]
+        }
+
+    # Footprint before and after the ingest-time dtype optimization, when it ran
+    metrics.update(getattr(df, "attrs", {}).get("memory_footprint", {}))
 
     reasons=[] # List to store reasons for validation failure
 
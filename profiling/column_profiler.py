@@ -2,11 +2,16 @@
 import pandas as pd
 import numpy as np 
 import re  # regular expression library (regex)
+from pipeline.ingest import ChunkedDataset
+from profiling.sketches import HyperLogLog, KLLSketch
+from profiling.dataset_stats import DatasetStats
+from profiling.sampling import proportion_interval
+from pipeline.tracing import span
 
 ID_PATTERN = re.compile(r"(id|uuid|index|sno|s.no|s.no.)",re.IGNORECASE) # pattern to match column header which are ids
 
-def is_id_like(column_name: str, series: pd.Series, total_rows:int):
-    """Checks if a column is an id column"""
+def id_like(column_name: str, unique_values: int, total_rows: int):
+    """Checks if a column is an id column from its name and precomputed unique count"""
 
     if ID_PATTERN.search(column_name):
         return True # Column name matches patter -> than it is id column
@@ -14,9 +19,13 @@ def is_id_like(column_name: str, series: pd.Series, total_rows:int):
     if total_rows == 0:
         return False # If no rows -> it can't be id column
     
-    unique_ratio = series.nunique() / total_rows
+    unique_ratio = unique_values / total_rows
     return unique_ratio > 0.95 # If unique ratio is high -> than it is id column
 
+def is_id_like(column_name: str, series: pd.Series, total_rows:int):
+    """Checks if a column is an id column"""
+    return id_like(column_name, series.nunique(), total_rows)
+
 def outlier_percentage(series: pd.Series):
     """Calculate percentage of outliers in a column"""
     q1 = series.quantile(0.25)
@@ -33,21 +42,132 @@ def outlier_percentage(series: pd.Series):
 
     return round((len(outliers)/len(series))*100,2)
 
-def profile_columns(df: pd.DataFrame):
+def profile_columns_approx(df: pd.DataFrame, profiling_rules: dict = None):
+    """Profile columns in a single pass over the data using mergeable sketches instead of exact unique counts and quantiles"""
+    profiling_rules = profiling_rules or {}
+    distinct_error = profiling_rules.get("distinct_count_error", 0.01)
+    rank_error = profiling_rules.get("quantile_rank_error", 0.01)
+
+    chunks = df.iter_chunks() if isinstance(df, ChunkedDataset) else [df]
+
+    total_rows = 0
+    missing = {}
+    numeric = {}
+    distinct = {}
+    quantiles = {}
+    moments = {} # column -> (count, mean, sum of squared deviations), merged across chunks
+
+    for chunk in chunks:
+        total_rows += len(chunk)
+        for column, count in chunk.isnull().sum().items():
+            missing[column] = missing.get(column, 0) + int(count)
+
+        for column in chunk.columns:
+            with span("profile.column", rows=len(chunk)):
+                is_numeric = pd.api.types.is_numeric_dtype(chunk[column].dtype)
+                numeric[column] = numeric.get(column, True) and is_numeric # numeric only if every chunk parsed it as numeric
+                distinct.setdefault(column, HyperLogLog.from_error(distinct_error)).update(chunk[column])
+
+                if not is_numeric:
+                    continue
+
+                values = chunk[column].to_numpy(dtype="float64", na_value=np.nan)
+                quantiles.setdefault(column, KLLSketch.from_error(rank_error)).update(values)
+
+                # Chan et al. parallel update of count, mean and M2
+                n_b = int(np.count_nonzero(~np.isnan(values)))
+                if n_b == 0:
+                    continue
+                mean_b = float(np.nanmean(values))
+                m2_b = float(np.nansum((values - mean_b) ** 2))
+                n_a, mean_a, m2_a = moments.get(column, (0, 0.0, 0.0))
+                n = n_a + n_b
+                delta = mean_b - mean_a
+                moments[column] = (n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n)
+
+    profiles = {}
+    for column in missing:
+        unique_values = int(round(distinct[column].estimate()))
+        error_bounds = {"unique_values": round(distinct[column].relative_error, 4)}
+
+        if numeric[column]:
+            column_type = "numeric"
+            n, _, m2 = moments.get(column, (0, 0.0, 0.0))
+            variance = m2 / (n - 1) if n > 1 else float("nan")
+
+            sketch = quantiles[column]
+            q1 = sketch.quantile(0.25)
+            q3 = sketch.quantile(0.75)
+            iqr = q3 - q1
+            if sketch.n == 0 or iqr == 0:
+                outlier_pct = 0.0
+            else:
+                below = sketch.rank(q1 - 1.5 * iqr)
+                above = 1 - sketch.rank(q3 + 1.5 * iqr, inclusive=True)
+                outlier_pct = round((below + above) * sketch.n / total_rows * 100, 2)
+            # Each tail rank may be off by the sketch's rank error, in percentage points of all rows
+            error_bounds["outlier_pct"] = round(2 * sketch.rank_error * 100, 2)
+        else:
+            column_type = "categorical"
+            variance = None
+            outlier_pct = None
+
+        profiles[column] = {
+            "type":column_type,
+            "missing_pct":round(missing[column] / total_rows * 100, 2) if total_rows else float("nan"),
+            "unique_values":unique_values,
+            "variance":variance,
+            "outlier_pct":outlier_pct,
+            "is_id_like":id_like(column,unique_values,total_rows),
+            "error_bounds":error_bounds
+        }
+
+    return profiles
+
+def profile_columns(df: pd.DataFrame, rules: dict = None, stats: DatasetStats = None):
     """Profile columns in a dataset"""
+
+    profiling_rules = (rules or {}).get("profiling", {})
+    if profiling_rules.get("mode", "exact") == "approximate":
+        return profile_columns_approx(df, profiling_rules)
     
-    profiles={}
-    total_rows = len(df)
+    # Streamed datasets are profiled one memory-bounded column batch at a time
+    if isinstance(df, ChunkedDataset):
+        # Every batch holds all rows, so with the stratification column at hand each one draws the same sample
+        sampling_rules = (rules or {}).get("sampling", {})
+        stratify_by = sampling_rules.get("stratify_by")
+        strata = None
+        if sampling_rules.get("enabled", False) and sampling_rules.get("method") == "stratified" and stratify_by in df.columns:
+            strata = df.materialize([stratify_by])[stratify_by]
+
+        profiles = {}
+        for batch in df.iter_column_batches():
+            with span("profile.column_batch", rows=len(batch), columns=batch.shape[1]):
+                profiles.update(profile_columns(batch, rules, DatasetStats(batch, rules, strata)))
+        return profiles
 
-    for column in df.columns:
-        series = df[column]
-        missing_pct = round(series.isnull().mean()*100,2)
-        unique_values = series.nunique(dropna=True)
+    # Every statistic comes from frame-level reductions shared with the other stages
+    stats = stats if stats is not None else DatasetStats(df, rules)
+    total_rows = stats.total_rows
+    missing_pct = (stats.missing_fraction*100).round(2)
+    unique_values = stats.unique_counts
 
-        if pd.api.types.is_numeric_dtype(series):
+    # Outlier percentages come from the order statistics, which are computed on the sample when sampling is on
+    sample_rows = stats.sample_rows
+    sample_info = stats.sample_info
+    numeric_stats = {}
+    if stats.profile_numeric_columns:
+        order_stats = stats.order_stats
+        for column in stats.profile_numeric_columns:
+            outliers = 0 if order_stats["iqr"][column] == 0 else int(order_stats["outliers"][column])
+            outlier_pct = 0.0 if sample_rows == 0 else round((outliers/sample_rows)*100,2)
+            numeric_stats[column] = (float(stats.variances[column]), outlier_pct, outliers)
+
+    profiles={}
+    for column in stats.columns:
+        if column in numeric_stats:
             column_type = "numeric"
-            variance = float(series.var()) if series.var() is not None else None
-            outlier_pct = outlier_percentage(series)
+            variance, outlier_pct, outliers = numeric_stats[column]
         else:
             column_type = "categorical"
             variance = None
@@ -55,11 +175,17 @@ def profile_columns(df: pd.DataFrame):
 
         profiles[column] = {
             "type":column_type,
-            "missing_pct":missing_pct,
-            "unique_values":unique_values,
+            "missing_pct":missing_pct[column],
+            "unique_values":unique_values[column],
             "variance":variance,
             "outlier_pct":outlier_pct,
-            "is_id_like":is_id_like(column,series,total_rows)
+            "is_id_like":id_like(column,unique_values[column],total_rows)
         }
 
-    return profiles
\ No newline at end of file
+        if sample_info is not None and column_type == "numeric":
+            profiles[column]["sample"] = dict(
+                sample_info,
+                outlier_pct_ci=proportion_interval(outliers, sample_rows, total_rows, sample_info["confidence_level"])
+            )
+
+    return profiles
@@ -0,0 +1,125 @@
+"""This module is responsible for computing dataset statistics once per run and sharing them across stages."""
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from profiling.numeric_stats import numeric_column_stats
+from profiling.parallel import parallel_numeric_column_stats, resolve_workers
+from profiling.sampling import draw_sample
+from pipeline.tracing import span
+
+class DatasetStats:
+    """Statistics of the ingested frame, each computed lazily on first use and then reused by every stage."""
+
+    def __init__(self, df: pd.DataFrame, rules: dict = None, strata: pd.Series = None):
+        self.df = df
+        self.profiling_rules = (rules or {}).get("profiling", {})
+        self.sampling_rules = (rules or {}).get("sampling", {})
+        self.total_rows = len(df)
+        self.columns = list(df.columns)
+        self._strata = strata # stratification column given from outside, for frames that do not hold it
+        self._modes = {}
+
+    # Bounded row sample
+    @cached_property
+    def sample(self):
+        """Row positions and description of the sample the order statistics and EDA work on; (None, None) when unsampled"""
+        strata = self._strata
+        stratify_by = self.sampling_rules.get("stratify_by")
+        if strata is None and stratify_by in self.df.columns:
+            strata = self.df[stratify_by]
+        return draw_sample(self.total_rows, self.sampling_rules, strata)
+
+    @property
+    def sample_positions(self):
+        return self.sample[0]
+
+    @property
+    def sample_info(self):
+        return self.sample[1]
+
+    @property
+    def sample_rows(self):
+        """Rows behind the order statistics"""
+        return self.total_rows if self.sample_positions is None else len(self.sample_positions)
+
+    # Null bitmap
+    @cached_property
+    def null_mask(self):
+        return self.df.isnull().to_numpy()
+
+    @cached_property
+    def null_counts(self):
+        return pd.Series(self.null_mask.sum(axis=0), index=self.columns)
+
+    @cached_property
+    def missing_fraction(self):
+        if self.total_rows == 0:
+            return pd.Series(np.nan, index=self.columns)
+        return self.null_counts / self.total_rows
+
+    # Dtype classification
+    @cached_property
+    def numeric_columns(self):
+        """Columns pandas treats as numbers (select_dtypes 'number'), used by validation, EDA and modeling"""
+        return list(self.df.select_dtypes(include=['number']).columns)
+
+    @cached_property
+    def categorical_columns(self):
+        """Object, string and category columns, used by EDA"""
+        return list(self.df.select_dtypes(include=['object', 'category']).columns)
+
+    @cached_property
+    def profile_numeric_columns(self):
+        """Columns profiled as numeric (any numeric dtype, booleans included)"""
+        return [c for c, dtype in self.df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+
+    # Per-column moments and order statistics
+    @cached_property
+    def means(self):
+        return self.df[self.profile_numeric_columns].mean()
+
+    @cached_property
+    def variances(self):
+        return self.df[self.profile_numeric_columns].var()
+
+    @cached_property
+    def order_stats(self):
+        """Unique counts, quartiles, medians and outlier counts of the numeric columns, from a single sort (of the sample, if any)"""
+        numeric_df = self.df[self.profile_numeric_columns]
+        if self.sample_positions is not None:
+            numeric_df = numeric_df.iloc[self.sample_positions]
+
+        # Shard the column-independent sort work across processes, unless the frame is too small to amortize the pool
+        workers = resolve_workers(self.profiling_rules.get("workers", 1))
+        with span("stats.order_stats", rows=numeric_df.shape[0], columns=numeric_df.shape[1]):
+            if workers > 1 and numeric_df.size >= self.profiling_rules.get("parallel_min_cells", 5_000_000):
+                stats = parallel_numeric_column_stats(numeric_df, workers)
+            else:
+                stats = numeric_column_stats(numeric_df.to_numpy(dtype="float64", na_value=np.nan))
+
+        return {key: pd.Series(values, index=self.profile_numeric_columns) for key, values in stats.items()}
+
+    @cached_property
+    def medians(self):
+        # Imputation fills with these, so they stay exact when the order statistics are sampled
+        if self.sample_positions is not None:
+            return self.df[self.profile_numeric_columns].median().astype("float64")
+        return self.order_stats["median"]
+
+    @cached_property
+    def unique_counts(self):
+        # A sample undercounts distinct values, so numeric columns are counted exactly by hashing when sampled
+        sampled = self.sample_positions is not None
+        other_columns = [c for c in self.columns if sampled or c not in set(self.profile_numeric_columns)]
+        counts = {}
+        if other_columns:
+            counts.update(self.df[other_columns].nunique(dropna=True).to_dict())
+        if not sampled:
+            counts.update({c: int(n) for c, n in self.order_stats["unique_values"].items()})
+        return {c: counts[c] for c in self.columns}
+
+    def mode(self, column: str):
+        """Most frequent value of a column, memoized per column since only imputed columns need it"""
+        if column not in self._modes:
+            self._modes[column] = self.df[column].mode()[0]
+        return self._modes[column]
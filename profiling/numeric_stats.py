@@ -0,0 +1,63 @@
+"""This module is responsible for column-wise statistics of numeric blocks, shared by serial and parallel profiling."""
+import numpy as np
+
+def sorted_quantile(sorted_values: np.ndarray, counts: np.ndarray, q: float):
+    """Linear-interpolated quantile of every column of a NaN-last sorted 2-D array (matches np.quantile)"""
+    if sorted_values.shape[0] == 0:
+        return np.full(sorted_values.shape[1], np.nan)
+
+    columns = np.arange(sorted_values.shape[1])
+    last = np.maximum(counts - 1, 0)
+
+    virtual_index = q * last
+    lower = np.floor(virtual_index).astype(np.int64)
+    upper = np.minimum(lower + 1, last)
+    gamma = virtual_index - lower
+
+    a = sorted_values[lower, columns]
+    b = sorted_values[upper, columns]
+    diff = b - a
+    # Same lerp as numpy, which interpolates from the nearer end for numerical stability
+    result = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return np.where(counts > 0, result, np.nan)
+
+def sorted_median(sorted_values: np.ndarray, counts: np.ndarray):
+    """Median of every column of a NaN-last sorted 2-D array, averaging the middle pair like np.median"""
+    if sorted_values.shape[0] == 0:
+        return np.full(sorted_values.shape[1], np.nan)
+
+    columns = np.arange(sorted_values.shape[1])
+    upper = np.minimum(counts // 2, np.maximum(counts - 1, 0))
+    lower = np.maximum(upper - (1 - counts % 2), 0)
+    result = (sorted_values[lower, columns] + sorted_values[upper, columns]) / 2
+    return np.where(counts > 0, result, np.nan)
+
+def numeric_column_stats(values: np.ndarray):
+    """Unique counts, quartiles, median, IQR bounds and outlier counts of every column of a 2-D float array, from one sort"""
+    sorted_values = np.sort(values, axis=0) # NaNs sort to the end of each column
+    counts = (~np.isnan(sorted_values)).sum(axis=0)
+
+    # Distinct values are the non-NaN positions where the sorted value changes
+    if sorted_values.shape[0] > 1:
+        changes = sorted_values[1:] != sorted_values[:-1]
+        in_range = np.arange(1, sorted_values.shape[0])[:, None] < counts[None, :]
+        unique_values = (changes & in_range).sum(axis=0) + (counts > 0)
+    else:
+        unique_values = (counts > 0).astype(np.int64)
+
+    q1 = sorted_quantile(sorted_values, counts, 0.25)
+    q3 = sorted_quantile(sorted_values, counts, 0.75)
+    median = sorted_median(sorted_values, counts)
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    outliers = ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+
+    return {
+        "unique_values": unique_values,
+        "q1": q1,
+        "q3": q3,
+        "median": median,
+        "iqr": iqr,
+        "outliers": outliers
+    }
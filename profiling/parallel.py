@@ -0,0 +1,60 @@
+"""This module is responsible for sharding numeric profiling work across a process pool."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from profiling.numeric_stats import numeric_column_stats
+
+def resolve_workers(workers):
+    """Number of worker processes to use; 0 or None means one per CPU core"""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(int(workers), 1)
+
+def process_context():
+    """
+    Start method for worker pools: forkserver (spawn where it is unavailable), never fork. Pools may be created
+    on a scheduler thread while other stages hold locks inside numpy or matplotlib, which a forked child inherits.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _column_stats_worker(shm_name: str, shape: tuple, start: int, stop: int):
+    """Attach to the shared numeric block and compute stats for columns [start, stop)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # Column-major layout, so each shard is a contiguous, zero-copy view of the shared buffer
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order="F")
+        stats = numeric_column_stats(values[:, start:stop])
+        del values # release the view so the segment can be closed
+        return start, stats
+    finally:
+        shm.close()
+
+def parallel_numeric_column_stats(numeric_df: pd.DataFrame, workers: int):
+    """Same result as numeric_column_stats on the whole block, computed in worker processes over shared memory"""
+    shape = numeric_df.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 8, 1))
+    values = None
+    try:
+        # Fill the shared block column by column rather than materializing a second private copy
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order="F")
+        for i in range(shape[1]):
+            values[:, i] = numeric_df.iloc[:, i].to_numpy(dtype="float64", na_value=np.nan)
+
+        bounds = np.linspace(0, shape[1], min(workers, shape[1]) + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+            futures = [
+                pool.submit(_column_stats_worker, shm.name, shape, int(start), int(stop))
+                for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+            ]
+            shards = sorted((future.result() for future in futures), key=lambda shard: shard[0])
+    finally:
+        values = None # release the view so the segment can be closed
+        shm.close()
+        shm.unlink()
+
+    # Stitch the shards back together in column order
+    return {key: np.concatenate([shard[key] for _, shard in shards]) for key in shards[0][1]}
@@ -0,0 +1,101 @@
+"""This module is responsible for drawing bounded, seeded row samples and the confidence intervals of estimates made from them."""
+import math
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+def reservoir_positions(total_rows: int, sample_rows: int, seed: int = 0):
+    """Sorted positions of a uniform sample without replacement (what a reservoir pass over the rows would keep)"""
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(total_rows, size=sample_rows, replace=False, shuffle=False))
+
+def proportional_allocation(stratum_rows: np.ndarray, sample_rows: int):
+    """Rows drawn per stratum: proportional to its size (largest remainders), at least one from every stratum when possible"""
+    total_rows = stratum_rows.sum()
+    exact = stratum_rows / total_rows * sample_rows
+    allocation = np.floor(exact).astype(np.int64)
+    if len(stratum_rows) <= sample_rows:
+        allocation = np.maximum(allocation, 1)
+
+    remaining = sample_rows - allocation.sum()
+    if remaining > 0:
+        for i in np.argsort(-(exact - np.floor(exact)), kind="stable")[:remaining]:
+            allocation[i] += 1
+    elif remaining < 0:
+        # The one-per-stratum minimum overshot; take the excess back from the largest allocations
+        for i in np.argsort(-allocation, kind="stable")[:-remaining]:
+            allocation[i] -= 1
+    return np.minimum(allocation, stratum_rows)
+
+def stratified_positions(strata: pd.Series, sample_rows: int, seed: int = 0):
+    """Sorted positions of a proportionally allocated sample within each value of `strata` (missing values form a stratum)"""
+    rng = np.random.default_rng(seed)
+    codes, _ = pd.factorize(strata, use_na_sentinel=False)
+    stratum_rows = np.bincount(codes)
+    allocation = proportional_allocation(stratum_rows, sample_rows)
+
+    # Random priority per row; within each stratum the rows with the lowest priorities are kept
+    priorities = rng.random(len(codes))
+    order = np.lexsort((priorities, codes))
+    starts = np.concatenate(([0], np.cumsum(stratum_rows)[:-1]))
+    rank = np.arange(len(codes)) - starts[codes[order]]
+    return np.sort(order[rank < allocation[codes[order]]])
+
+def draw_sample(total_rows: int, sampling_rules: dict, strata: pd.Series = None):
+    """
+    Row positions of the configured sample and its description, or (None, None) when sampling is off or the
+    rows already fit in it. Stratifying needs the strata column; without it the sample is uniform.
+    """
+    sample_rows = sampling_rules.get("sample_rows", 100_000)
+    if not sampling_rules.get("enabled", False) or total_rows <= sample_rows:
+        return None, None
+
+    seed = sampling_rules.get("seed", 0)
+    if sampling_rules.get("method", "reservoir") == "stratified" and strata is not None:
+        method, stratify_by = "stratified", strata.name
+        positions = stratified_positions(strata, sample_rows, seed)
+    else:
+        method, stratify_by = "reservoir", None
+        positions = reservoir_positions(total_rows, sample_rows, seed)
+
+    info = {
+        "method": method,
+        "stratify_by": stratify_by,
+        "seed": seed,
+        "rows": len(positions),
+        "population_rows": total_rows,
+        "confidence_level": sampling_rules.get("confidence_level", 0.95)
+    }
+    return positions, info
+
+def describe_sample(info: dict):
+    """One-line description of a sample, for logs and the report"""
+    strata = f" by '{info['stratify_by']}'" if info["stratify_by"] is not None else ""
+    return f"{info['method']} sample{strata} of {info['rows']} of {info['population_rows']} rows (seed {info['seed']})"
+
+def z_score(confidence_level: float):
+    return NormalDist().inv_cdf(0.5 + confidence_level / 2)
+
+def proportion_interval(successes: int, sample_rows: int, population_rows: int, confidence_level: float = 0.95):
+    """Wilson score interval (in percent) of a proportion estimated from a sample drawn without replacement"""
+    if sample_rows == 0:
+        return (0.0, 100.0)
+    # Finite population correction, applied as a larger effective sample
+    n = sample_rows
+    if population_rows > sample_rows:
+        n = sample_rows * (population_rows - 1) / (population_rows - sample_rows)
+
+    z = z_score(confidence_level)
+    p = successes / sample_rows
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return (round(max(center - half_width, 0.0) * 100, 2), round(min(center + half_width, 1.0) * 100, 2))
+
+def correlation_interval(r: float, sample_rows: int, confidence_level: float = 0.95):
+    """Fisher z interval of a Pearson correlation estimated from a sample"""
+    if sample_rows <= 3 or abs(r) >= 1:
+        return (round(r, 3), round(r, 3))
+    z = math.atanh(r)
+    half_width = z_score(confidence_level) / math.sqrt(sample_rows - 3)
+    return (round(math.tanh(z - half_width), 3), round(math.tanh(z + half_width), 3))
@@ -0,0 +1,146 @@
+"""This module is responsible for mergeable sketches used by approximate profiling."""
+import math
+import numpy as np
+import pandas as pd
+
+# HyperLogLog register counts are kept in a range where the hash bits left after the register index
+# (64 - precision) are represented exactly as float64, so the leading-zero count below is exact.
+MIN_HLL_PRECISION = 11
+MAX_HLL_PRECISION = 18
+
+def hash_values(values: pd.Series):
+    """64-bit hashes of the non-null values of a series; numerics are hashed as float64 so 1 and 1.0 agree across chunks"""
+    values = values.dropna()
+    if pd.api.types.is_numeric_dtype(values):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch with 2**precision registers."""
+
+    def __init__(self, precision: int = 14):
+        if not MIN_HLL_PRECISION <= precision <= MAX_HLL_PRECISION:
+            raise ValueError(f"HyperLogLog precision must be between {MIN_HLL_PRECISION} and {MAX_HLL_PRECISION}")
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, relative_error: float):
+        """Smallest sketch whose relative standard error (1.04 / sqrt(m)) is within the given bound"""
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(min(max(precision, MIN_HLL_PRECISION), MAX_HLL_PRECISION))
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values: pd.Series):
+        hashes = hash_values(values)
+        if len(hashes) == 0:
+            return
+
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << remaining_bits) - 1)
+
+        # Rank = position of the leftmost 1-bit in the remaining bits (remaining_bits + 1 when all are zero)
+        rank = np.full(len(hashes), remaining_bits + 1, dtype=np.uint8)
+        nonzero = remainder > 0
+        rank[nonzero] = remaining_bits - np.floor(np.log2(remainder[nonzero].astype(np.float64))).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            return m * math.log(m / zeros) # Linear counting for small cardinalities
+        return raw
+
+class KLLSketch:
+    """KLL quantile sketch: a stack of compactors whose capacities shrink geometrically towards the bottom."""
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.compactors = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_error(cls, rank_error: float, seed: int = 0):
+        """Smallest sketch whose normalized rank error (~2.296 / k**0.9723) is within the given bound"""
+        k = math.ceil((2.296 / rank_error) ** (1 / 0.9723))
+        return cls(max(k, 8), seed)
+
+    @property
+    def rank_error(self):
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, level: int):
+        depth = len(self.compactors) - level - 1
+        return max(math.ceil(self.k * (2 / 3) ** depth), 2)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                # Sort, keep one item back if the count is odd, and promote every other item (random offset)
+                items = np.sort(items)
+                keep = items[len(items) - len(items) % 2:]
+                paired = items[:len(items) - len(items) % 2]
+                promoted = paired[self.rng.integers(2)::2]
+
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2 ** level, dtype=np.float64) for level, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q: float):
+        if self.n == 0:
+            return np.nan
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[min(position, len(items) - 1)])
+
+    def rank(self, value: float, inclusive: bool = False):
+        """Estimated fraction of values below (or at-or-below, when inclusive) the given value"""
+        if self.n == 0:
+            return 0.0
+        items, weights = self._weighted_items()
+        side = "right" if inclusive else "left"
+        return float(weights[:np.searchsorted(items, value, side=side)].sum() / weights.sum())
@@ -1,5 +1,7 @@
 """It aggregates risks from upstream outputs and reports them pessimistically."""
-def aggregate_risk(validation_result: dict, column_profiles: dict, decision_plan: dict, cleaning_log: dict, eda_result: dict, model_result: dict, rules: dict):
+from core.rule_compiler import CompiledRules, profile_table, column_messages
+
+def aggregate_risk(validation_result: dict, column_profiles: dict, decision_plan: dict, cleaning_events: list, eda_result: dict, model_result: dict, rules: dict):
     """Aggregate risks from various stages of the pipeline"""
     
     data_quality_risks = []
@@ -9,24 +11,34 @@ def aggregate_risk(validation_result: dict, column_profiles: dict, decision_plan
 
     risk_rules = rules.get("risk_flags",{})
 
-    # Data Quality Risks
-    for column,profile in column_profiles.items():
-        if profile["missing_pct"] >= risk_rules.get("data_quality",{}).get("high_missing_pct",100):
-            data_quality_risks.append(f"Column '{column}' has high missing percentage: {profile['missing_pct']}%")
+    # Per-column risk rules, evaluated at once over the profile table
+    compiled = CompiledRules(rules)
+    table = profile_table(column_profiles)
+    masks = compiled.risk_masks(table)
 
-        if profile["outlier_pct"] is not None and profile["outlier_pct"] >= risk_rules.get("data_quality",{}).get("high_outlier_pct",100):
-            data_quality_risks.append(f"Column '{column}' has high outlier percentage: {profile['outlier_pct']}%")
-    
-    if len(decision_plan.get("columns_to_drop",[])) > 0:
-        data_quality_risks.append(f"{decision_plan['columns_to_drop']} Columns were dropped during cleaning")
+    # Data Quality Risks
+    data_quality_risks.extend(column_messages(table, column_profiles, [
+        (masks["high_missing"],
+         lambda column, profile: f"Column '{column}' has high missing percentage: {profile['missing_pct']}%",
+         "{count} more columns have a high missing percentage"),
+        (masks["high_outlier"],
+         lambda column, profile: f"Column '{column}' has high outlier percentage: {profile['outlier_pct']}%",
+         "{count} more columns have a high outlier percentage")
+    ], compiled.log_limit))
+
+    columns_to_drop = decision_plan.get("columns_to_drop",[])
+    if compiled.log_limit is not None and len(columns_to_drop) > compiled.log_limit:
+        data_quality_risks.append(f"{len(columns_to_drop)} Columns were dropped during cleaning")
+    elif len(columns_to_drop) > 0:
+        data_quality_risks.append(f"{columns_to_drop} Columns were dropped during cleaning")
 
     # Cleaning behavior risks (part of data quality)
-    drop_events = [log for log in cleaning_log if "Dropped column" in log]
+    drop_events = [event for event in cleaning_events if event["event"] == "drop_column"]
 
     if len(drop_events) >= 3:
         data_quality_risks.append(f"{len(drop_events)} columns were dropped during cleaning, indicating weak data quality.")
 
-    imputation_events = [log for log in cleaning_log if "Imputed missing values" in log]
+    imputation_events = [event for event in cleaning_events if event["event"] == "impute"]
 
     if len(imputation_events) >= 2:
         data_quality_risks.append("Multiple columns were imputed; results may rely heavily on synthetic values.")
@@ -71,9 +83,11 @@ def aggregate_risk(validation_result: dict, column_profiles: dict, decision_plan
             modeling_risks.append("Model RMSE is zero or negative; possible data leakage.")
 
     # Business Risks
-    for column, profile in column_profiles.items():
-        if profile["outlier_pct"] is not None and profile["outlier_pct"] >= risk_rules.get("business_risks",{}).get("extreme_values_pct_gt",100):
-            business_risks.append(f"Extreme values detected in '{column}' which may skew business conclusions.")
+    business_risks.extend(column_messages(table, column_profiles, [
+        (masks["extreme_values"],
+         lambda column, profile: f"Extreme values detected in '{column}' which may skew business conclusions.",
+         "Extreme values detected in {count} more columns which may skew business conclusions.")
+    ], compiled.log_limit))
     
     # Final Fallback
     if not any([data_quality_risks, analysis_risks, modeling_risks, business_risks]):
@@ -1,26 +1,179 @@
-from pipeline.ingest import load_inputs
+import argparse
+import os
+import time
+from pipeline.ingest import load_rules, load_dataset, ChunkedDataset
 from pipeline.validate import validate_dataset
-from profiling.column_profiler import profile_columns
-from core.decision_engine import generate_decision_plan
-from pipeline.clean import execute_cleaning
-from pipeline.eda import execute_eda
-from pipeline.model import execute_model
-from risk.risk_aggregator import aggregate_risk
-from outputs.report_generator import generate_report
-
-def run_pipeline(dataset_path: str, rules_path: str):
+from profiling.dataset_stats import DatasetStats
+from pipeline.scheduler import Stage, run_stages, select_stages
+from pipeline.checkpoint import StageCheckpoints, rules_subset, stage_key
+from pipeline.cache import file_fingerprint
+from pipeline.tracing import annotate, frame_shape, span, tracing
+
+# Stage functions import their modules on first call, so scikit-learn, matplotlib and reportlab
+# are only loaded by runs that actually train, plot or write a report
+
+PRE_STAGES = ["ingest", "validate"] # always run, before the stage graph
+
+def profile_stage(data, rules: dict, stats: DatasetStats):
+    from profiling.column_profiler import profile_columns
+    annotate(**frame_shape(data))
+    return profile_columns(data, rules, stats)
+
+def decision_stage(validation_result: dict, column_profiles: dict, rules: dict):
+    from core.decision_engine import generate_decision_plan
+    return generate_decision_plan(validation_result, column_profiles, rules)
+
+def materialize_data(data, decision_plan: dict, rules: dict, stats: DatasetStats):
+    """Materialize only the surviving columns of a streamed dataset; in-memory frames pass through"""
+    if isinstance(data, ChunkedDataset):
+        frame = data.materialize(exclude=decision_plan["columns_to_drop"])
+        return frame, DatasetStats(frame, rules)
+    return data, stats
+
+def clean_stage(frame, decision_plan: dict, frame_stats: DatasetStats):
+    from pipeline.clean import execute_cleaning
+    annotate(**frame_shape(frame))
+    return execute_cleaning(frame, decision_plan, frame_stats)
+
+def eda_stage(cleaning_result: dict, decision_plan: dict, frame_stats: DatasetStats, rules: dict, output_dir: str):
+    if not decision_plan.get("eda_allowed", False):
+        # Same result as execute_eda's, without importing the plotting stack
+        return {"eda_metrics": {}, "eda_log": ["EDA skipped as per decision plan."], "plots": []}
+    from pipeline.eda import execute_eda
+    annotate(**frame_shape(cleaning_result["cleaned_data"]))
+    return execute_eda(cleaning_result["cleaned_data"], decision_plan, output_dir=os.path.join(output_dir, "eda"), stats=frame_stats, rules=rules)
+
+def train_model(data, cleaning_result: dict, decision_plan: dict, rules: dict, frame_stats: DatasetStats, output_dir: str):
+    """Model stage: stream a streamed dataset again when out-of-core training is enabled, else use the cleaned frame"""
+    if not decision_plan.get("modeling", {}).get("modeling_allowed", False):
+        # Same result as execute_model's, without importing scikit-learn
+        reason = decision_plan.get("modeling_reason", "Not Permitted")
+        return {"model_used": None, "metrics": {}, "model_artifact": None, "model_log": [f"Modeling skipped: {reason}"]}
+    from pipeline.model import execute_model
+    fill_values = cleaning_result["imputation_values"]
+    model_dir = os.path.join(output_dir, "model")
+    if isinstance(data, ChunkedDataset) and rules.get("model_constraints", {}).get("out_of_core", False):
+        annotate(**frame_shape(data))
+        return execute_model(data, decision_plan, rules, output_dir=model_dir, fill_values=fill_values)
+    annotate(**frame_shape(cleaning_result["cleaned_data"]))
+    return execute_model(cleaning_result["cleaned_data"], decision_plan, rules, output_dir=model_dir, stats=frame_stats, fill_values=fill_values)
+
+def model_artifacts(outputs: dict):
+    """Files written by the model stage: the artifact and its scoring spec"""
+    model_path = outputs["model_result"].get("model_artifact")
+    if not model_path:
+        return []
+    from pipeline.model import spec_path
+    return [model_path, spec_path(model_path)]
+
+def risk_stage(validation_result: dict, column_profiles: dict, decision_plan: dict, cleaning_result: dict, eda_result: dict, model_result: dict, rules: dict):
+    from risk.risk_aggregator import aggregate_risk
+    return aggregate_risk(
+        validation_result=validation_result,
+        column_profiles=column_profiles,
+        decision_plan=decision_plan,
+        cleaning_events=cleaning_result["cleaning_events"],
+        eda_result=eda_result,
+        model_result=model_result,
+        rules=rules
+        )
+
+def report_stage(validation_result: dict, decision_plan: dict, cleaning_result: dict, eda_result: dict, model_result: dict, risk_summary: dict, output_dir: str, tracer=None):
+    from outputs.report_generator import generate_report
+    return generate_report(
+        validation_result=validation_result,
+        decision_plan=decision_plan,
+        cleaning_result=cleaning_result,
+        eda_result=eda_result,
+        model_result=model_result,
+        risk_summary=risk_summary,
+        output_path=os.path.join(output_dir, "report.pdf"),
+        timings=tracer.summary() if tracer is not None else None
+    )
+
+def pipeline_stages():
+    """Stages after validation, with the context entries each one reads and writes; EDA and Model only share inputs"""
+    return [
+        Stage("profile", profile_stage,
+              inputs=["data", "rules", "stats"], outputs=["column_profiles"],
+              rule_keys=["profiling", "sampling"]),
+        Stage("decision_plan", decision_stage,
+              inputs=["validation_result", "column_profiles", "rules"], outputs=["decision_plan"],
+              rule_keys=["column_cleaning", "missing_values", "eda.skip_eda_if_rows_lt", "modeling", "risk_flags", "outputs.max_logged_columns_per_rule"]),
+        Stage("materialize", materialize_data,
+              inputs=["data", "decision_plan", "rules", "stats"], outputs=["frame", "frame_stats"],
+              rule_keys=["profiling", "sampling"], checkpoint=False),
+        Stage("clean", clean_stage,
+              inputs=["frame", "decision_plan", "frame_stats"], outputs=["cleaning_result"]),
+        Stage("eda", eda_stage,
+              inputs=["cleaning_result", "decision_plan", "frame_stats", "rules", "output_dir"], outputs=["eda_result"],
+              rule_keys=["eda", "sampling"], artifacts=lambda outputs: outputs["eda_result"]["plots"]),
+        Stage("model", train_model,
+              inputs=["data", "cleaning_result", "decision_plan", "rules", "frame_stats", "output_dir"], outputs=["model_result"],
+              rule_keys=["model_constraints"], artifacts=model_artifacts),
+        Stage("risk", risk_stage,
+              inputs=["validation_result", "column_profiles", "decision_plan", "cleaning_result", "eda_result", "model_result", "rules"],
+              outputs=["risk_summary"], rule_keys=["risk_flags", "outputs.max_logged_columns_per_rule"]),
+        Stage("report", report_stage,
+              inputs=["validation_result", "decision_plan", "cleaning_result", "eda_result", "model_result", "risk_summary", "output_dir", "tracer"],
+              outputs=["report_path"], artifacts=lambda outputs: [outputs["report_path"]],
+              unkeyed_inputs=["tracer"]) # spans differ every run; a reused report keeps the timings of the run that wrote it
+    ]
+
+def run_pipeline(dataset_path: str, rules_path: str, output_dir: str = "outputs"):
     """
     Runs the full decision-driven operational pipeline.
     Returns path to generated report.
     """
+    return execute_pipeline(dataset_path, rules_path, output_dir)["report_path"]
+
+def execute_pipeline(dataset_path: str, rules_path: str, output_dir: str = "outputs", rules: dict = None,
+                     stages: list = None, skip: list = None, trace: bool = None):
+    """
+    Runs the full decision-driven operational pipeline, writing plots, model and report under output_dir.
+    Already parsed `rules` (e.g. held by a resident service) skip reading rules_path.
+    `stages` limits the run to those stages and what they depend on; `skip` drops stages and everything after them.
+    `trace` overrides execution.tracing.enabled; a traced run writes trace.json and trace.chrome.json under output_dir.
+    Returns every stage result, the report path, per-stage timings and, when checkpoints are enabled, which stages were reused.
+    """
+    # Rules are read first, since they decide whether the run is traced
+    started = time.perf_counter()
+    rules = load_rules(rules_path) if rules is None else rules
+    rules_seconds = time.perf_counter() - started
+
+    trace_rules = rules.get("execution", {}).get("tracing", {})
+    trace = trace_rules.get("enabled", False) if trace is None else trace
+    with tracing(trace, memory=trace_rules.get("memory", False)) as tracer:
+        result = _execute_pipeline(dataset_path, rules, output_dir, stages, skip, tracer, rules_seconds)
+
+    if tracer is not None:
+        result["trace_paths"] = [
+            tracer.to_json(os.path.join(output_dir, "trace.json")),
+            tracer.to_chrome_trace(os.path.join(output_dir, "trace.chrome.json"))
+        ]
+    return result
+
+def _execute_pipeline(dataset_path: str, rules: dict, output_dir: str, stages: list, skip: list, tracer, rules_seconds: float):
+    stage_timings = {}
+    targets = None if stages is None else [name for name in stages if name not in PRE_STAGES]
+    selected = [] if targets == [] else select_stages(pipeline_stages(), targets, skip)
+    selected_names = {stage.name for stage in selected}
 
     # 1. Ingest
-    ingest_result = load_inputs(dataset_path, rules_path)
-    df = ingest_result['data']
-    rules = ingest_result['rules']
+    started = time.perf_counter()
+    with span("ingest", "stage") as ingest_span:
+        df = load_dataset(dataset_path, rules.get("ingest", {}))
+        ingest_span.set(**frame_shape(df))
+    stage_timings["ingest"] = rules_seconds + time.perf_counter() - started
+
+    # Statistics shared by every stage, each computed at most once per run
+    stats = None if isinstance(df, ChunkedDataset) else DatasetStats(df, rules)
 
     # 2. Validate
-    validation_result = validate_dataset(df, rules)
+    started = time.perf_counter()
+    with span("validate", "stage", **frame_shape(df)):
+        validation_result = validate_dataset(df, rules, stats)
+    stage_timings["validate"] = time.perf_counter() - started
     if validation_result['status'] == 'FAIL':
         decision_plan = {
             "columns_to_drop": [],
@@ -42,58 +195,80 @@ def run_pipeline(dataset_path: str, rules_path: str):
             "buisness_risks": []
         }
 
+        if "report" not in selected_names:
+            return {"validation_result": validation_result, "decision_plan": decision_plan, "stage_status": {}, "stage_timings": stage_timings}
+
+        from outputs.report_generator import generate_report
         report_path = generate_report(
             validation_result = validation_result,
             decision_plan = decision_plan,
             cleaning_result = {"cleaning_log" : []},
             eda_result={"eda_metrics": {}, "plots": [], "eda_log": []},
             model_result={"model_used": None, "metrics": {}, "model_log": []},
-            risk_summary=risk_summary
+            risk_summary=risk_summary,
+            output_path=os.path.join(output_dir, "report.pdf"),
+            timings=tracer.summary() if tracer is not None else None
         )
 
-        return report_path
+        return {
+            "validation_result": validation_result,
+            "decision_plan": decision_plan,
+            "risk_summary": risk_summary,
+            "report_path": report_path,
+            "stage_status": {},
+            "stage_timings": stage_timings
+        }
     
-    # Profile
-    column_profiles = profile_columns(df)
-
-    # Decision Plan
-    decision_plan = generate_decision_plan(validation_result, column_profiles, rules)
-
-    # Clean 
-    cleaning_result = execute_cleaning(df, decision_plan)
-
-    # EDA
-    eda_result = execute_eda(cleaning_result['cleaned_data'], decision_plan)
-
-    # Model
-    model_result = execute_model(cleaning_result["cleaned_data"], decision_plan, rules)
-
-    # Risk Aggregation
-    risk_summary = aggregate_risk(
-        validation_result=validation_result,
-        column_profiles=column_profiles,
-        decision_plan=decision_plan,
-        cleaning_log=cleaning_result["cleaning_log"],
-        eda_result=eda_result,
-        model_result=model_result,
-        rules=rules
-        )
+    # Stage checkpoints: the dataset is identified by its file fingerprint and the ingest rules that shaped it
+    execution_rules = rules.get("execution", {})
+    checkpoint_rules = execution_rules.get("checkpoints", {})
+    checkpoints = None
+    fingerprints = None
+    if checkpoint_rules.get("enabled", False):
+        checkpoints = StageCheckpoints(checkpoint_rules.get("directory", "outputs/cache/stages"), checkpoint_rules.get("max_per_stage", 5))
+        data_fingerprint = stage_key("ingest", {"file": file_fingerprint(dataset_path)}, rules_subset(rules, ["ingest"]))
+        fingerprints = {"data": data_fingerprint, "stats": data_fingerprint}
     
-    # Report 
-    report_path = generate_report(
-        validation_result=validation_result,
-        decision_plan=decision_plan,
-        cleaning_result=cleaning_result,
-        eda_result=eda_result,
-        model_result=model_result,
-        risk_summary=risk_summary
+    # Profile -> Decision Plan -> Clean -> (EDA || Model) -> Risk Aggregation -> Report
+    context = run_stages(
+        selected,
+        context={"data": df, "rules": rules, "stats": stats, "validation_result": validation_result, "output_dir": output_dir, "tracer": tracer},
+        workers=execution_rules.get("stage_workers", 1),
+        checkpoints=checkpoints,
+        fingerprints=fingerprints,
+        timings=stage_timings
     )
+    context["stage_status"] = checkpoints.status if checkpoints is not None else {}
+    context["stage_timings"] = stage_timings
+
+    return context
 
-    return report_path
+def stage_list(value: str):
+    return [name.strip() for name in value.split(",") if name.strip()]
 
 if __name__ == "__main__":
     DATASET_PATH = "data/amazon_dataset.csv"
     RULES_PATH = "core/rules.yaml"
+    STAGE_NAMES = PRE_STAGES + [stage.name for stage in pipeline_stages()]
+
+    parser = argparse.ArgumentParser(description="Runs the full decision-driven operational pipeline.")
+    parser.add_argument("dataset", nargs="?", default=DATASET_PATH, help="CSV or Excel file")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--output-dir", default="outputs")
+    parser.add_argument("--stages", type=stage_list, default=None, help=f"comma-separated stages to run, plus what they need ({', '.join(STAGE_NAMES)})")
+    parser.add_argument("--skip", type=stage_list, default=None, help="comma-separated stages to leave out, with every stage that needs them")
+    parser.add_argument("--trace", action="store_true", default=None, help="trace stage and hot-loop timings (overrides execution.tracing.enabled)")
+    args = parser.parse_args()
+    unknown = [name for name in (args.stages or []) + (args.skip or []) if name not in STAGE_NAMES]
+    if unknown:
+        parser.error(f"unknown stages {unknown}; choose from {', '.join(STAGE_NAMES)}")
 
-    report = run_pipeline(DATASET_PATH, RULES_PATH)
-    print(f"Report generated at: {report}")
+    result = execute_pipeline(args.dataset, args.rules, args.output_dir, stages=args.stages, skip=args.skip, trace=args.trace)
+    print(f"Validation: {result['validation_result']['status']}")
+    for stage, seconds in result["stage_timings"].items():
+        status = result["stage_status"].get(stage)
+        print(f"Stage {stage}: {seconds:.2f}s" + (f" ({status})" if status else ""))
+    if result.get("report_path"):
+        print(f"Report generated at: {result['report_path']}")
+    for path in result.get("trace_paths", []):
+        print(f"Trace written to: {path}")
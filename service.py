@@ -0,0 +1,194 @@
+"""Runs the pipeline as a resident local HTTP service with warm worker processes and a bounded job queue."""
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from batch import warm_worker
+from pipeline.ingest import load_rules
+from profiling.parallel import process_context, resolve_workers
+
+_rules_cache = {} # per worker process: rules path -> (modification time, parsed rules)
+
+def cached_rules(rules_path: str):
+    """Parsed rules, re-read only when the file changes"""
+    mtime = os.path.getmtime(rules_path)
+    cached = _rules_cache.get(rules_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_rules(rules_path))
+        _rules_cache[rules_path] = cached
+    return cached[1]
+
+def run_service_job(dataset_path: str, rules_path: str, output_dir: str):
+    """Run one job in a warm worker and return its JSON-safe structured result"""
+    from run import execute_pipeline
+
+    result = execute_pipeline(dataset_path, rules_path, output_dir=output_dir, rules=cached_rules(rules_path))
+    model_result = result.get("model_result", {})
+    summary = {
+        "validation_status": result["validation_result"]["status"],
+        "report_path": result["report_path"],
+        "decision_log": result["decision_plan"].get("decision_log", []),
+        "model_used": model_result.get("model_used"),
+        "metrics": model_result.get("metrics", {}),
+        "model_artifact": model_result.get("model_artifact"),
+        "plots": result.get("eda_result", {}).get("plots", []),
+        "risk_summary": result["risk_summary"],
+        "stage_status": result["stage_status"],
+        "stage_timings": {stage: round(seconds, 3) for stage, seconds in result["stage_timings"].items()}
+    }
+    return json.loads(json.dumps(summary, default=str))
+
+class PipelineService:
+    """Job table plus a pool of warm worker processes; at most `max_queued` jobs wait behind the running ones."""
+
+    def __init__(self, workers: int = 0, max_queued: int = 32, output_root: str = "outputs/service", default_rules: str = "core/rules.yaml"):
+        self.workers = resolve_workers(workers)
+        self.max_queued = max_queued
+        self.output_root = output_root
+        self.default_rules = default_rules
+        self.jobs = {}
+        self.lock = threading.Lock()
+        # Never forked: the HTTP server's handler threads would be running while workers start
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=process_context(), initializer=warm_worker)
+
+    def warm_up(self):
+        """Start every worker (and so run its imports) now rather than on the first jobs"""
+        for future in [self.pool.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    def active_jobs(self):
+        return sum(1 for job in self.jobs.values() if job["status"] in ("queued", "running"))
+
+    def running_jobs(self):
+        return sum(1 for job in self.jobs.values() if job["status"] == "running")
+
+    def submit(self, dataset_path: str, rules_path: str = None):
+        """Queue a job and return its record, or None when the queue is full"""
+        with self.lock:
+            if self.active_jobs() >= self.workers + self.max_queued:
+                return None
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                "job_id": job_id,
+                "status": "queued",
+                "dataset": dataset_path,
+                "rules": rules_path or self.default_rules,
+                "output_dir": os.path.join(self.output_root, job_id),
+                "submitted_at": time.time(),
+                "finished_at": None,
+                "result": None,
+                "error": None
+            }
+            self.jobs[job_id] = job
+
+        future = self.pool.submit(run_service_job, job["dataset"], job["rules"], job["output_dir"])
+        # The pool gives no start callback; a job counts as running once a worker slot is free for it
+        with self.lock:
+            if job["status"] == "queued" and self.running_jobs() < self.workers:
+                job["status"] = "running"
+        future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+        return dict(job)
+
+    def _finish(self, job_id: str, future):
+        with self.lock:
+            job = self.jobs[job_id]
+            job["finished_at"] = time.time()
+            try:
+                job["result"] = future.result()
+                job["status"] = "done"
+            except Exception as exc:
+                job["status"] = "failed"
+                job["error"] = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+
+            # Promote the oldest queued job into the freed slot
+            queued = [j for j in self.jobs.values() if j["status"] == "queued"]
+            if queued:
+                min(queued, key=lambda j: j["submitted_at"])["status"] = "running"
+
+    def get(self, job_id: str):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list(self):
+        with self.lock:
+            return [{"job_id": j["job_id"], "status": j["status"], "dataset": j["dataset"]} for j in self.jobs.values()]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+def make_handler(service: PipelineService):
+    """Request handler bound to a service instance"""
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                return self._send(200, {"status": "ok", "workers": service.workers, "active_jobs": service.active_jobs()})
+            if self.path == "/jobs":
+                return self._send(200, {"jobs": service.list()})
+            if self.path.startswith("/jobs/"):
+                job = service.get(self.path[len("/jobs/"):])
+                if job is None:
+                    return self._send(404, {"error": "Unknown job"})
+                return self._send(200, job)
+            self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/jobs":
+                return self._send(404, {"error": "Not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                dataset_path = request["dataset"]
+            except (ValueError, KeyError, TypeError):
+                return self._send(400, {"error": "Body must be JSON with a 'dataset' path and an optional 'rules' path"})
+
+            job = service.submit(dataset_path, request.get("rules"))
+            if job is None:
+                return self._send(503, {"error": "Job queue is full; retry later"})
+            self._send(202, job)
+
+        def log_message(self, format, *args):
+            pass # keep the service's stdout for its own status lines
+
+    return Handler
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 0, max_queued: int = 32, output_root: str = "outputs/service"):
+    """Start the service and block until interrupted"""
+    service = PipelineService(workers=workers, max_queued=max_queued, output_root=output_root)
+    service.warm_up()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Pipeline service listening on http://{host}:{server.server_address[1]} with {service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (local only by default)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=0, help="jobs run concurrently (0 = one per CPU core)")
+    parser.add_argument("--max-queued", type=int, default=32, help="jobs allowed to wait; more are rejected with 503")
+    parser.add_argument("--output-root", default="outputs/service", help="each job writes to <output-root>/<job_id>/")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.max_queued, args.output_root)
@@ -0,0 +1,35 @@
+"""Shared fixtures: a small synthetic dataset (benchmarks.synthetic), written to CSV, and the default rules."""
+import copy
+import os
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic import make_dataset
+from pipeline.ingest import load_rules
+
+ROWS = 2000
+
+@pytest.fixture(scope="session")
+def repo_root():
+    return REPO_ROOT
+
+@pytest.fixture(scope="session")
+def default_rules():
+    return load_rules(os.path.join(REPO_ROOT, "core", "rules.yaml"))
+
+@pytest.fixture
+def rules(default_rules):
+    return copy.deepcopy(default_rules) # tests edit their own copy
+
+@pytest.fixture(scope="session")
+def synthetic_frame():
+    return make_dataset(ROWS, numeric=5, categorical=2, seed=0)
+
+@pytest.fixture
+def synthetic_csv(tmp_path, synthetic_frame):
+    path = tmp_path / "synthetic.csv"
+    synthetic_frame.to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+import pytest
+from batch import load_manifest, run_batch, run_job
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+
+@pytest.fixture
+def manifest(tmp_path, repo_root):
+    """Two jobs sharing a name: a small valid dataset, and a file that cannot be parsed"""
+    make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(tmp_path / "small.csv", index=False)
+    (tmp_path / "broken.xls").write_text("not a workbook")
+    rules = os.path.join(repo_root, "core", "rules.yaml")
+
+    path = tmp_path / "manifest.csv"
+    pd.DataFrame([
+        {"dataset": "small.csv", "rules": rules, "name": "run"},
+        {"dataset": "broken.xls", "rules": rules, "name": "run"}
+    ]).to_csv(path, index=False)
+    return str(path)
+
+def test_manifest_paths_and_names_are_resolved(tmp_path, manifest):
+    jobs = load_manifest(manifest)
+    assert [job["name"] for job in jobs] == ["run", "run_1"]
+    assert jobs[0]["dataset"] == str(tmp_path / "small.csv")
+
+def test_failing_job_is_isolated(tmp_path, manifest):
+    good, bad = load_manifest(manifest)
+    output_root = str(tmp_path / "batch")
+
+    row = run_job(bad, output_root)
+    assert row["status"] == "ERROR" and row["error"]
+    assert os.path.exists(os.path.join(output_root, "run_1", "error.txt"))
+    assert run_job(good, output_root)["status"] == "PASS"
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_summary_has_one_row_per_job(tmp_path, manifest, workers):
+    output_root = str(tmp_path / f"batch_{workers}")
+    summary, summary_path = run_batch(manifest, output_root, workers=workers)
+
+    assert summary["name"].tolist() == ["run", "run_1"] # manifest order
+    assert summary["status"].tolist() == ["PASS", "ERROR"]
+    assert summary.loc[0, "report_path"].startswith(os.path.join(output_root, "run"))
+    assert os.path.exists(summary.loc[0, "report_path"])
+    assert summary.loc[0, "profile_s"] >= 0 and pd.isna(summary.loc[1, "profile_s"])
+
+    written = pd.read_csv(summary_path)
+    assert written.columns.tolist() == summary.columns.tolist()
+    assert written["status"].tolist() == ["PASS", "ERROR"]
@@ -0,0 +1,77 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+import pipeline.cache
+from pipeline.cache import IngestCache, INDEX_FILE, file_fingerprint
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+from pipeline.ingest import load_dataset
+from run import execute_pipeline
+
+pytest.importorskip("pyarrow")
+
+def test_round_trip_matches_the_parsed_frame(tmp_path, synthetic_csv):
+    cache = IngestCache(str(tmp_path / "cache"))
+    data = pd.read_csv(synthetic_csv)
+
+    assert cache.get(synthetic_csv) is None
+    cache.put(synthetic_csv, data)
+    pd.testing.assert_frame_equal(cache.get(synthetic_csv), data)
+
+def test_changed_file_misses(tmp_path, synthetic_csv, synthetic_frame):
+    cache = IngestCache(str(tmp_path / "cache"))
+    cache.put(synthetic_csv, pd.read_csv(synthetic_csv))
+
+    synthetic_frame.head(10).to_csv(synthetic_csv, index=False)
+    assert cache.get(synthetic_csv) is None
+
+def test_fingerprint_hashes_each_file_version_once(tmp_path, synthetic_csv, synthetic_frame, monkeypatch):
+    hashed = []
+    content_hash = pipeline.cache._content_hash
+    monkeypatch.setattr(pipeline.cache, "_content_hash", lambda path: hashed.append(path) or content_hash(path))
+    pipeline.cache._memoized_content_hash.cache_clear()
+
+    first = file_fingerprint(synthetic_csv)
+    assert file_fingerprint(synthetic_csv) == first
+    assert len(hashed) == 1
+
+    synthetic_frame.head(10).to_csv(synthetic_csv, index=False)
+    assert file_fingerprint(synthetic_csv) != first
+    assert len(hashed) == 2
+
+def test_pipeline_hashes_the_input_once_for_cache_and_checkpoints(tmp_path, repo_root, rules, monkeypatch):
+    dataset_path = str(tmp_path / "small.csv")
+    make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(dataset_path, index=False)
+    rules["ingest"]["cache"] = {"enabled": True, "directory": str(tmp_path / "cache")}
+    rules["execution"]["checkpoints"].update(enabled=True, directory=str(tmp_path / "stages"))
+
+    hashed = []
+    content_hash = pipeline.cache._content_hash
+    monkeypatch.setattr(pipeline.cache, "_content_hash", lambda path: hashed.append(path) or content_hash(path))
+    pipeline.cache._memoized_content_hash.cache_clear()
+
+    execute_pipeline(dataset_path, f"{repo_root}/core/rules.yaml", str(tmp_path / "out"), rules=rules, stages=["decision_plan"])
+    assert hashed == [dataset_path]
+
+def test_cached_load_matches_uncached_load(tmp_path, synthetic_csv, rules):
+    ingest_rules = rules["ingest"]
+    expected = load_dataset(synthetic_csv, ingest_rules)
+
+    ingest_rules["cache"] = {"enabled": True, "directory": str(tmp_path / "cache")}
+    pd.testing.assert_frame_equal(load_dataset(synthetic_csv, ingest_rules), expected) # miss, then stored
+    pd.testing.assert_frame_equal(load_dataset(synthetic_csv, ingest_rules), expected) # hit
+
+def test_concurrent_puts_keep_every_entry(tmp_path, synthetic_frame):
+    cache_dir = str(tmp_path / "cache")
+    data = synthetic_frame.head(50)
+    keys = [f"key{i}" for i in range(24)]
+
+    def put(key):
+        IngestCache(cache_dir).put(key, data, key)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(put, keys))
+
+    with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+        assert sorted(json.load(f)) == sorted(keys)
@@ -0,0 +1,85 @@
+import os
+from pipeline.checkpoint import StageCheckpoints
+from pipeline.scheduler import Stage, run_stages
+from profiling.column_profiler import profile_columns
+
+calls = []
+
+def profile(data, rules):
+    calls.append("profile")
+    return profile_columns(data, rules)
+
+def flag_missing(profiles, rules):
+    calls.append("flag")
+    limit = rules["risk_flags"]["data_quality"]["high_missing_pct"]
+    return sorted(column for column, p in profiles.items() if p["missing_pct"] > limit)
+
+def write_report(flags, output_path):
+    calls.append("report")
+    with open(output_path, "w") as f:
+        f.write("\n".join(flags))
+    return output_path
+
+def stages():
+    return [
+        Stage("profile", profile, ["data", "rules"], ["profiles"], rule_keys=["profiling", "sampling"]),
+        Stage("flag", flag_missing, ["profiles", "rules"], ["flags"], rule_keys=["risk_flags"]),
+        Stage("report", write_report, ["flags", "output_path"], ["report"], artifacts=lambda outputs: [outputs["report"]])
+    ]
+
+def run(tmp_path, data, rules):
+    checkpoints = StageCheckpoints(str(tmp_path / "stages"))
+    context = run_stages(stages(), {"data": data, "rules": rules, "output_path": str(tmp_path / "report.txt")}, checkpoints=checkpoints)
+    return context, checkpoints.status
+
+def test_unchanged_run_reuses_every_stage(tmp_path, synthetic_frame, rules):
+    first, status = run(tmp_path, synthetic_frame, rules)
+    assert set(status.values()) == {"recomputed"}
+
+    os.remove(first["report"])
+    calls.clear()
+    second, status = run(tmp_path, synthetic_frame, rules)
+    assert set(status.values()) == {"reused"} and calls == []
+    assert second["profiles"] == first["profiles"] and second["flags"] == first["flags"]
+    assert os.path.exists(second["report"]) # stored artifact restored
+
+def test_rule_change_recomputes_only_the_stages_reading_it(tmp_path, synthetic_frame, rules):
+    run(tmp_path, synthetic_frame, rules)
+
+    rules["risk_flags"]["data_quality"]["high_missing_pct"] = 1
+    calls.clear()
+    context, status = run(tmp_path, synthetic_frame, rules)
+    assert status == {"profile": "reused", "flag": "recomputed", "report": "recomputed"}
+    assert calls == ["flag", "report"]
+
+    # Same result as a run without checkpoints
+    expected = run_stages(stages(), {"data": synthetic_frame, "rules": rules, "output_path": str(tmp_path / "fresh.txt")})
+    assert context["flags"] == expected["flags"]
+
+def test_rules_outside_every_rule_key_reuse_everything(tmp_path, synthetic_frame, rules):
+    run(tmp_path, synthetic_frame, rules)
+
+    rules["outputs"]["generate_pdf_report"] = False
+    calls.clear()
+    _, status = run(tmp_path, synthetic_frame, rules)
+    assert set(status.values()) == {"reused"} and calls == []
+
+def test_changed_data_recomputes(tmp_path, synthetic_frame, rules):
+    run(tmp_path, synthetic_frame, rules)
+
+    calls.clear()
+    _, status = run(tmp_path, synthetic_frame.head(100), rules)
+    assert status["profile"] == "recomputed"
+    assert calls[0] == "profile"
+
+def test_unkeyed_inputs_only_key_whether_they_are_set(tmp_path, synthetic_frame):
+    checkpoints = StageCheckpoints(str(tmp_path / "stages"))
+    def traced_stages():
+        return [Stage("shape", lambda data, tracer: data.shape, ["data", "tracer"], ["shape"], unkeyed_inputs=["tracer"])]
+
+    run_stages(traced_stages(), {"data": synthetic_frame, "tracer": object()}, checkpoints=checkpoints)
+    run_stages(traced_stages(), {"data": synthetic_frame, "tracer": object()}, checkpoints=checkpoints)
+    assert checkpoints.status["shape"] == "reused"
+
+    run_stages(traced_stages(), {"data": synthetic_frame, "tracer": None}, checkpoints=checkpoints)
+    assert checkpoints.status["shape"] == "recomputed"
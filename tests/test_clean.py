@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+from pipeline.clean import execute_cleaning
+from profiling.dataset_stats import DatasetStats
+
+PLAN = {
+    "columns_to_drop": ["record_id", "constant", "sparse_metric"],
+    "imputation_plan": {"num_0": "median", "num_1": "mean", "cat_0": "mode", "sparse_metric": "median"}
+}
+
+def reference_cleaning(df: pd.DataFrame, decision_plan: dict):
+    """Cleaning as it was done before the copy-free engine: copy the frame, drop and fill column by column"""
+    cleaned_df = df.copy()
+    cleaning_log = []
+    for column in decision_plan.get("columns_to_drop", []):
+        if column in cleaned_df.columns:
+            cleaned_df.drop(columns=[column], inplace=True)
+            cleaning_log.append(f"Dropped column '{column}' as per decision plan.")
+
+    for column, strategy in decision_plan.get("imputation_plan", {}).items():
+        if column not in cleaned_df.columns:
+            continue
+        if strategy == "median":
+            value = cleaned_df[column].median()
+            cleaning_log.append(f"Imputed missing values in column '{column}' with median value {value}.")
+        elif strategy == "mean":
+            value = cleaned_df[column].mean()
+            cleaning_log.append(f"Imputed missing values in column '{column}' with mean value {value}.")
+        elif strategy == "mode":
+            value = cleaned_df[column].mode()[0]
+            cleaning_log.append(f"Imputed missing values in column '{column}' with mode value {value}.")
+        cleaned_df[column] = cleaned_df[column].fillna(value)
+    return cleaned_df, cleaning_log
+
+@pytest.mark.parametrize("with_stats", [False, True])
+def test_cleaning_matches_the_copying_implementation(synthetic_frame, rules, with_stats):
+    original = synthetic_frame.copy(deep=True)
+    stats = DatasetStats(synthetic_frame, rules) if with_stats else None
+    expected, expected_log = reference_cleaning(synthetic_frame, PLAN)
+
+    result = execute_cleaning(synthetic_frame, PLAN, stats)
+    pd.testing.assert_frame_equal(result["cleaned_data"], expected)
+    assert result["cleaning_log"] == expected_log
+    assert [event["column"] for event in result["cleaning_events"]] == ["record_id", "constant", "sparse_metric", "num_0", "num_1", "cat_0"]
+    assert result["imputation_values"].keys() == {"num_0", "num_1", "cat_0"}
+    pd.testing.assert_frame_equal(synthetic_frame, original) # input untouched
+
+def test_writes_to_the_cleaned_frame_leave_the_input_unchanged(synthetic_frame):
+    original = synthetic_frame.copy(deep=True)
+    cleaned = execute_cleaning(synthetic_frame, PLAN)["cleaned_data"]
+
+    cleaned.loc[0, "num_2"] = -1.0 # a column shared with the input, not imputed
+    cleaned.loc[0, "num_0"] = -1.0
+    pd.testing.assert_frame_equal(synthetic_frame, original)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from pipeline.correlation import correlated_pairs
+
+def reference_pairs(df, columns, threshold):
+    corr = df[columns].corr()
+    return {
+        (a, b): corr.loc[a, b]
+        for i, a in enumerate(columns) for b in columns[i + 1:]
+        if abs(corr.loc[a, b]) >= threshold
+    }
+
+@pytest.mark.parametrize("block_size", [1, 3, 512])
+def test_blocked_pairs_match_dataframe_corr(synthetic_frame, block_size):
+    df = synthetic_frame.copy()
+    df["num_0_echo"] = df["num_0"] * 2 + 1 # strongly correlated pair
+    columns = list(df.select_dtypes("number").columns)
+    expected = reference_pairs(df, columns, 0.0)
+
+    pairs = correlated_pairs(df, columns, threshold=0.0, top_k=len(expected), block_size=block_size)
+    assert {(p["column_1"], p["column_2"]) for p in pairs} == {k for k, v in expected.items() if not np.isnan(v)}
+    for pair in pairs:
+        assert pair["correlation"] == pytest.approx(expected[pair["column_1"], pair["column_2"]], abs=1e-3)
+
+def test_threshold_and_top_k_keep_the_strongest_pairs(synthetic_frame):
+    df = synthetic_frame.copy()
+    df["num_0_echo"] = df["num_0"] * 2 + 1
+    df["num_1_echo"] = -df["num_1"]
+    columns = list(df.select_dtypes("number").columns)
+
+    pairs = correlated_pairs(df, columns, threshold=0.5, top_k=1, block_size=2)
+    assert len(pairs) == 1
+    assert abs(pairs[0]["correlation"]) == pytest.approx(1.0, abs=1e-3)
+    assert {(p["column_1"], p["column_2"]) for p in correlated_pairs(df, columns, threshold=0.5, block_size=2)} == set(reference_pairs(df, columns, 0.5))
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+from pipeline.dtype_optimizer import optimize_dtypes
+from profiling.column_profiler import profile_columns
+
+@pytest.fixture
+def parsed(synthetic_csv):
+    data = pd.read_csv(synthetic_csv)
+    data["float_ints"] = data["record_id"] / 2 # exactly representable in float32
+    return data
+
+def test_optimized_frame_keeps_every_value(parsed):
+    optimized = optimize_dtypes(parsed, {"downcast_integers": True, "downcast_floats": True, "category_max_unique_ratio": 0.5})
+
+    assert optimized["record_id"].dtype.itemsize < parsed["record_id"].dtype.itemsize
+    assert optimized["float_ints"].dtype == "float32"
+    assert optimized["num_0"].dtype == "float64" # does not survive the float32 round trip
+    assert isinstance(optimized["cat_0"].dtype, pd.CategoricalDtype)
+    for column in parsed.columns:
+        pd.testing.assert_series_equal(optimized[column].astype(parsed[column].dtype), parsed[column])
+
+    footprint = optimized.attrs["memory_footprint"]
+    assert footprint["memory_after_mb"] < footprint["memory_before_mb"]
+
+def test_optimized_frame_profiles_like_the_parsed_one(parsed, rules):
+    optimized = optimize_dtypes(parsed, rules["ingest"]["optimize_dtypes"])
+    assert profile_columns(optimized, rules) == profile_columns(parsed, rules)
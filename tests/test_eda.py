@@ -0,0 +1,31 @@
+import os
+import pytest
+from pipeline.eda import execute_eda
+
+pytest.importorskip("matplotlib")
+
+@pytest.fixture
+def eda_frame(synthetic_frame):
+    return synthetic_frame[["cat_0", "cat_1", "num_0", "num_1", "num_2"]].head(300)
+
+def run_eda(df, rules, output_dir):
+    return execute_eda(df, {"eda_allowed": True}, str(output_dir), rules=rules)
+
+def test_parallel_rendering_writes_the_serial_plots(tmp_path, eda_frame, rules):
+    rules["eda"]["max_pairwise_plots"] = 2
+    serial = run_eda(eda_frame, rules, tmp_path / "serial")
+    rules["eda"]["plot_workers"] = 2
+    parallel = run_eda(eda_frame, rules, tmp_path / "parallel")
+
+    assert [os.path.basename(p) for p in parallel["plots"]] == [os.path.basename(p) for p in serial["plots"]]
+    assert all(os.path.getsize(path) > 0 for path in parallel["plots"])
+    assert parallel["eda_metrics"] == serial["eda_metrics"]
+
+def test_group_means_match_per_pair_groupby(tmp_path, eda_frame, rules):
+    rules["eda"]["max_pairwise_plots"] = 0
+    metrics = run_eda(eda_frame, rules, tmp_path)["eda_metrics"]
+
+    for cat_col in ["cat_0", "cat_1"]:
+        for num_col in ["num_0", "num_1", "num_2"]:
+            expected = eda_frame.groupby(cat_col)[num_col].mean().round(2).to_dict()
+            assert metrics[f"{cat_col}_vs_{num_col}_mean"] == expected
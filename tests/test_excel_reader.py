@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from pipeline.excel_reader import read_sheet, read_sheets
+from pipeline.ingest import IngestError, column_filter, load_dataset
+
+pytest.importorskip("openpyxl")
+
+SHEETS = ["first", "second", "third"]
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory, synthetic_frame):
+    path = str(tmp_path_factory.mktemp("excel") / "book.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        for i, sheet in enumerate(SHEETS):
+            synthetic_frame.iloc[i * 200:(i + 1) * 200 + 50].to_excel(writer, sheet_name=sheet, index=False)
+    return path
+
+@pytest.mark.parametrize("chunk_rows", [50_000, 70])
+def test_sheet_matches_read_excel(workbook, chunk_rows):
+    for sheet in SHEETS:
+        pd.testing.assert_frame_equal(read_sheet(workbook, sheet, chunk_rows=chunk_rows), pd.read_excel(workbook, sheet_name=sheet))
+
+def test_parallel_sheets_match_serial(workbook):
+    serial = read_sheets(workbook, SHEETS, workers=1, chunk_rows=70)
+    parallel = read_sheets(workbook, SHEETS, workers=2, chunk_rows=70)
+    for expected, actual in zip(serial, parallel):
+        pd.testing.assert_frame_equal(actual, expected)
+
+def test_column_selection_matches_read_excel(workbook):
+    usecols = column_filter({"columns": ["num_0", "cat_1", "record_id"], "exclude_columns": ["record_id"]})
+    pd.testing.assert_frame_equal(read_sheet(workbook, "second", usecols), pd.read_excel(workbook, sheet_name="second", usecols=usecols))
+
+def test_blank_rows_inside_the_data_are_kept(tmp_path):
+    """Interior blank rows become rows of missing values, as in pd.read_excel; the leading one is skipped (the header is the first non-blank row)"""
+    import openpyxl
+    path = str(tmp_path / "gaps.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in [[], ["a", "b", "c"], [1, "x", 2.5], [], [None, None, None], [3, "y"], []]:
+        sheet.append(row)
+    workbook.save(path)
+
+    pd.testing.assert_frame_equal(read_sheet(path, chunk_rows=1), pd.read_excel(path, skiprows=1))
+
+def test_stacked_sheets_load_through_the_feather_copy(tmp_path, workbook, rules):
+    ingest_rules = rules["ingest"]
+    ingest_rules["optimize_dtypes"]["enabled"] = False
+    ingest_rules["cache"]["directory"] = str(tmp_path / "cache")
+    ingest_rules["excel"].update(sheets="all", sheet_column="sheet", chunk_rows=70)
+
+    expected = pd.concat(
+        [pd.read_excel(workbook, sheet_name=sheet).assign(sheet=sheet) for sheet in SHEETS], ignore_index=True
+    )
+    pd.testing.assert_frame_equal(load_dataset(workbook, ingest_rules), expected) # parsed and converted
+    assert len(list((tmp_path / "cache").glob("*.feather"))) == 1
+    pd.testing.assert_frame_equal(load_dataset(workbook, ingest_rules), expected, check_dtype=False) # from the Feather copy
+
+def test_unknown_sheets_are_rejected(workbook, rules):
+    rules["ingest"]["excel"]["sheets"] = ["first", "missing"]
+    with pytest.raises(IngestError, match="missing"):
+        load_dataset(workbook, rules["ingest"])
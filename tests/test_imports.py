@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+from benchmarks.bench_import import measure_import, warm_worker_missing
+
+# Runs a dataset too small for EDA and modeling, then reports which stage libraries the run loaded
+SKIPPED_STAGES_PROBE = """
+import json, sys
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+from run import execute_pipeline
+make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(sys.argv[1], index=False)
+result = execute_pipeline(sys.argv[1], "core/rules.yaml", sys.argv[2])
+print(json.dumps({
+    "eda_allowed": result["decision_plan"]["eda_allowed"],
+    "modeling_allowed": result["decision_plan"]["modeling"]["modeling_allowed"],
+    "eda_log": result["eda_result"]["eda_log"],
+    "model_log": result["model_result"]["model_log"],
+    "loaded": [m for m in ("sklearn", "matplotlib") if m in sys.modules]
+}))
+"""
+
+def test_importing_run_defers_the_stage_libraries(repo_root, monkeypatch):
+    monkeypatch.chdir(repo_root) # the probes import `run` from the working directory
+    assert measure_import()["loaded"] == []
+
+def test_warmed_worker_has_the_stage_libraries(repo_root, monkeypatch):
+    monkeypatch.chdir(repo_root)
+    assert warm_worker_missing() == []
+
+def test_disabled_stages_do_not_import_their_libraries(tmp_path, repo_root):
+    completed = subprocess.run(
+        [sys.executable, "-c", SKIPPED_STAGES_PROBE, str(tmp_path / "small.csv"), str(tmp_path / "outputs")],
+        cwd=repo_root, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert not result["eda_allowed"] and not result["modeling_allowed"]
+    assert result["eda_log"] == ["EDA skipped as per decision plan."]
+    assert result["model_log"][0].startswith("Modeling skipped:")
+    assert result["loaded"] == []
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from pipeline.ingest import ChunkedDataset, IngestError, load_dataset
+from profiling.column_profiler import profile_columns
+
+def test_chunks_cover_the_file_in_order(synthetic_csv):
+    dataset = ChunkedDataset(synthetic_csv, chunk_rows=300)
+    chunks = list(dataset.iter_chunks())
+
+    assert max(len(chunk) for chunk in chunks) <= 300
+    pd.testing.assert_frame_equal(pd.concat(chunks), pd.read_csv(synthetic_csv))
+    assert dataset.rows == len(pd.read_csv(synthetic_csv))
+
+def test_materialize_matches_read_csv(synthetic_csv):
+    dataset = ChunkedDataset(synthetic_csv, chunk_rows=300)
+    expected = pd.read_csv(synthetic_csv)
+
+    pd.testing.assert_frame_equal(dataset.materialize(), expected)
+    pd.testing.assert_frame_equal(dataset.materialize(["num_1", "cat_0"]), expected[["num_1", "cat_0"]])
+
+def test_column_batches_hold_every_column_once(synthetic_csv):
+    # A tiny budget forces one column per batch
+    dataset = ChunkedDataset(synthetic_csv, memory_budget_mb=0.05, chunk_rows=300)
+    expected = pd.read_csv(synthetic_csv)
+
+    batches = list(dataset.iter_column_batches())
+    assert len(batches) > 1
+    pd.testing.assert_frame_equal(pd.concat(batches, axis=1), expected)
+
+def test_materialize_enforces_the_memory_budget(synthetic_csv):
+    dataset = ChunkedDataset(synthetic_csv, memory_budget_mb=0.01)
+    with pytest.raises(IngestError):
+        dataset.materialize()
+
+def test_streaming_load_returns_a_chunked_dataset(synthetic_csv):
+    assert isinstance(load_dataset(synthetic_csv, {"streaming": True}), ChunkedDataset)
+
+def test_streamed_profile_matches_in_memory_profile(synthetic_csv, rules):
+    dataset = ChunkedDataset(synthetic_csv, memory_budget_mb=0.05, chunk_rows=300)
+    assert profile_columns(dataset, rules) == profile_columns(pd.read_csv(synthetic_csv), rules)
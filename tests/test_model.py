@@ -0,0 +1,86 @@
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import root_mean_squared_error
+from pipeline.ingest import ChunkedDataset
+from pipeline.model import execute_model, holdout_mask, train_linear_out_of_core
+from pipeline.model_search import search_models
+
+FEATURES = ["num_0", "num_1", "num_2", "num_3", "patchy_metric"]
+TARGET = "num_4"
+
+def in_memory_fit(df: pd.DataFrame, fill_values: dict):
+    """The same hash split and imputation, fitted by sklearn on the whole frame"""
+    df = df.fillna(fill_values)
+    X = df[FEATURES].fillna(0).to_numpy(dtype=np.float64)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    is_test = holdout_mask(df.index.to_numpy())
+    model = LinearRegression().fit(X[~is_test], y[~is_test])
+    return model, root_mean_squared_error(y[is_test], model.predict(X[is_test]))
+
+@pytest.mark.parametrize("chunk_rows", [250, 5000])
+def test_out_of_core_fit_matches_sklearn(synthetic_csv, chunk_rows):
+    df = pd.read_csv(synthetic_csv)
+    fill_values = df[FEATURES].median().to_dict()
+    expected, expected_rmse = in_memory_fit(df, fill_values)
+
+    result = train_linear_out_of_core(ChunkedDataset(synthetic_csv, chunk_rows=chunk_rows), FEATURES, TARGET, fill_values)
+    np.testing.assert_allclose(result["model"].coef_, expected.coef_, rtol=1e-6, atol=1e-9)
+    assert result["model"].intercept_ == pytest.approx(expected.intercept_, rel=1e-6)
+    assert result["rmse"] == pytest.approx(expected_rmse, rel=1e-6)
+    assert result["train_rows"] + result["test_rows"] == len(df)
+
+def test_out_of_core_model_predicts_like_sklearn(synthetic_csv):
+    df = pd.read_csv(synthetic_csv)
+    fill_values = df[FEATURES].median().to_dict()
+    expected, _ = in_memory_fit(df, fill_values)
+
+    model = train_linear_out_of_core(ChunkedDataset(synthetic_csv, chunk_rows=250), FEATURES, TARGET, fill_values)["model"]
+    X = df[FEATURES].fillna(fill_values)
+    np.testing.assert_allclose(model.predict(X), expected.predict(X.to_numpy()), rtol=1e-6)
+
+def search_data(df: pd.DataFrame):
+    df = df.head(400).fillna(0)
+    return df[FEATURES].to_numpy(dtype=np.float64), df[TARGET].to_numpy(dtype=np.float64)
+
+def test_parallel_model_search_matches_serial(synthetic_frame):
+    X, y = search_data(synthetic_frame)
+    candidates = {"linear_regression": LinearRegression, "random_forest": RandomForestRegressor}
+
+    serial = search_models(X, y, candidates, folds=3, workers=1)
+    parallel = search_models(X, y, candidates, folds=3, workers=2)
+    for name in candidates:
+        assert parallel[name]["folds"] == serial[name]["folds"] == 3
+        assert parallel[name]["score"] == pytest.approx(serial[name]["score"], rel=1e-12)
+
+class SlowRegressor(LinearRegression):
+    """A candidate whose folds run far past any budget in these tests"""
+    def fit(self, X, y, sample_weight=None):
+        time.sleep(60)
+        return super().fit(X, y, sample_weight)
+
+def test_model_search_stops_at_the_time_budget(synthetic_frame):
+    X, y = search_data(synthetic_frame)
+    results = search_models(X, y, {"random_forest": RandomForestRegressor}, folds=3, workers=2, time_budget_s=1e-3)
+    assert results["random_forest"]["score"] is None
+
+def test_running_folds_are_stopped_at_the_time_budget(synthetic_frame):
+    X, y = search_data(synthetic_frame)
+    started = time.perf_counter()
+    results = search_models(X, y, {"slow": SlowRegressor}, folds=3, workers=2, time_budget_s=1.0)
+    assert results["slow"] == {"score": None, "folds": 0, "seconds": 0.0}
+    assert time.perf_counter() - started < 30 # the sleeping workers were terminated, not joined
+
+@pytest.mark.parametrize("fit_workers", [1, 2])
+def test_final_fit_threads_come_from_fit_workers(tmp_path, synthetic_frame, rules, fit_workers):
+    df = synthetic_frame[FEATURES + [TARGET]]
+    rules["model_constraints"].update(default_model="random_forest", fit_workers=fit_workers)
+    rules["model_constraints"]["model_search"]["workers"] = 4 # search processes must not set the fit's threads
+
+    result = execute_model(df, {"modeling": {"modeling_allowed": True, "target_column": TARGET}}, rules, output_dir=str(tmp_path))
+    assert result["model_used"] == "random_forest"
+    assert joblib.load(result["model_artifact"]).n_jobs == fit_workers
@@ -0,0 +1,56 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pipeline.model import execute_model
+from pipeline.model_registry import ModelRegistry
+
+def modeling_plan(target_column: str):
+    return {"modeling": {"modeling_allowed": True, "target_column": target_column}}
+
+def test_registry_hit_reproduces_the_trained_run(tmp_path, synthetic_frame, rules):
+    df = synthetic_frame.drop(columns=["cat_0", "cat_1", "patchy_category"])
+    rules["model_constraints"]["registry"].update(enabled=True, directory=str(tmp_path / "registry"))
+
+    trained = execute_model(df, modeling_plan("num_4"), rules, output_dir=str(tmp_path / "first"))
+    reused = execute_model(df, modeling_plan("num_4"), rules, output_dir=str(tmp_path / "second"))
+
+    assert any("registry miss" in line for line in trained["model_log"])
+    assert any("registry hit" in line for line in reused["model_log"])
+    assert reused["model_used"] == trained["model_used"]
+    assert reused["metrics"] == trained["metrics"]
+    assert os.path.exists(reused["model_artifact"])
+
+    # Other features are a different training run
+    retrained = execute_model(df.drop(columns=["num_0"]), modeling_plan("num_4"), rules, output_dir=str(tmp_path / "third"))
+    assert any("registry miss" in line for line in retrained["model_log"])
+
+def test_concurrent_puts_keep_every_entry(tmp_path):
+    artifact = tmp_path / "model.joblib"
+    artifact.write_bytes(b"artifact")
+    registry_dir = str(tmp_path / "registry")
+    keys = [f"key{i}" for i in range(24)]
+
+    def put(key):
+        ModelRegistry(registry_dir, max_entries=len(keys)).put(key, str(artifact), {"model_used": key})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(put, keys))
+
+    registry = ModelRegistry(registry_dir, max_entries=len(keys))
+    for key in keys:
+        assert registry.get(key) == {"model_used": key}
+        restored = registry.restore(key, str(tmp_path / "restored" / f"{key}.joblib"))
+        assert open(restored, "rb").read() == b"artifact"
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    artifact = tmp_path / "model.joblib"
+    artifact.write_bytes(b"artifact")
+    registry = ModelRegistry(str(tmp_path / "registry"), max_entries=2)
+
+    registry.put("old", str(artifact), {})
+    registry.put("used", str(artifact), {})
+    registry.get("old")
+    registry.put("new", str(artifact), {})
+
+    assert registry.get("used") is None
+    assert registry.get("old") == {} and registry.get("new") == {}
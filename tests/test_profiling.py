@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.ingest import ChunkedDataset
+from profiling.column_profiler import is_id_like, outlier_percentage, profile_columns
+from profiling.dataset_stats import DatasetStats
+from profiling.numeric_stats import numeric_column_stats
+from profiling.parallel import parallel_numeric_column_stats
+
+def reference_profiles(df: pd.DataFrame):
+    """Column-by-column profile, as the profiler computed it before the frame-level reductions"""
+    profiles = {}
+    for column in df.columns:
+        series = df[column]
+        numeric = pd.api.types.is_numeric_dtype(series)
+        profiles[column] = {
+            "type": "numeric" if numeric else "categorical",
+            "missing_pct": round(series.isnull().mean() * 100, 2),
+            "unique_values": series.nunique(dropna=True),
+            "variance": float(series.var()) if numeric else None,
+            "outlier_pct": outlier_percentage(series) if numeric else None,
+            "is_id_like": is_id_like(column, series, len(df))
+        }
+    return profiles
+
+def assert_profiles_equal(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for column, profile in expected.items():
+        for field, value in profile.items():
+            if field == "variance" and value is not None:
+                assert actual[column][field] == pytest.approx(value, rel=1e-9, nan_ok=True), (column, field)
+            else:
+                assert actual[column][field] == value, (column, field)
+
+def test_vectorized_profile_matches_column_by_column(synthetic_frame, rules):
+    assert_profiles_equal(profile_columns(synthetic_frame, rules), reference_profiles(synthetic_frame))
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_approximate_profile_stays_within_its_error_bounds(synthetic_csv, rules, streamed):
+    exact = reference_profiles(pd.read_csv(synthetic_csv))
+    rules["profiling"]["mode"] = "approximate"
+    data = ChunkedDataset(synthetic_csv, chunk_rows=300) if streamed else pd.read_csv(synthetic_csv)
+
+    approx = profile_columns(data, rules)
+    assert approx.keys() == exact.keys()
+    for column, expected in exact.items():
+        profile = approx[column]
+        bounds = profile["error_bounds"]
+        assert profile["type"] == expected["type"]
+        assert profile["missing_pct"] == expected["missing_pct"]
+        # Four standard errors of the distinct count estimate
+        assert abs(profile["unique_values"] - expected["unique_values"]) <= 4 * bounds["unique_values"] * expected["unique_values"] + 1, column
+        if expected["type"] == "numeric":
+            assert profile["variance"] == pytest.approx(expected["variance"], rel=1e-9, nan_ok=True)
+            assert abs(profile["outlier_pct"] - expected["outlier_pct"]) <= bounds["outlier_pct"], column
+
+def test_parallel_numeric_stats_match_serial(synthetic_frame):
+    numeric = synthetic_frame.select_dtypes("number")
+    serial = numeric_column_stats(numeric.to_numpy(dtype="float64", na_value=np.nan))
+    parallel = parallel_numeric_column_stats(numeric, workers=2)
+
+    assert parallel.keys() == serial.keys()
+    for key in serial:
+        np.testing.assert_array_equal(parallel[key], serial[key])
+
+def test_parallel_profile_matches_serial(synthetic_frame, rules):
+    serial = profile_columns(synthetic_frame, rules)
+    rules["profiling"].update(workers=2, parallel_min_cells=0)
+    assert profile_columns(synthetic_frame, rules) == serial
+
+@pytest.fixture
+def created_segments(monkeypatch):
+    """Names of the shared-memory blocks the parallel profiler creates"""
+    import profiling.parallel
+    names = []
+    original = profiling.parallel.shared_memory.SharedMemory
+
+    def recording(*args, **kwargs):
+        segment = original(*args, **kwargs)
+        if kwargs.get("create"):
+            names.append(segment.name)
+        return segment
+
+    monkeypatch.setattr(profiling.parallel.shared_memory, "SharedMemory", recording)
+    return names
+
+def assert_released(names: list):
+    from multiprocessing import shared_memory
+    assert names
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+def test_shared_stats_match_serial_and_release_shared_memory(synthetic_frame, rules, created_segments):
+    serial = DatasetStats(synthetic_frame, rules)
+    rules["profiling"].update(workers=2, parallel_min_cells=0)
+    parallel = DatasetStats(synthetic_frame, rules)
+
+    for key, values in serial.order_stats.items():
+        pd.testing.assert_series_equal(parallel.order_stats[key], values)
+    assert profile_columns(synthetic_frame, rules, parallel) == profile_columns(synthetic_frame, rules, serial)
+    assert_released(created_segments)
+
+def test_shared_memory_is_released_when_the_pool_fails(synthetic_frame, created_segments, monkeypatch):
+    import profiling.parallel
+
+    class FailingPool:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no processes left")
+
+    monkeypatch.setattr(profiling.parallel, "ProcessPoolExecutor", FailingPool)
+    with pytest.raises(OSError):
+        parallel_numeric_column_stats(synthetic_frame.select_dtypes("number"), workers=2)
+    assert_released(created_segments)
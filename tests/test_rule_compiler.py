@@ -0,0 +1,111 @@
+from core.decision_engine import generate_decision_plan
+from core.rule_compiler import CompiledRules, profile_table
+from risk.risk_aggregator import aggregate_risk
+
+# One column for each column-level branch of the default rules
+PROFILES = {
+    "customer_id": {"type": "numeric", "missing_pct": 0.0, "unique_values": 1000, "variance": 83416.7, "outlier_pct": 0.0, "is_id_like": True},
+    "constant_flag": {"type": "numeric", "missing_pct": 0.0, "unique_values": 1, "variance": 0.0, "outlier_pct": 0.0, "is_id_like": False},
+    "mostly_empty": {"type": "numeric", "missing_pct": 45.0, "unique_values": 550, "variance": 1.2, "outlier_pct": 0.0, "is_id_like": False},
+    "income": {"type": "numeric", "missing_pct": 5.0, "unique_values": 950, "variance": 2.5e8, "outlier_pct": 7.5, "is_id_like": False},
+    "region": {"type": "categorical", "missing_pct": 2.0, "unique_values": 4, "variance": None, "outlier_pct": None, "is_id_like": False},
+    "notes": {"type": "categorical", "missing_pct": 28.0, "unique_values": 40, "variance": None, "outlier_pct": None, "is_id_like": False},
+    "score": {"type": "numeric", "missing_pct": 0.0, "unique_values": 90, "variance": 12.0, "outlier_pct": 3.0, "is_id_like": False},
+    "revenue": {"type": "numeric", "missing_pct": 0.0, "unique_values": 1000, "variance": 4.0e6, "outlier_pct": 1.0, "is_id_like": False}
+}
+VALIDATION = {"status": "PASS", "metrics": {"rows": 1000}, "reasons": []}
+
+# Produced by the column-by-column decision engine and risk aggregator the compiled rules replaced
+EXPECTED_PLAN = {
+    "columns_to_drop": ["customer_id", "constant_flag", "mostly_empty"],
+    "imputation_plan": {"income": "median", "region": "mode"},
+    "eda_allowed": True,
+    "modeling": {"modeling_allowed": True, "modeling_reason": None, "target_column": "revenue", "target_type": "numeric"},
+    "risk_checks": ["data_quality", "modeling_risks", "business_risks"],
+    "sampling": None,
+    "decision_log": [
+        "Column 'customer_id' dropped due to ID-like characterstics.",
+        "Column 'constant_flag' dropped due to being constant.",
+        "Column 'mostly_empty' dropped due to high missing percentage = (45.0%).",
+        "Column 'income' will be imputed using median.",
+        "Column 'region' will be imputed using mode.",
+        "Column 'notes' missing percentage too high (28.0%), imputation skipped.",
+        "Selected 'revenue' as target column for modeling."
+    ]
+}
+EXPECTED_RISKS = {
+    "data_quality_risks": [
+        "Column 'mostly_empty' has high missing percentage: 45.0%",
+        "Column 'income' has high outlier percentage: 7.5%",
+        "Column 'notes' has high missing percentage: 28.0%",
+        "['customer_id', 'constant_flag', 'mostly_empty'] Columns were dropped during cleaning",
+        "3 columns were dropped during cleaning, indicating weak data quality.",
+        "Multiple columns were imputed; results may rely heavily on synthetic values."
+    ],
+    "analysis_risks": [
+        "EDA was allowed but produced no measurable insights.",
+        "EDA did not identify any numeric relationships; signal strength may be weak."
+    ],
+    "modeling_risks": [],
+    "business_risks": [
+        "Extreme values detected in 'income' which may skew business conclusions.",
+        "Extreme values detected in 'score' which may skew business conclusions."
+    ]
+}
+
+def cleaning_events(plan: dict):
+    return (
+        [{"event": "drop_column", "column": column, "at_ingest": False} for column in plan["columns_to_drop"]]
+        + [{"event": "impute", "column": column, "strategy": strategy, "value": 0} for column, strategy in plan["imputation_plan"].items()]
+    )
+
+def risks(plan: dict, rules: dict):
+    return aggregate_risk(VALIDATION, PROFILES, plan, cleaning_events(plan), {"eda_log": [], "metrics": {}}, {"metrics": {"rmse": 3.0}}, rules)
+
+def test_decision_plan_matches_the_frozen_plan(rules):
+    assert generate_decision_plan(VALIDATION, PROFILES, rules) == EXPECTED_PLAN
+
+def test_risk_summary_matches_the_frozen_summary(rules):
+    assert risks(EXPECTED_PLAN, rules) == EXPECTED_RISKS
+
+def test_logs_are_truncated_per_rule(rules):
+    rules["outputs"]["max_logged_columns_per_rule"] = 1
+    plan = generate_decision_plan(VALIDATION, PROFILES, rules)
+
+    assert plan["columns_to_drop"] == EXPECTED_PLAN["columns_to_drop"] # only the log is truncated
+    assert plan["decision_log"] == [
+        "Column 'customer_id' dropped due to ID-like characterstics.",
+        "Column 'constant_flag' dropped due to being constant.",
+        "Column 'mostly_empty' dropped due to high missing percentage = (45.0%).",
+        "Column 'income' will be imputed using median.",
+        "Column 'notes' missing percentage too high (28.0%), imputation skipped.",
+        "1 more columns will be imputed.",
+        "Selected 'revenue' as target column for modeling."
+    ]
+    summary = risks(plan, rules)
+    assert summary["data_quality_risks"][:4] == [
+        "Column 'mostly_empty' has high missing percentage: 45.0%",
+        "Column 'income' has high outlier percentage: 7.5%",
+        "1 more columns have a high missing percentage",
+        "3 Columns were dropped during cleaning"
+    ]
+    assert summary["business_risks"] == [
+        "Extreme values detected in 'income' which may skew business conclusions.",
+        "Extreme values detected in 1 more columns which may skew business conclusions."
+    ]
+
+def test_drop_rules_take_precedence_in_order(rules):
+    profiles = {"sparse_id": dict(PROFILES["customer_id"], missing_pct=50.0, unique_values=1)}
+    actions = CompiledRules(rules).column_actions(profile_table(profiles))
+    assert actions.loc["sparse_id", "action"] == "drop_missing"
+
+    rules["column_cleaning"]["drop_id_like_columns"] = False
+    actions = CompiledRules(rules).column_actions(profile_table(PROFILES))
+    assert actions.loc["customer_id", "action"] == "keep"
+    assert actions["strategy"].dropna().to_dict() == {"income": "median", "region": "mode"}
+
+def test_categorical_columns_never_raise_outlier_flags(rules):
+    rules["risk_flags"]["data_quality"]["high_outlier_pct"] = 0
+    masks = CompiledRules(rules).risk_masks(profile_table(PROFILES))
+    flagged = [column for column, flag in zip(PROFILES, masks["high_outlier"]) if flag]
+    assert flagged == [c for c, p in PROFILES.items() if p["type"] == "numeric"]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import make_dataset
+from pipeline.ingest import ChunkedDataset
+from profiling.column_profiler import outlier_percentage, profile_columns
+from profiling.sampling import correlation_interval, draw_sample, proportion_interval, stratified_positions
+
+SAMPLING = {"enabled": True, "method": "reservoir", "sample_rows": 500, "stratify_by": None, "seed": 0, "confidence_level": 0.95}
+
+@pytest.fixture(scope="module")
+def population():
+    return make_dataset(20_000, numeric=3, categorical=1, outlier_rate=0.03, cardinality=5, seed=1)
+
+def test_disabled_or_small_datasets_are_not_sampled():
+    assert draw_sample(10_000, dict(SAMPLING, enabled=False)) == (None, None)
+    assert draw_sample(500, SAMPLING) == (None, None)
+
+def test_reservoir_sample_is_seeded_and_without_replacement():
+    positions, info = draw_sample(10_000, SAMPLING)
+    assert len(np.unique(positions)) == len(positions) == info["rows"] == 500
+    assert np.all(np.diff(positions) > 0) and positions[-1] < 10_000
+    np.testing.assert_array_equal(draw_sample(10_000, SAMPLING)[0], positions)
+    assert not np.array_equal(draw_sample(10_000, dict(SAMPLING, seed=1))[0], positions)
+
+def test_stratified_sample_is_proportional(population):
+    strata = population["cat_0"]
+    positions = stratified_positions(strata, 500, seed=0)
+
+    expected = strata.value_counts(dropna=False) / len(strata) * 500
+    drawn = strata.iloc[positions].value_counts(dropna=False)
+    assert len(positions) == 500
+    assert (drawn.reindex(expected.index) - expected).abs().max() <= 1
+
+def test_sampling_off_matches_exact_profile(synthetic_frame, rules):
+    exact = profile_columns(synthetic_frame, rules)
+    rules["sampling"].update(enabled=True, sample_rows=len(synthetic_frame)) # the whole frame fits in the sample
+    assert profile_columns(synthetic_frame, rules) == exact
+
+def test_sampled_profile_keeps_exact_counts(population, rules):
+    exact = profile_columns(population, rules)
+    rules["sampling"].update(SAMPLING)
+    sampled = profile_columns(population, rules)
+
+    for column, profile in exact.items():
+        for field in ("type", "missing_pct", "unique_values", "is_id_like"):
+            assert sampled[column][field] == profile[field], (column, field)
+    low, high = sampled["num_0"]["sample"]["outlier_pct_ci"]
+    assert low <= sampled["num_0"]["outlier_pct"] <= high
+
+def test_streamed_sampled_profile_matches_in_memory(tmp_path, population, rules):
+    path = str(tmp_path / "population.csv")
+    population.to_csv(path, index=False)
+    rules["sampling"].update(SAMPLING, method="stratified", stratify_by="cat_0")
+
+    streamed = profile_columns(ChunkedDataset(path, memory_budget_mb=1, chunk_rows=5000), rules)
+    assert streamed == profile_columns(pd.read_csv(path), rules)
+
+def test_outlier_interval_covers_the_population_share(population):
+    """The 95% interval of a sampled outlier percentage covers the exact one in about 95% of seeded samples"""
+    series = population["num_0"]
+    truth = outlier_percentage(series)
+    bounds = (series.quantile(0.25), series.quantile(0.75))
+    fences = (bounds[0] - 1.5 * (bounds[1] - bounds[0]), bounds[1] + 1.5 * (bounds[1] - bounds[0]))
+    is_outlier = ((series < fences[0]) | (series > fences[1])).to_numpy()
+
+    covered = 0
+    for seed in range(200):
+        positions, _ = draw_sample(len(series), dict(SAMPLING, seed=seed))
+        low, high = proportion_interval(int(is_outlier[positions].sum()), len(positions), len(series))
+        covered += low <= truth <= high
+    assert covered >= 180
+
+def test_correlation_interval_covers_the_population_correlation():
+    # Fisher's interval assumes roughly normal columns, so this population has no injected outliers
+    df = make_dataset(20_000, numeric=2, categorical=0, missing_rate=0, outlier_rate=0, seed=1, edge_columns=False)
+    df["num_1"] += df["num_0"] # some correlation to estimate
+    truth = df["num_0"].corr(df["num_1"])
+
+    covered = 0
+    for seed in range(200):
+        positions, _ = draw_sample(len(df), dict(SAMPLING, seed=seed))
+        sample = df.iloc[positions]
+        low, high = correlation_interval(sample["num_0"].corr(sample["num_1"]), len(sample))
+        covered += low <= truth <= high
+    assert covered >= 180
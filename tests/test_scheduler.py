@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from pipeline.scheduler import SchedulerError, Stage, StageCancelled, run_stages, select_stages, topological_order
+from profiling.column_profiler import profile_columns
+
+# Stage functions live at module level so process stages can pickle them
+def profile(data, rules):
+    return profile_columns(data, rules)
+
+def count_numeric(profiles):
+    return sum(p["type"] == "numeric" for p in profiles.values())
+
+def describe(data):
+    return data.shape
+
+def report(numeric, shape):
+    return f"{numeric} numeric of {shape[1]} columns, {shape[0]} rows"
+
+def fail(data):
+    raise ValueError("stage failed")
+
+def wait_for_cancel(data):
+    time.sleep(0.5)
+    return data
+
+def pipeline_stages(profile_executor: str = "thread"):
+    return [
+        Stage("profile", profile, ["data", "rules"], ["profiles"], executor=profile_executor),
+        Stage("describe", describe, ["data"], ["shape"]),
+        Stage("count", count_numeric, ["profiles"], ["numeric"]),
+        Stage("report", report, ["numeric", "shape"], ["report"])
+    ]
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_concurrent_run_matches_serial_run(synthetic_frame, rules, executor):
+    context = {"data": synthetic_frame, "rules": rules}
+    serial = run_stages(pipeline_stages(), context, workers=1)
+    concurrent = run_stages(pipeline_stages(executor), context, workers=2)
+
+    assert concurrent["report"] == serial["report"]
+    assert concurrent["profiles"] == serial["profiles"] == profile_columns(synthetic_frame, rules)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failure_propagates_and_stops_dependents(synthetic_frame, workers):
+    stages = [
+        Stage("broken", fail, ["data"], ["broken"]),
+        Stage("after", describe, ["broken"], ["after"])
+    ]
+    with pytest.raises(ValueError, match="stage failed") as raised:
+        run_stages(stages, {"data": synthetic_frame}, workers=workers)
+    assert "Raised in pipeline stage 'broken'" in raised.value.__notes__
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cancel_before_start(synthetic_frame, workers):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(StageCancelled):
+        run_stages([Stage("describe", describe, ["data"], ["shape"])], {"data": synthetic_frame}, workers, cancel)
+
+def test_cancel_while_running(synthetic_frame):
+    cancel = threading.Event()
+    stages = [
+        Stage("slow", wait_for_cancel, ["data"], ["slow"]),
+        Stage("after", describe, ["slow"], ["after"])
+    ]
+    timings = {}
+    threading.Timer(0.1, cancel.set).start()
+    with pytest.raises(StageCancelled):
+        run_stages(stages, {"data": synthetic_frame}, workers=2, cancel_event=cancel, timings=timings)
+    assert "after" not in timings
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(SchedulerError, match="no stage produces"):
+        topological_order([Stage("a", describe, ["missing"], ["a"])], {})
+    with pytest.raises(SchedulerError, match="cycle"):
+        topological_order([Stage("a", describe, ["b"], ["a"]), Stage("b", describe, ["a"], ["b"])], {})
+
+def test_select_stages_keeps_dependencies_and_drops_dependents():
+    stages = pipeline_stages()
+    assert [s.name for s in select_stages(stages, targets=["count"])] == ["profile", "count"]
+    assert [s.name for s in select_stages(stages, skip=["profile"])] == ["describe"]
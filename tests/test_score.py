@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from pipeline.model import load_model_spec, save_model_spec, scoring_spec
+from pipeline.score import ScoringError, prepare_features, score_dataset
+
+FEATURES = ["num_0", "num_1", "num_2", "patchy_metric"]
+TARGET = "num_4"
+
+@pytest.fixture
+def model_path(tmp_path, synthetic_frame):
+    """Linear model persisted with its scoring spec, as the model stage leaves it"""
+    fill_values = synthetic_frame[FEATURES].median().to_dict()
+    X = synthetic_frame[FEATURES].fillna(fill_values)
+    model = LinearRegression().fit(X, synthetic_frame[TARGET])
+
+    path = str(tmp_path / "model" / "linear_regression.joblib")
+    (tmp_path / "model").mkdir()
+    joblib.dump(model, path)
+    save_model_spec(path, "linear_regression", scoring_spec(TARGET, FEATURES, fill_values))
+    return path
+
+def in_memory_predictions(dataset_path: str, model_path: str):
+    spec = load_model_spec(model_path)
+    data = pd.read_csv(dataset_path)
+    return joblib.load(model_path).predict(prepare_features(data[spec["features"]], spec))
+
+def test_chunked_scoring_matches_in_memory_predictions(tmp_path, synthetic_csv, model_path):
+    output = str(tmp_path / "predictions.csv")
+    result = score_dataset(synthetic_csv, model_path, output, chunk_rows=300)
+
+    predictions = pd.read_csv(output)
+    assert result["rows"] == len(predictions)
+    assert predictions["row"].tolist() == list(range(len(predictions)))
+    np.testing.assert_allclose(predictions["prediction"], in_memory_predictions(synthetic_csv, model_path), rtol=1e-12)
+
+def test_cli_writes_the_same_predictions(tmp_path, repo_root, synthetic_csv, model_path):
+    output = str(tmp_path / "predictions.csv")
+    completed = subprocess.run(
+        [sys.executable, "-m", "pipeline.score", synthetic_csv, "--model", model_path, "--output", output, "--chunk-rows", "300"],
+        cwd=repo_root, capture_output=True, text=True, check=True
+    )
+
+    assert "Scored 2000 rows in 7 chunks" in completed.stdout
+    np.testing.assert_allclose(pd.read_csv(output)["prediction"], in_memory_predictions(synthetic_csv, model_path), rtol=1e-12)
+
+def test_missing_features_are_rejected(tmp_path, synthetic_frame, model_path):
+    dataset = str(tmp_path / "partial.csv")
+    synthetic_frame.drop(columns=["num_1"]).to_csv(dataset, index=False)
+    with pytest.raises(ScoringError, match="num_1"):
+        score_dataset(dataset, model_path, str(tmp_path / "predictions.csv"))
+
+def test_workbook_scoring_matches_csv_scoring(tmp_path, synthetic_frame, synthetic_csv, model_path):
+    workbook = str(tmp_path / "synthetic.xlsx")
+    synthetic_frame.head(500).to_excel(workbook, index=False)
+    csv = str(tmp_path / "head.csv")
+    synthetic_frame.head(500).to_csv(csv, index=False)
+
+    score_dataset(workbook, model_path, str(tmp_path / "xlsx.csv"), chunk_rows=70)
+    score_dataset(csv, model_path, str(tmp_path / "csv.csv"), chunk_rows=70)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "xlsx.csv"), pd.read_csv(tmp_path / "csv.csv"))
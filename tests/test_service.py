@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+import pytest
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+from service import PipelineService, make_handler
+
+@pytest.fixture
+def base_url(tmp_path, repo_root):
+    """Service on an ephemeral localhost port with one warm worker"""
+    service = PipelineService(workers=1, output_root=str(tmp_path / "service"), default_rules=os.path.join(repo_root, "core", "rules.yaml"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+def request(url: str, body: bytes = None):
+    """(status, JSON payload) of a GET, or of a POST when a body is given"""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST" if body is not None else "GET")) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+def wait_for(base_url: str, job_id: str, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, job = request(f"{base_url}/jobs/{job_id}")
+        assert status == 200
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"job {job_id} did not finish within {timeout}s")
+
+def test_health(base_url):
+    status, payload = request(f"{base_url}/health")
+    assert status == 200
+    assert payload["status"] == "ok" and payload["workers"] == 1
+
+def test_submitted_job_runs_to_completion(tmp_path, base_url):
+    dataset = str(tmp_path / "small.csv")
+    make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(dataset, index=False)
+
+    status, job = request(f"{base_url}/jobs", json.dumps({"dataset": dataset}).encode())
+    assert status == 202 and job["status"] in ("queued", "running")
+
+    job = wait_for(base_url, job["job_id"])
+    assert job["status"] == "done", job["error"]
+    assert job["result"]["validation_status"] == "PASS"
+    assert os.path.exists(job["result"]["report_path"])
+    assert job["result"]["report_path"].startswith(job["output_dir"])
+    assert request(f"{base_url}/jobs")[1]["jobs"] == [{"job_id": job["job_id"], "status": "done", "dataset": dataset}]
+
+def test_failed_job_reports_its_error(tmp_path, base_url):
+    status, job = request(f"{base_url}/jobs", json.dumps({"dataset": str(tmp_path / "missing.csv")}).encode())
+    assert status == 202
+
+    job = wait_for(base_url, job["job_id"])
+    assert job["status"] == "failed"
+    assert "IngestError" in job["error"] and job["result"] is None
+
+@pytest.mark.parametrize("body", [b"not json", b"{}", b"[1, 2]"])
+def test_bad_body_is_rejected(base_url, body):
+    status, payload = request(f"{base_url}/jobs", body)
+    assert status == 400 and "dataset" in payload["error"]
+
+def test_unknown_job_and_path(base_url):
+    assert request(f"{base_url}/jobs/0123456789ab")[0] == 404
+    assert request(f"{base_url}/elsewhere")[0] == 404
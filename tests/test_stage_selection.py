@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import pytest
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+from pipeline.scheduler import SchedulerError, select_stages
+from run import execute_pipeline, pipeline_stages
+
+def names(stages):
+    return [stage.name for stage in stages]
+
+def test_targets_pull_in_their_dependencies():
+    assert names(select_stages(pipeline_stages(), targets=["eda"])) == ["profile", "decision_plan", "materialize", "clean", "eda"]
+    assert names(select_stages(pipeline_stages(), targets=["decision_plan"])) == ["profile", "decision_plan"]
+    assert names(select_stages(pipeline_stages())) == names(pipeline_stages())
+
+def test_skipping_a_stage_drops_everything_that_needs_its_outputs():
+    assert names(select_stages(pipeline_stages(), skip=["eda"])) == ["profile", "decision_plan", "materialize", "clean", "model"]
+    # The report needs the EDA result, so asking for it while skipping EDA runs neither
+    assert names(select_stages(pipeline_stages(), targets=["report"], skip=["eda"])) == ["profile", "decision_plan", "materialize", "clean", "model"]
+
+def test_unknown_stages_are_rejected():
+    with pytest.raises(SchedulerError, match="Unknown stages"):
+        select_stages(pipeline_stages(), targets=["profiel"])
+    with pytest.raises(SchedulerError, match="Unknown stages"):
+        select_stages(pipeline_stages(), skip=["nope"])
+
+@pytest.fixture
+def small_csv(tmp_path):
+    path = str(tmp_path / "small.csv")
+    make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(path, index=False)
+    return path
+
+def test_pipeline_runs_only_the_selected_stages(tmp_path, repo_root, small_csv):
+    result = execute_pipeline(small_csv, f"{repo_root}/core/rules.yaml", str(tmp_path / "out"), stages=["decision_plan"])
+    assert list(result["stage_timings"]) == ["ingest", "validate", "profile", "decision_plan"]
+    assert "decision_plan" in result and "cleaning_result" not in result and "report_path" not in result
+
+def test_pipeline_skips_a_stage_and_its_dependents(tmp_path, repo_root, small_csv):
+    result = execute_pipeline(small_csv, f"{repo_root}/core/rules.yaml", str(tmp_path / "out"), skip=["eda"])
+    assert list(result["stage_timings"]) == ["ingest", "validate", "profile", "decision_plan", "materialize", "clean", "model"]
+    assert "eda_result" not in result and "report_path" not in result
+
+def test_cli_rejects_unknown_stage_names(repo_root, small_csv):
+    completed = subprocess.run([sys.executable, "run.py", small_csv, "--stages", "profile,nonsense"], cwd=repo_root, capture_output=True, text=True)
+    assert completed.returncode == 2
+    assert "unknown stages ['nonsense']" in completed.stderr
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from benchmarks.synthetic import EDGE_CASES, make_dataset
+from pipeline.tracing import NULL_SPAN, annotate, span, tracing
+
+def spans_by_name(tracer):
+    return {record["name"]: record for record in tracer.spans}
+
+def test_nested_spans_record_parents_and_durations():
+    with tracing() as tracer:
+        with span("outer", "stage", rows=10):
+            time.sleep(0.02)
+            with span("inner"):
+                time.sleep(0.02)
+                annotate(columns=3)
+        with span("sibling"):
+            pass
+
+    spans = spans_by_name(tracer)
+    outer, inner, sibling = spans["outer"], spans["inner"], spans["sibling"]
+    assert (outer["parent_id"], inner["parent_id"], sibling["parent_id"]) == (None, outer["id"], None)
+    assert (outer["depth"], inner["depth"]) == (0, 1)
+    assert inner["wall_s"] >= 0.02 and outer["wall_s"] >= inner["wall_s"] + 0.02
+    assert outer["start_s"] <= inner["start_s"] <= inner["start_s"] + inner["wall_s"] <= outer["start_s"] + outer["wall_s"]
+    assert outer["rows"] == 10 and inner["columns"] == 3 # attributes given up front and annotated
+    assert outer["category"] == "stage" and inner["category"] == "inner"
+
+def traced_worker():
+    with span("worker"):
+        pass
+
+def test_spans_of_other_threads_start_their_own_tree():
+    with tracing() as tracer:
+        with span("main"):
+            worker = threading.Thread(target=traced_worker)
+            worker.start()
+            worker.join()
+
+    spans = spans_by_name(tracer)
+    assert spans["worker"]["parent_id"] is None and spans["worker"]["depth"] == 0
+    assert spans["worker"]["thread"] != spans["main"]["thread"]
+
+def test_failing_span_records_the_error():
+    with tracing() as tracer:
+        with pytest.raises(ValueError):
+            with span("broken"):
+                raise ValueError("boom")
+    assert tracer.spans[0]["error"] == "ValueError"
+
+def test_disabled_tracing_uses_the_null_span():
+    with tracing(False) as tracer:
+        assert tracer is None
+        with span("anything", rows=1) as current:
+            assert current is NULL_SPAN
+            current.set(columns=2)
+            annotate(rows=5) # no tracer: ignored
+
+def test_annotate_outside_any_span_is_ignored():
+    with tracing() as tracer:
+        annotate(rows=5)
+        with span("later"):
+            pass
+    assert "rows" not in tracer.spans[0]
+
+def test_memory_tracing_measures_allocations():
+    with tracing(memory=True) as tracer:
+        with span("allocate"):
+            data = bytearray(8 * 1024 ** 2)
+        del data
+    assert tracer.spans[0]["peak_alloc_mb"] >= 8
+
+def test_json_and_chrome_exports(tmp_path):
+    with tracing() as tracer:
+        with span("stage_one", "stage", rows=4):
+            with span("loop"):
+                pass
+
+    with open(tracer.to_json(str(tmp_path / "trace.json"))) as f:
+        exported = json.load(f)
+    assert exported["spans"] == tracer.spans
+    assert [(row["name"], row["calls"]) for row in exported["summary"]] == [("loop", 1), ("stage_one", 1)]
+
+    with open(tracer.to_chrome_trace(str(tmp_path / "trace.chrome.json"))) as f:
+        chrome = json.load(f)
+    assert chrome["displayTimeUnit"] == "ms"
+    events = {event["name"]: event for event in chrome["traceEvents"]}
+    stage = spans_by_name(tracer)["stage_one"]
+    assert events["stage_one"]["ph"] == "X" and events["stage_one"]["cat"] == "stage"
+    assert events["stage_one"]["ts"] == round(stage["start_s"] * 1e6, 1)
+    assert events["stage_one"]["dur"] == round(stage["wall_s"] * 1e6, 1)
+    assert (events["stage_one"]["pid"], events["stage_one"]["tid"]) == (stage["pid"], stage["thread"])
+    assert events["stage_one"]["args"]["rows"] == 4 and "wall_s" not in events["stage_one"]["args"]
+    assert events["loop"]["args"]["parent_id"] == events["stage_one"]["args"]["id"]
+
+def test_run_with_trace_writes_both_files(tmp_path, repo_root):
+    dataset = str(tmp_path / "small.csv")
+    make_dataset(**EDGE_CASES["eda_and_modeling_disabled"]).to_csv(dataset, index=False)
+    output_dir = tmp_path / "outputs"
+
+    completed = subprocess.run(
+        [sys.executable, "run.py", dataset, "--output-dir", str(output_dir), "--trace"],
+        cwd=repo_root, capture_output=True, text=True, check=True
+    )
+    assert f"Trace written to: {output_dir / 'trace.json'}" in completed.stdout
+    assert os.path.exists(output_dir / "trace.chrome.json")
+
+    with open(output_dir / "trace.json") as f:
+        stages = {record["name"] for record in json.load(f)["spans"] if record["category"] == "stage"}
+    assert {"ingest", "validate", "profile", "decision_plan", "clean", "eda", "model", "risk", "report"} <= stages